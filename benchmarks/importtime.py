@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+Import-time benchmark of the Cortix entry points. Each entry point is imported in
+a fresh interpreter with `python -X importtime`; the report gives the total import
+time, the slowest imports, and the heavy dependencies that got loaded. An entry
+point fails its budget if it takes longer than its time budget or loads a
+dependency it must load lazily (see BUDGETS).
+
+Usage: -> python benchmarks/importtime.py [--repeat 5] [--top 10] [entry ...]
+
+Exits with status 1 if any budget is exceeded.
+
+Cortix: a program for system-level modules coupling, execution, and analysis.
+"""
+#*********************************************************************************
+import os
+import sys
+import argparse
+import tempfile
+import subprocess
+#*********************************************************************************
+
+# entry point: (time budget in ms, dependencies that must not be imported)
+HEAVY = ('mpi4py', 'networkx', 'pandas', 'matplotlib')
+
+BUDGETS = {
+    'cortix.src.main':                  (150.0, HEAVY),
+    'cortix.src.launcher':              (100.0, HEAVY),
+    'cortix.src.task':                  (100.0, HEAVY),
+    'cortix.support.viz.pyplot.pyplot': (150.0, HEAVY),
+    'cortix.support.phase.interface':   (250.0, HEAVY),
+}
+
+def get_python_path():
+    """
+    Returns a PYTHONPATH under which this tree imports as the cortix package.
+    """
+
+    repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if os.path.basename(repo_dir) == 'cortix':
+        return os.path.dirname(repo_dir)
+
+    # the checkout has another name; expose it as cortix
+    link_dir = tempfile.mkdtemp(prefix='cortix-importtime-')
+    os.symlink(repo_dir, os.path.join(link_dir, 'cortix'))
+    return link_dir
+#---------------------- end def get_python_path():--------------------------------
+
+def measure(entry, python_path):
+    """
+    Imports entry in a fresh interpreter. Returns a list of
+    (module name, self time (us), cumulative time (us)) in import order; None if
+    the import fails.
+    """
+
+    env = dict(os.environ)
+    env['PYTHONPATH'] = python_path + os.pathsep + env.get('PYTHONPATH', '')
+
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', \
+                           'import ' + entry], env=env, \
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, \
+                          universal_newlines=True)
+    if proc.returncode != 0:
+        print('%s: import failed: %s' % (entry, proc.stderr.strip().splitlines()[-1]))
+        return None
+
+    imports = list()
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue # header line
+        imports.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+
+    return imports
+#---------------------- end def measure():----------------------------------------
+
+def report(entry, runs, top):
+    """
+    Prints the report of an entry point from its runs (see measure()) and returns
+    true iff it is within budget.
+    """
+
+    totals = [sum(self_us for (name, self_us, cum_us) in run) for run in runs]
+    best = runs[totals.index(min(totals))]
+    total_ms = min(totals) / 1000.0
+
+    (budget_ms, forbidden) = BUDGETS.get(entry, (None, HEAVY))
+    loaded = sorted(set(name.split('.')[0] for (name, self_us, cum_us) in best \
+                        if name.split('.')[0] in forbidden))
+
+    ok = len(loaded) == 0 and (budget_ms is None or total_ms <= budget_ms)
+
+    print('%s: %.1f ms (budget %s ms) %s' % (entry, total_ms, \
+          'none' if budget_ms is None else '%.0f' % budget_ms, \
+          'OK' if ok else 'OVER BUDGET'))
+    if len(loaded) > 0:
+        print('  eagerly imported: %s' % ', '.join(loaded))
+    for (name, self_us, cum_us) in sorted(best, key=lambda imp: -imp[2])[:top]:
+        print('  %9.1f ms  %s' % (cum_us / 1000.0, name))
+
+    return ok
+#---------------------- end def report():-----------------------------------------
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Cortix import-time benchmark.')
+    parser.add_argument('entries', nargs='*', default=sorted(BUDGETS.keys()), \
+                        help='modules to import (default: all with a budget)')
+    parser.add_argument('--repeat', type=int, default=5, \
+                        help='imports per entry point; the fastest is reported')
+    parser.add_argument('--top', type=int, default=10, \
+                        help='number of slowest imports listed')
+    args = parser.parse_args()
+
+    python_path = get_python_path()
+
+    all_ok = True
+    for entry in args.entries:
+        runs = [measure(entry, python_path) for i in range(max(1, args.repeat))]
+        if None in runs:
+            all_ok = False
+            continue
+        all_ok = report(entry, runs, args.top) and all_ok
+
+    return 0 if all_ok else 1
+#---------------------- end def main():-------------------------------------------
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+Memory benchmark of Phase hand-offs. A Phase history of --steps time steps over
+--species species is handed over to other modules in two ways:
+
+  cow:  Phase.Copy(), the copy-on-write snapshot (what copy.deepcopy() does now);
+  full: a snapshot that owns its table (the cost of the former deepcopy, less its
+        pandas data frame).
+
+Two scenarios are measured with tracemalloc (memory allocated and kept, and the
+peak) and wall time:
+
+  snapshots: --snapshots snapshots of the full history kept alive;
+  stepping:  the history is built step by step and handed over at every step
+             (the receiver keeps the last snapshot and reads its last row).
+
+Usage: -> python benchmarks/phase_memory.py [--steps 10000] [--species 20]
+          [--snapshots 20]
+
+Cortix: a program for system-level modules coupling, execution, and analysis.
+"""
+#*********************************************************************************
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+#*********************************************************************************
+
+def get_python_path():
+    """
+    Returns a PYTHONPATH under which this tree imports as the cortix package.
+    """
+
+    repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if os.path.basename(repo_dir) == 'cortix':
+        return os.path.dirname(repo_dir)
+
+    # the checkout has another name; expose it as cortix
+    link_dir = tempfile.mkdtemp(prefix='cortix-phasememory-')
+    os.symlink(repo_dir, os.path.join(link_dir, 'cortix'))
+    return link_dir
+#---------------------- end def get_python_path():--------------------------------
+
+def make_phase(n_species):
+    """
+    Returns a Phase of n_species species at time stamp 0.0.
+    """
+
+    from cortix.support.phase.interface import Phase
+    from cortix.support.specie.interface import Specie
+
+    species = [Specie(name='s%i' % i, formulaName='s%i' % i, atoms=['U-235', '2*O-16']) \
+               for i in range(n_species)]
+
+    return Phase(0.0, species, None, 0.0)
+#---------------------- end def make_phase():-------------------------------------
+
+def snapshot(phase, mode):
+    """
+    Hand-off copy of a phase: copy-on-write (cow) or one owning its table (full).
+    """
+
+    copy = phase.Copy()
+    if mode == 'full':
+        copy.ScaleRow(0.0, 1.0) # changing a frozen row makes the copy own its table
+    return copy
+#---------------------- end def snapshot():---------------------------------------
+
+def run_snapshots(n_steps, n_species, n_snapshots, mode):
+    """
+    Keeps n_snapshots snapshots of an n_steps history. Returns (memory kept (MB),
+    peak memory (MB), time (s)) of taking the snapshots.
+    """
+
+    phase = make_phase(n_species)
+    values = [1.0] * n_species
+    for step in range(1, n_steps):
+        phase.AddRow(float(step), values)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    snapshots = [snapshot(phase, mode) for i in range(n_snapshots)]
+    elapsed = time.perf_counter() - start
+    (current, peak) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(snapshots) == n_snapshots
+    return (current / 2**20, peak / 2**20, elapsed)
+#---------------------- end def run_snapshots():----------------------------------
+
+def run_stepping(n_steps, n_species, mode):
+    """
+    Builds an n_steps history handing it over at every step. Returns (memory kept
+    (MB), peak memory (MB), time (s)).
+    """
+
+    phase = make_phase(n_species)
+    values = [1.0] * n_species
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    received = None
+    total = 0.0
+    for step in range(1, n_steps):
+        phase.AddRow(float(step), values)
+        phase.SetValue('s0', float(step)) # the owner updates its last row
+        received = snapshot(phase, mode)
+        total += received.GetValue('s0')
+    elapsed = time.perf_counter() - start
+    (current, peak) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert total == sum(range(1, n_steps))
+    return (current / 2**20, peak / 2**20, elapsed)
+#---------------------- end def run_stepping():-----------------------------------
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Cortix Phase hand-off memory benchmark.')
+    parser.add_argument('--steps', type=int, default=10000, \
+                        help='number of time steps of the history')
+    parser.add_argument('--species', type=int, default=20, \
+                        help='number of species (history columns)')
+    parser.add_argument('--snapshots', type=int, default=20, \
+                        help='number of snapshots kept in the snapshots scenario')
+    args = parser.parse_args()
+
+    sys.path.insert(0, get_python_path())
+
+    print('history: %i steps x %i species' % (args.steps, args.species))
+    print('%-10s %-5s %12s %12s %10s' % ('scenario', 'mode', 'kept [MB]', 'peak [MB]', 'time [s]'))
+
+    results = dict()
+    for mode in ('full', 'cow'):
+        results[('snapshots', mode)] = run_snapshots(args.steps, args.species, \
+                                                     args.snapshots, mode)
+        results[('stepping', mode)] = run_stepping(args.steps, args.species, mode)
+
+    for scenario in ('snapshots', 'stepping'):
+        for mode in ('full', 'cow'):
+            (current, peak, elapsed) = results[(scenario, mode)]
+            print('%-10s %-5s %12.3f %12.3f %10.4f' % (scenario, mode, current, peak, elapsed))
+        (full, cow) = (results[(scenario, 'full')][1], results[(scenario, 'cow')][1])
+        print('%-10s peak memory reduction: %.1fx' % (scenario, full / max(cow, 1e-9)))
+
+    return 0
+#---------------------- end def main():-------------------------------------------
+
+if __name__ == '__main__':
+    sys.exit(main())
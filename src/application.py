@@ -122,9 +122,11 @@ class Application:
         self.log.debug("logger console handler level: %s", console_handler_level)
 
         self.modules = list()
+        self.module_index = dict() # module name -> Module
         self.__setup_modules()
 
         self.networks = list()
+        self.network_index = dict() # network name -> Network
         self.__setup_networks()
 
         self.log.info("Created application: %s", self.name)
@@ -143,10 +145,7 @@ class Application:
         Returns a network with a given name.  None if the name doesn't exist.
         """
 
-        for net in self.networks:
-            if net.get_name() == name:
-                return net
-        return None
+        return self.network_index.get(name, None)
 #---------------------- end def get_network():------------------------------------
 
     def get_modules(self):
@@ -161,10 +160,7 @@ class Application:
         """
         Returns a module with a given name.  None if the name doesn't exist.
         """
-        for mod in self.modules:
-            if mod.get_name() == name:
-                return mod
-        return None
+        return self.module_index.get(name, None)
 #---------------------- end def get_module():-------------------------------------
 
     def __del__(self):
@@ -188,6 +184,7 @@ class Application:
             assert net_config_node.get_node_name() == net_node.get('name'), 'check failed'
             network = Network(net_config_node)
             self.networks.append(network)
+            self.network_index[network.get_name()] = network
             self.log.debug("appended network %s", net_node.get("name"))
 
         self.log.debug("end _SetupNetworks()")
@@ -222,6 +219,7 @@ class Application:
 
             # add module to list
             self.modules.append(new_module)
+            self.module_index[new_module.get_name()] = new_module
             self.log.debug("appended module %s", mode_node.get('name'))
 
         self.log.debug("end _SetupModules()")
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+Checkpoint/restart of module slots. With <checkpoint interval="n" keep="k"/> in a
+task, every launcher writes a checkpoint of its module driver in its work
+directory (wrk/checkpoint-<time step>.pkl) at the start of every n-th time step,
+keeping the last k. A checkpoint holds the time step index, the facility time and
+the driver state: GetState() of the CortixDriver if it has one (restored with
+SetState()), else its attributes that can be pickled, except its ports (the
+restarted driver is built with the new ones and gets the other attributes back).
+
+A restarted task (Cortix(..., restart=True)) resumes every slot of its network
+from the latest time step checkpointed by all of them (see get_restart_step()),
+so the slots restart from a consistent state; lockstep synchronization keeps the
+slots close enough for their retained checkpoints to overlap.
+
+Cortix: a program for system-level modules coupling, execution, and analysis.
+"""
+#*********************************************************************************
+import os
+import pickle
+#*********************************************************************************
+
+CHECKPOINT_PREFIX = 'checkpoint-'
+CHECKPOINT_SUFFIX = '.pkl'
+
+def get_checkpoint_file(work_dir, step):
+    """
+    Returns the checkpoint file name of a slot (work_dir: its wrk/ directory) at a
+    time step index.
+    """
+
+    return os.path.join(work_dir, CHECKPOINT_PREFIX + '%08i' % step + \
+                        CHECKPOINT_SUFFIX)
+#---------------------- end def get_checkpoint_file():----------------------------
+
+def get_checkpoint_steps(work_dir):
+    """
+    Returns the sorted time step indices of the checkpoints of a slot.
+    """
+
+    if not os.path.isdir(work_dir):
+        return list()
+
+    steps = list()
+    for file_name in os.listdir(work_dir):
+        if not file_name.startswith(CHECKPOINT_PREFIX) or \
+           not file_name.endswith(CHECKPOINT_SUFFIX):
+            continue
+        try:
+            steps.append(int(file_name[len(CHECKPOINT_PREFIX): \
+                                       -len(CHECKPOINT_SUFFIX)]))
+        except ValueError:
+            continue
+
+    return sorted(steps)
+#---------------------- end def get_checkpoint_steps():---------------------------
+
+def write_checkpoint(work_dir, step, facility_time, driver, keep=2, exclude=()):
+    """
+    Writes the checkpoint of a module driver at the start of a time step
+    atomically, and removes the older checkpoints beyond the last keep; driver
+    attributes that are one of the exclude objects (e.g. the ports) are left out.
+    Returns the checkpoint file name.
+    """
+
+    assert keep >= 1, '-> keep invalid.'
+
+    checkpoint = dict()
+    checkpoint['step'] = step
+    checkpoint['facility_time'] = facility_time
+    if hasattr(driver, 'GetState'):
+        checkpoint['state'] = driver.GetState()
+    else:
+        attributes = dict() # name -> pickled value
+        for (name, value) in vars(driver).items():
+            if any(value is item for item in exclude):
+                continue
+            try:
+                attributes[name] = pickle.dumps(value, \
+                                                protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception: # e.g. loggers, open files
+                continue
+        checkpoint['attributes'] = attributes
+
+    file_name = get_checkpoint_file(work_dir, step)
+    tmp_file_name = file_name + '.tmp'
+    with open(tmp_file_name, 'wb') as fout:
+        pickle.dump(checkpoint, fout, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_file_name, file_name)
+
+    for old_step in get_checkpoint_steps(work_dir)[:-keep]:
+        os.remove(get_checkpoint_file(work_dir, old_step))
+
+    return file_name
+#---------------------- end def write_checkpoint():-------------------------------
+
+def read_checkpoint(work_dir, step, driver):
+    """
+    Restores the state of a (new) module driver from its checkpoint at a time step
+    index. Returns the facility time of the checkpoint.
+    """
+
+    with open(get_checkpoint_file(work_dir, step), 'rb') as fin:
+        checkpoint = pickle.load(fin)
+
+    assert checkpoint['step'] == step, 'checkpoint of step %r invalid.' % step
+
+    if 'state' in checkpoint:
+        driver.SetState(checkpoint['state'])
+    else:
+        for (name, value) in checkpoint['attributes'].items():
+            setattr(driver, name, pickle.loads(value))
+
+    return checkpoint['facility_time']
+#---------------------- end def read_checkpoint():--------------------------------
+
+def get_restart_step(task_work_dir, slot_names):
+    """
+    Returns the latest time step index checkpointed by every slot of a task (a
+    consistent restart point); None if there is none.
+    """
+
+    common = None
+    for slot in slot_names:
+        steps = set(get_checkpoint_steps(os.path.join(task_work_dir, slot, 'wrk')))
+        common = steps if common is None else common & steps
+
+    if not common:
+        return None
+
+    return max(common)
+#---------------------- end def get_restart_step():-------------------------------
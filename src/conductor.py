@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+SlotConductor and TimeConductor classes of Cortix. With lockstep synchronization
+(<synchronization mode="lockstep"/> or a <coupling_scheme> in a task) the launchers
+of a task step in time under a conductor: a slot starts a time step only when the
+slots it depends on completed the steps the coupling scheme requires, and the
+waiting slots are woken up as soon as they have (nothing is polled).
+
+Coupling schemes (see get_slot_dependencies()); step n of a slot waits for:
+
+  jacobi:       step n-1 of its providers and users; all slots run step n in
+                parallel on the inputs of the previous step;
+  gauss-seidel: step n of its providers, in the topological order of the network
+                graph (step n-1 within a feedback loop), and step n-1 of its users;
+                the slots run one after the other;
+  pipelined:    as gauss-seidel, but only the port calls of step n-1 of its users
+                (see publish_ports()): a provider runs step n+1 while its users
+                run step n, and publishes its data of step n+1 only after they
+                got the data of step n (ports of any mode keep only the latest
+                data).
+
+Steps are counted in task time steps; a subcycled slot (see time_step_multiple in
+Module) completes the time steps of its macro step at once. The board counts half
+steps too: n - 0.5 records that a slot completed step n-1 and called the ports of
+step n (the data of the module drivers are exchanged in CallPorts()).
+
+The conductor board lives in a manager process reachable from the local workers
+(as the memory ports; see MemoryPortHub).
+
+Cortix: a program for system-level modules coupling, execution, and analysis.
+"""
+#*********************************************************************************
+import math
+import multiprocessing
+from cortix.src.utils.lazyimport import lazy_import
+nx = lazy_import('networkx')
+#*********************************************************************************
+
+COUPLING_SCHEMES = ('jacobi', 'gauss-seidel', 'pipelined')
+FINISHED = math.inf # last step of a slot done stepping
+
+class SlotConductor:
+    """
+    Handle of one module slot to the task conductor: the slot publishes the time
+    steps it completes and waits for the slots it depends on before the next one.
+    SlotConductor objects are picklable and are handed to the launchers.
+    """
+
+    def __init__(self, slot_name=None, board=None, condition=None, dependencies=None):
+
+        assert isinstance(slot_name, str), '-> slot_name not a str.'
+        assert board is not None, '-> board missing.'
+        assert condition is not None, '-> condition missing.'
+
+        self.slot_name = slot_name
+        self.board = board # slot name -> (progress, status); progress: index of
+                           # the last step completed, + 0.5 once the ports of
+                           # the next one are called
+        self.condition = condition
+        self.dependencies = dict() # slot name -> lag (steps)
+        if dependencies is not None:
+            self.set_dependencies(dependencies)
+#---------------------- end def __init__():---------------------------------------
+
+    def get_slot_name(self):
+        """
+        Returns the name of the slot of the handle.
+        """
+
+        return self.slot_name
+#---------------------- end def get_slot_name():----------------------------------
+
+    def set_dependencies(self, dependencies):
+        """
+        Sets the slots this slot depends on: a dictionary slot name -> lag; step n
+        waits until the slot completed step n - lag (a lag of k + 0.5: until it
+        called the ports of step n - k; see publish_ports()).
+        """
+
+        assert all(lag >= 0 for lag in dependencies.values()), \
+        '-> dependencies invalid.'
+
+        self.dependencies = {slot_name: lag for (slot_name, lag) in \
+                             dependencies.items() if slot_name != self.slot_name}
+#---------------------- end def set_dependencies():-------------------------------
+
+    def get_dependencies(self):
+        """
+        Returns the slots this slot depends on (slot name -> lag).
+        """
+
+        return self.dependencies
+#---------------------- end def get_dependencies():-------------------------------
+
+    def wait_dependencies(self, step):
+        """
+        Waits until the slots this slot depends on completed the steps required to
+        start step (an index from 0). Raises RuntimeError if one of them failed.
+        """
+
+        if len(self.dependencies) == 0:
+            return
+
+        with self.condition:
+            while True:
+                behind = False
+                for (slot_name, lag) in self.dependencies.items():
+                    entry = self.board.get(slot_name, (-1, 'waiting'))
+                    if entry[0] < step - lag:
+                        behind = True
+                    elif entry[1] == 'failed':
+                        raise RuntimeError('slot %r, on which %r depends, failed' \
+                                           % (slot_name, self.slot_name))
+                if not behind:
+                    return
+                self.condition.wait()
+#---------------------- end def wait_dependencies():------------------------------
+
+    def publish(self, step):
+        """
+        Records that this slot completed step (an index from 0) and wakes up the
+        waiting slots.
+        """
+
+        self.__set_entry(step, 'running')
+#---------------------- end def publish():----------------------------------------
+
+    def publish_ports(self, step):
+        """
+        Records that this slot called the ports of step (an index from 0), i.e.
+        got the data of its providers for that step, and wakes up the waiting
+        slots.
+        """
+
+        self.__set_entry(step - 0.5, 'running')
+#---------------------- end def publish_ports():----------------------------------
+
+    def finish(self, failed=False):
+        """
+        Records that this slot is done stepping (failed or not) so that the slots
+        depending on it are never left waiting.
+        """
+
+        self.__set_entry(FINISHED, 'failed' if failed else 'finished')
+#---------------------- end def finish():-----------------------------------------
+
+    def get_step(self, slot_name=None):
+        """
+        Returns the index of the last step completed by a slot (default: this one);
+        None if none yet.
+        """
+
+        if slot_name is None:
+            slot_name = self.slot_name
+
+        entry = self.board.get(slot_name, None)
+        if entry is None:
+            return None
+
+        return get_completed_step(entry[0])
+#---------------------- end def get_step():---------------------------------------
+
+#*********************************************************************************
+# Private helper functions (internal use: __)
+
+    def __set_entry(self, step, status):
+
+        with self.condition:
+            self.board[self.slot_name] = (step, status)
+            self.condition.notify_all()
+#---------------------- end def __set_entry():------------------------------------
+
+    def __str__(self):
+        """
+        SlotConductor to string conversion
+        """
+
+        return 'conductor:' + self.slot_name
+#---------------------- end def __str__():----------------------------------------
+
+    def __repr__(self):
+        """
+        SlotConductor to string conversion
+        """
+
+        return 'conductor:' + self.slot_name
+#---------------------- end def __repr__():---------------------------------------
+
+#====================== end class SlotConductor: =================================
+
+class TimeConductor:
+    """
+    Owns the manager process that holds the conductor board of a task. It is
+    created by the task before the launchers are submitted and shut down after they
+    are joined.
+    """
+
+    def __init__(self):
+
+        self.manager = multiprocessing.Manager()
+        self.board = self.manager.dict()
+        self.condition = self.manager.Condition()
+        self.slots = dict()
+#---------------------- end def __init__():---------------------------------------
+
+    def get_slot_conductor(self, slot_name, dependencies=None):
+        """
+        Returns the SlotConductor of a slot; created on first use (dependencies:
+        see SlotConductor.set_dependencies()).
+        """
+
+        if slot_name not in self.slots:
+            self.slots[slot_name] = SlotConductor(slot_name, self.board, \
+                                                  self.condition, dependencies)
+
+        return self.slots[slot_name]
+#---------------------- end def get_slot_conductor():-----------------------------
+
+    def get_steps(self):
+        """
+        Returns a dictionary of the index of the last step completed by each slot.
+        """
+
+        return {slot_name: get_completed_step(entry[0]) for (slot_name, entry) \
+                in self.board.items()}
+#---------------------- end def get_steps():--------------------------------------
+
+    def shutdown(self):
+        """
+        Stops the manager process.
+        """
+
+        self.manager.shutdown()
+#---------------------- end def shutdown():---------------------------------------
+
+#====================== end class TimeConductor: =================================
+
+def get_slot_dependencies(data_graph, scheme='jacobi'):
+    """
+    Returns the dependencies of every slot (slot name -> {slot name: lag}) under a
+    coupling scheme. data_graph is a networkx DiGraph of the slots with an edge
+    from the provider to the user of every use port.
+    """
+
+    assert scheme in COUPLING_SCHEMES, 'coupling scheme %r invalid; options: %r' \
+    % (scheme, COUPLING_SCHEMES)
+
+    # slots of a feedback loop exchange lagged data in every scheme
+    loop = dict()
+    for (i, component) in enumerate(nx.strongly_connected_components(data_graph)):
+        for slot_name in component:
+            loop[slot_name] = i
+
+    # pipelined: step n of a provider waits for the port calls of step n-1 of
+    # its users
+    user_lag = {'jacobi': 1, 'gauss-seidel': 1, 'pipelined': 1.5}[scheme]
+
+    dependencies = {slot_name: dict() for slot_name in data_graph.nodes()}
+    for (provider, user) in data_graph.edges():
+        if provider == user:
+            continue
+        provider_lag = 1
+        if scheme != 'jacobi' and loop[provider] != loop[user]:
+            provider_lag = 0
+        deps = dependencies[user]
+        deps[provider] = min(deps.get(provider, provider_lag), provider_lag)
+        deps = dependencies[provider]
+        deps[user] = min(deps.get(user, user_lag), user_lag)
+
+    return dependencies
+#---------------------- end def get_slot_dependencies():--------------------------
+
+def get_completed_step(progress):
+    """
+    Returns the index of the last step completed by a slot from its progress on the
+    conductor board (FINISHED if done stepping).
+    """
+
+    if progress == FINISHED:
+        return FINISHED
+
+    return math.floor(progress)
+#---------------------- end def get_completed_step():-----------------------------
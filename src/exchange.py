@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+PortExchange class of Cortix. A connection of the network may exchange data once
+every exchangeInterval time steps, and only when the data changed by more than
+changeThreshold (see Network). The launcher hands the module driver its memory
+and mpi ports wrapped in a PortExchange, which enforces both: on the other time
+steps a provider's put() is dropped (nothing is serialized) and a user's get()
+returns the data it already has (nothing is read); data that did not change
+enough are not sent again, only their time stamp is (see MemoryPort.touch()).
+
+File ports are read and written by the module drivers themselves; the launcher
+skips the port calls of a slot on the time steps none of its connections
+exchange (see is_exchange_step()).
+
+Cortix: a program for system-level modules coupling, execution, and analysis.
+"""
+#*********************************************************************************
+from cortix.src.utils.lazyimport import lazy_import
+np = lazy_import('numpy')
+#*********************************************************************************
+
+class PortExchange:
+    """
+    Exchange policy of one memory or mpi port of a slot wrapped around the port;
+    same interface as MemoryPort.
+    """
+
+    def __init__(self, port=None, port_type=None, intervals=None, threshold=None,
+                 start_time=0.0, time_step=1.0, span=1):
+
+        assert port is not None, '-> port missing.'
+        assert port_type == 'provide' or port_type == 'use', \
+        '-> port_type %r invalid.' % port_type
+        assert time_step > 0.0, '-> time_step invalid.'
+        assert span >= 1, '-> span invalid.'
+
+        self.port = port
+        self.port_type = port_type
+        self.intervals = intervals # exchange every n time steps (None: every one)
+        self.threshold = threshold # relative change sent (None: any)
+        self.start_time = start_time
+        self.time_step = time_step
+        self.span = span # time steps of a step of the slot (see time_step_multiple)
+
+        self.last_sent = None # provider: copy of the numeric data last put
+        self.last_entry = None # user: (time stamp, data) last got
+#---------------------- end def __init__():---------------------------------------
+
+    def get_key(self):
+        """
+        Returns the key of the port connection.
+        """
+
+        return self.port.get_key()
+#---------------------- end def get_key():----------------------------------------
+
+    def get_port(self):
+        """
+        Returns the wrapped port.
+        """
+
+        return self.port
+#---------------------- end def get_port():---------------------------------------
+
+    def put(self, time_stamp, data):
+        """
+        Publishes data at time_stamp if the connection exchanges then; data that
+        did not change by more than the threshold only get the new time stamp.
+        """
+
+        if not self.is_exchange_time(time_stamp):
+            return
+
+        if self.threshold is not None and self.last_sent is not None and \
+           not has_changed(self.last_sent, data, self.threshold):
+            self.port.touch(time_stamp)
+            return
+
+        self.port.put(time_stamp, data)
+
+        if self.threshold is not None:
+            self.last_sent = get_numeric_copy(data)
+#---------------------- end def put():--------------------------------------------
+
+    def get(self, time_stamp=None, timeout=None):
+        """
+        Returns (time stamp, data) as the port does if the connection exchanges at
+        time_stamp; the data got last otherwise (if any).
+        """
+
+        if self.last_entry is not None and time_stamp is not None and \
+           not self.is_exchange_time(time_stamp):
+            return self.last_entry
+
+        entry = self.port.get(time_stamp, timeout)
+        if entry is not None:
+            self.last_entry = entry
+
+        return entry
+#---------------------- end def get():--------------------------------------------
+
+    def has_data(self, time_stamp=None):
+        """
+        Returns true iff the port has data for time_stamp (see get()).
+        """
+
+        if self.last_entry is not None and time_stamp is not None and \
+           not self.is_exchange_time(time_stamp):
+            return True
+
+        return self.port.has_data(time_stamp)
+#---------------------- end def has_data():---------------------------------------
+
+    def is_exchange_time(self, time_stamp):
+        """
+        Returns true iff the connection exchanges at time_stamp.
+        """
+
+        step = int(round((time_stamp - self.start_time) / self.time_step))
+
+        return is_exchange_step(step, self.intervals, self.span)
+#---------------------- end def is_exchange_time():-------------------------------
+
+    def __str__(self):
+        """
+        PortExchange to string conversion
+        """
+
+        return 'exchange:' + str(self.port)
+#---------------------- end def __str__():----------------------------------------
+
+    def __repr__(self):
+        """
+        PortExchange to string conversion
+        """
+
+        return 'exchange:' + str(self.port)
+#---------------------- end def __repr__():---------------------------------------
+
+#====================== end class PortExchange: ==================================
+
+def is_exchange_step(step, intervals, span=1):
+    """
+    Returns true iff a step of a slot starting at time step index step (and
+    spanning span time steps) exchanges under any of the intervals (None: every
+    time step).
+    """
+
+    if intervals is None:
+        return True
+
+    for interval in intervals:
+        if (-step) % interval < span: # a multiple of interval in [step, step+span)
+            return True
+
+    return False
+#---------------------- end def is_exchange_step():-------------------------------
+
+def get_numeric_copy(data):
+    """
+    Returns a copy of data as a float array; None if not numeric.
+    """
+
+    try:
+        return np.array(data, dtype=np.float64)
+    except (TypeError, ValueError):
+        return None
+#---------------------- end def get_numeric_copy():-------------------------------
+
+def has_changed(previous, data, threshold):
+    """
+    Returns true iff numeric data changed from previous (see get_numeric_copy())
+    by more than threshold relative to its largest magnitude; data that are not
+    numeric always changed.
+    """
+
+    if previous is None:
+        return True
+
+    current = get_numeric_copy(data)
+    if current is None or current.shape != previous.shape:
+        return True
+
+    if current.size == 0:
+        return False
+
+    scale = np.abs(previous).max()
+    change = np.abs(current - previous).max()
+
+    if scale == 0.0:
+        return change > threshold
+
+    return change > threshold * scale
+#---------------------- end def has_changed():------------------------------------
@@ -14,13 +14,16 @@ Cortix: a program for system-level modules coupling, execution, and analysis.
 """
 #*********************************************************************************
 import os
+import sys
 import logging
-import time
 import datetime
-from mpi4py import MPI
-from mpi4py.futures import MPIPoolExecutor
 import importlib
+from concurrent.futures import ThreadPoolExecutor
 import xml.etree.ElementTree as ElementTree
+from cortix.src.mpiport import create_mpi_ports
+from cortix.src.exchange import PortExchange, is_exchange_step
+from cortix.src.checkpoint import write_checkpoint, read_checkpoint
+from cortix.src.slotprofiler import SlotProfiler
 #*********************************************************************************
 
 class Launcher():
@@ -35,7 +38,11 @@ class Launcher():
                  work_dir,
                  cortix_param_full_path_file_name,
                  cortix_comm_full_path_file_name,
-                 runtime_status_full_path):
+                 runtime_status_full_path,
+                 memory_ports=None,
+                 mpi_transport=False,
+                 conductor=None,
+                 restart_step=None):
 
         self.module_name = module_name
         self.slot_id = slot_id
@@ -45,6 +52,11 @@ class Launcher():
         self.runtime_status_full_path = runtime_status_full_path
         self.exec_full_path_file_name = exec_full_path_file_name
         self.work_dir = work_dir
+        self.memory_ports = memory_ports # MemoryPort objects by key (or None)
+        self.mpi_transport = mpi_transport # set up the task's mpi ports
+        self.conductor = conductor # SlotConductor under lockstep synchronization
+        self.restart_step = restart_step # checkpoint to restart from (or None)
+        self.mpi_ports = None # MPIPort objects by port name (None: not set up)
 
         # Create logger for this driver and its imported pymodule
         log = logging.getLogger('launcher-' + self.module_name + '_' + \
@@ -144,6 +156,41 @@ class Launcher():
         else:
             assert False, 'time unit invalid: %r' % (time_step_unit)
 
+        # step timing and sampled profiling of the slot (optional in the file)
+        node = cortix_param_xml_root_node.find('profiling')
+        profiling = dict()
+        if node is not None:
+            for (key, value) in node.items():
+                if key == 'buffer':
+                    profiling['buffer_size'] = int(value.strip())
+                elif key == 'sample_interval' or key == 'top':
+                    profiling[key] = int(value.strip())
+                elif key == 'memory':
+                    profiling[key] = value.strip() == 'true'
+                else:
+                    assert False, 'invalid profiling attribute %r' % key
+        slot_name = self.module_name + '_' + str(self.slot_id)
+        profiler = SlotProfiler(slot_name, **profiling)
+
+        # subcycling: the slot steps, and exchanges data, once every
+        # time_step_multiple time steps (optional in the file)
+        time_step_multiple = 1
+        for node in cortix_param_xml_root_node.findall('time_step_multiple'):
+            if node.get('slot') == slot_name:
+                time_step_multiple = int(node.text.strip())
+        assert time_step_multiple >= 1, 'time_step_multiple invalid.'
+
+        # checkpoints of the driver every interval time steps (optional in the
+        # file; see checkpoint.py)
+        node = cortix_param_xml_root_node.find('checkpoint')
+        checkpoint_interval = 0 # none
+        checkpoint_keep = 2
+        if node is not None:
+            checkpoint_interval = int(node.get('interval', '0').strip())
+            checkpoint_keep = int(node.get('keep', '2').strip())
+        assert checkpoint_interval >= 0, 'checkpoint interval invalid.'
+        assert checkpoint_keep >= 1, 'checkpoint keep invalid.'
+
         assert os.path.isfile(self.cortix_comm_full_path_file_name),\
         'file %r not available;stop.' % self.cortix_comm_full_path_file_name
 
@@ -153,23 +200,89 @@ class Launcher():
         # setup ports
         nodes = cortix_comm_xml_root_node.findall('port')
         ports = list()
+        exchanges = list() # (intervals, threshold) of the ports (see PortExchange)
+        mpi_specs = list()
         if nodes is not None:
             for node in nodes:
                 port_name = node.get('name')
                 port_type = node.get('type')
                 port_file = node.get('file')
                 port_directory = node.get('directory')
+                port_memory = node.get('memory')
+                port_mpi = node.get('mpi')
+
+                intervals = node.get('interval')
+                if intervals is not None:
+                    intervals = tuple(int(i) for i in intervals.split())
+                threshold = node.get('threshold')
+                if threshold is not None:
+                    threshold = float(threshold)
+                exchanges.append((intervals, threshold))
 
                 if port_file is not None:
                     ports.append((port_name, port_type, port_file))
                 elif port_directory is not None:
                     ports.append((port_name, port_type, port_directory))
+                elif port_memory is not None:
+                    assert self.memory_ports is not None and \
+                           port_memory in self.memory_ports, \
+                           'memory port %r not available.' % port_memory
+                    ports.append((port_name, port_type, \
+                                  self.memory_ports[port_memory]))
+                elif port_mpi is not None:
+                    assert self.mpi_transport, \
+                    'mpi port %r without mpi transport.' % port_mpi
+                    ports.append((port_name, port_type, port_mpi))
+                    mpi_specs.append((port_name, port_type, port_mpi))
                 else:
                     assert False, 'port mode incorrect. fatal.'
 
         tree = None
+
+        # every launcher of the task takes part in setting up the mpi channels
+        mpi_ports = dict()
+        self.mpi_ports = mpi_ports # joined the setup (see fail_mpi_ports())
+        if self.mpi_transport:
+            mpi_ports = create_mpi_ports(slot_name, mpi_specs)
+            self.mpi_ports = mpi_ports
+            ports = [(name, kind, mpi_ports[name]) if name in mpi_ports else \
+                     (name, kind, value) for (name, kind, value) in ports]
+
         self.log.debug('ports: %s', str(ports))
 
+        # the data put by a subcycled slot hold over its macro step for the users
+        # stepping in between (file ports are read by the modules themselves)
+        if time_step_multiple > 1:
+            self.log.info('subcycled: time step multiple %s', \
+                          str(time_step_multiple))
+            hold = (time_step_multiple - 0.5) * time_step
+            for (port_name, port_type, port) in ports:
+                if port_type == 'provide' and hasattr(port, 'set_hold'):
+                    port.set_hold(hold)
+
+        # connections exchanging less often than every time step: memory and mpi
+        # ports are wrapped; file ports are skipped with the port calls below
+        # (when none of the connections of the slot exchanges)
+        for (i, (port_name, port_type, port)) in enumerate(ports):
+            (intervals, threshold) = exchanges[i]
+            if (intervals is not None or threshold is not None) and \
+               hasattr(port, 'put'):
+                ports[i] = (port_name, port_type, \
+                            PortExchange(port, port_type, intervals, threshold, \
+                                         start_time, time_step, \
+                                         time_step_multiple))
+        call_intervals = None # port calls on every time step
+        if len(exchanges) > 0 and \
+           all(intervals is not None for (intervals, _) in exchanges):
+            call_intervals = sorted(set(i for (intervals, _) in exchanges \
+                                          for i in intervals))
+            self.log.info('exchange intervals (time steps): %s', \
+                          str(call_intervals))
+
+        if self.conductor is not None:
+            self.log.info('lockstep; depends on (slot: lag): %s', \
+                          str(self.conductor.get_dependencies()))
+
         # Run module_name
         self.log.info('entered Run %s', self.module_name + '_' + str(self.slot_id) + ' section')
         final_time = start_time + evolve_time
@@ -190,28 +303,96 @@ class Launcher():
         self.log.info("__set_runtime_status(self, 'running')")
 
         facility_time = start_time
-
-        while facility_time <= final_time:
-            self.log.debug('****************************************************************************')
-            self.log.debug('CORTIX::LAUNCHER->***->LAUNCHER->***->LAUNCHER->***->LAUNCHER->***->LAUNCHER')
-            self.log.debug('****************************************************************************')
-
-            self.log.debug('run(%s', str(round(facility_time, 3)) + '[min]): ')
-            start_time = time.time()
-
-            # Data exchange at facility_time (at start_time, this is here for provide
-            # state)
-            guest_driver.CallPorts(facility_time)
-
-            # Advance to facility_time + time_step
-            guest_driver.Execute(facility_time, time_step)
-
-            end_time = time.time()
-            self.log.debug('elapsed time (s): %s', \
-                           str(round(end_time - start_time, 2)))
-
-            self.log.info('run(%s', str(round(facility_time, 3)) + '[min]) ')
-            facility_time += time_step
+        step = 0 # index of the (task) time step
+
+        # restart from a checkpoint: the slots of the task completed the time
+        # steps before it
+        if self.restart_step is not None:
+            facility_time = read_checkpoint(self.work_dir, self.restart_step, \
+                                            guest_driver)
+            step = self.restart_step
+            self.log.info('restarted from the checkpoint of time step %s at ' \
+                          'facility time %s [min]', str(step), \
+                          str(round(facility_time, 3)))
+            if self.conductor is not None:
+                self.conductor.publish(step - 1)
+        first_step = step
+
+        try:
+            while facility_time <= final_time:
+                self.log.debug('****************************************************************************')
+                self.log.debug('CORTIX::LAUNCHER->***->LAUNCHER->***->LAUNCHER->***->LAUNCHER->***->LAUNCHER')
+                self.log.debug('****************************************************************************')
+
+                self.log.debug('run(%s', str(round(facility_time, 3)) + '[min]): ')
+                profiler.start_step()
+
+                # checkpoint at the start of the time step
+                if checkpoint_interval > 0 and step != first_step and \
+                   step % checkpoint_interval == 0:
+                    file_name = write_checkpoint(self.work_dir, step, \
+                                facility_time, guest_driver, checkpoint_keep, \
+                                [ports] + [port for (_, _, port) in ports])
+                    self.log.info('checkpoint: %s', file_name)
+
+                # lockstep: the slots this one depends on are far enough (see the
+                # coupling schemes in conductor.py)
+                if self.conductor is not None:
+                    self.conductor.wait_dependencies(step)
+
+                # Time steps spanned by this (macro) step; the last one of a
+                # subcycled slot may be shorter
+                n_steps = 0
+                next_time = facility_time
+                while n_steps < time_step_multiple and next_time <= final_time:
+                    n_steps += 1
+                    next_time += time_step
+
+                # Data exchange at facility_time (at start_time, this is here for
+                # provide state); skipped if none of the connections exchanges
+                if is_exchange_step(step, call_intervals, n_steps):
+                    guest_driver.CallPorts(facility_time)
+                profiler.end_call_ports()
+
+                # pipelined providers may publish their data of the next step
+                if self.conductor is not None:
+                    self.conductor.publish_ports(step)
+
+                # Advance to facility_time + n_steps * time_step
+                guest_driver.Execute(facility_time, n_steps * time_step)
+
+                # per time step, as the cost of the slot (see read_slot_costs())
+                elapsed_time = profiler.end_step(facility_time, n_steps) / n_steps
+                self.log.debug('elapsed time (s): %s', str(elapsed_time))
+
+                # the conductor counts time steps: a macro step completes them all
+                if self.conductor is not None:
+                    self.conductor.publish(step + n_steps - 1)
+
+                self.log.info('run(%s', str(round(facility_time, 3)) + '[min]) ')
+                step += n_steps
+                facility_time = next_time
+        except Exception:
+            # let the task monitor know right away instead of waiting forever
+            self.log.exception('run() failed at facility time %s [min]', \
+                               str(round(facility_time, 3)))
+            self.__write_profile(profiler)
+            self.__set_runtime_status('failed')
+            self.log.info("__set_runtime_status(self, 'failed')")
+            raise
+
+        self.__write_profile(profiler)
+
+        if self.conductor is not None:
+            self.conductor.finish()
+
+        # flush and close the mpi channels; users drain until their providers end
+        for port in mpi_ports.values():
+            port.close()
+
+        # users waiting on the memory ports of the slot get no more data
+        for (key, port) in self.__get_provided_memory_ports():
+            port.close()
 
         self.__set_runtime_status('finished')
         self.log.info("__set_runtime_status(self, 'finished'")
@@ -220,11 +401,35 @@ class Launcher():
     def __del__(self):
 
         self.log.info('destroyed launcher-%s', self.module_name+'_'+str(self.slot_id))
-#---------------------- end def __del__():---------------------------
+#---------------------- end def __del__():----------------------------------------
 
 #*********************************************************************************
 # Private helper functions (internal use: __)
 
+    def __get_provided_memory_ports(self):
+        """
+        Returns the (key, MemoryPort) of the memory ports provided by the slot.
+        """
+
+        return get_provided_memory_ports(self.module_name + '_' + \
+                                         str(self.slot_id), self.memory_ports)
+#---------------------- end def __get_provided_memory_ports():--------------------
+
+    def __write_profile(self, profiler):
+        """
+        Writes the profile summary of the slot in its work directory (before the
+        status changes, so that the task finds it).
+        """
+
+        profiler.write_summary(os.path.join(self.work_dir, 'profile.json'))
+
+        summary = profiler.get_summary()
+        self.log.info('profile: %s steps; call ports (s): %s; execute (s): %s', \
+                      str(summary['n_steps']), \
+                      str(round(summary['total']['call_ports'], 3)), \
+                      str(round(summary['total']['execute'], 3)))
+#---------------------- end def __write_profile():--------------------------------
+
     def __set_runtime_status(self, status):
         """
         Helper function used by the launcher
@@ -232,25 +437,122 @@ class Launcher():
         current run.
         """
 
-        comm = MPI.COMM_WORLD
-        # rank = comm.Get_rank()
-        # size = comm.Get_size()
-        amode = MPI.MODE_WRONLY|MPI.MODE_CREATE
-
         status = status.strip()
-        assert status == 'running' or status == 'finished', 'status invalid.'
-
-        fout = MPI.File.Open(comm, self.runtime_status_full_path, amode)
-        fout.Write(b'<?xml version="1.0" encoding="UTF-8"?>\n')
-        fout.Write(b'<!-- Written by Launcher::__set_runtime_status.py -->\n')
+        assert status == 'running' or status == 'finished' or status == 'failed', \
+        'status invalid.'
 
         today = datetime.datetime.today()
-        fout.Write("".join('<!-- ' + str(today) + ' -->\n').encode())
-        fout.Write(b'<runtime>\n')
-        fout.Write("".join('<status>' + status + '</status>\n').encode())
-        fout.Write(b'</runtime>\n')
-
-        fout.Close()
+        contents = '<?xml version="1.0" encoding="UTF-8"?>\n' + \
+                   '<!-- Written by Launcher::__set_runtime_status.py -->\n' + \
+                   '<!-- ' + str(today) + ' -->\n' + \
+                   '<runtime>\n' + \
+                   '<status>' + status + '</status>\n' + \
+                   '</runtime>\n'
+
+        # the status file belongs to this launcher alone; replace it atomically so
+        # the task monitor never reads it half written
+        tmp_file_name = self.runtime_status_full_path + '.tmp'
+        with open(tmp_file_name, 'w') as fout:
+            fout.write(contents)
+        os.replace(tmp_file_name, self.runtime_status_full_path)
 #---------------------- end def __set_runtime_status():---------------------------
 
 #====================== end class Launcher: ======================================
+
+def run_launcher(mod_lib_parent_dir, mod_lib_name, module_name, slot_id,
+                 input_full_path_file_name,
+                 exec_full_path_file_name,
+                 work_dir,
+                 cortix_param_full_path_file_name,
+                 cortix_comm_full_path_file_name,
+                 runtime_status_full_path,
+                 memory_ports=None,
+                 mpi_transport=False,
+                 conductor=None,
+                 restart_step=None):
+    """
+    Creates a Launcher and runs it to completion. This is the callable submitted
+    to the task executor; being a module level function it is picklable, and the
+    Launcher (which holds a logger and the imported driver) is built inside the
+    worker process.
+    """
+
+    # worker processes may not inherit the module library search path
+    if mod_lib_parent_dir is not None and mod_lib_parent_dir not in sys.path:
+        sys.path.insert(1, mod_lib_parent_dir)
+
+    launch = None
+    try:
+        launch = Launcher(mod_lib_name, module_name, slot_id,
+                          input_full_path_file_name,
+                          exec_full_path_file_name,
+                          work_dir,
+                          cortix_param_full_path_file_name,
+                          cortix_comm_full_path_file_name,
+                          runtime_status_full_path,
+                          memory_ports,
+                          mpi_transport,
+                          conductor,
+                          restart_step)
+        launch.run()
+    except Exception as error:
+        # the users of a failed slot are not left waiting for its next step
+        if conductor is not None:
+            conductor.finish(failed=True)
+        slot_name = module_name + '_' + str(slot_id)
+        for (key, port) in get_provided_memory_ports(slot_name, memory_ports):
+            port.close(failed=True)
+        if mpi_transport:
+            fail_mpi_ports(slot_name, None if launch is None else \
+                           launch.mpi_ports, error)
+        raise
+
+    return runtime_status_full_path
+#---------------------- end def run_launcher():-----------------------------------
+
+def get_provided_memory_ports(slot_name, memory_ports):
+    """
+    Returns the list of (key, MemoryPort) of the memory ports provided by a slot
+    (keys '<provider slot>/<provider port>'); memory_ports may be None.
+    """
+
+    if memory_ports is None:
+        return list()
+
+    return [(key, port) for (key, port) in memory_ports.items() \
+            if key.split('/')[0] == slot_name]
+#---------------------- end def get_provided_memory_ports():----------------------
+
+def fail_mpi_ports(slot_name, mpi_ports, error):
+    """
+    Ends the mpi channels of a failed slot: its providers send a failure header
+    and its users raise on it (see MPIPort.close()). A slot that failed before
+    setting up its channels (mpi_ports None) still joins the collective setup
+    with its error, so that the other launchers raise instead of waiting for it.
+    """
+
+    if mpi_ports is None:
+        try:
+            create_mpi_ports(slot_name, list(), error=repr(error))
+        except RuntimeError: # raised by every launcher of the task
+            pass
+        return
+
+    for port in mpi_ports.values():
+        port.close(failed=True)
+#---------------------- end def fail_mpi_ports():---------------------------------
+
+def run_launcher_group(launcher_args_list):
+    """
+    Runs the launchers of a group of slots placed on the same worker (see
+    SlotScheduler), each in its own thread, to completion. launcher_args_list is
+    a list of run_launcher() argument tuples. Returns the list of runtime status
+    files; raises the first exception of a failed launcher.
+    """
+
+    with ThreadPoolExecutor(max_workers=len(launcher_args_list)) as threads:
+        futures = [threads.submit(run_launcher, *launcher_args) \
+                   for launcher_args in launcher_args_list]
+
+    return [future.result() for future in futures]
+#---------------------- end def run_launcher_group():-----------------------------
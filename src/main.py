@@ -17,6 +17,7 @@ import os
 import logging
 from cortix.src.simulation import Simulation
 from cortix.src.utils.configtree import ConfigTree
+from cortix.src.utils.workspace import make_dirs, remove_dir
 from cortix.src.utils.set_logger_level import set_logger_level
 #*********************************************************************************
 
@@ -27,12 +28,16 @@ class Cortix():
     user with an interface to the simulations.
     """
 
-    def __init__(self, name=None, config_file="cortix-config.xml"):
+    def __init__(self, name=None, config_file="cortix-config.xml", restart=False):
 
         assert name is not None, "must give Cortix object a name"
         assert isinstance(config_file, str), "-> configFile not a str."
         self.config_file = config_file
 
+        # resume the tasks from their checkpoints (see checkpoint.py) in the work
+        # directory of a previous run, instead of starting anew
+        self.restart = restart
+
         # Create a configuration tree
         self.config_tree = ConfigTree(config_file_name=self.config_file)
 
@@ -53,11 +58,14 @@ class Cortix():
 
         self.work_dir = work_dir + self.name + "-wrk/"
 
-        # Create the work directory
-        if os.path.isdir(self.work_dir):
-            os.system('rm -rf ' + self.work_dir)
+        # cached run plans survive the work directory (see RunPlan)
+        self.cache_dir = work_dir + self.name + "-cache/"
+
+        # Create the work directory (kept on restart for its checkpoints)
+        if os.path.isdir(self.work_dir) and not self.restart:
+            remove_dir(self.work_dir)
 
-        os.system('mkdir -p ' + self.work_dir)
+        make_dirs(self.work_dir)
 
         # Create the logging facility for each object
         node = self.config_tree.get_sub_node("logger")
@@ -129,7 +137,8 @@ class Cortix():
         for sim in self.config_tree.get_all_sub_nodes('simulation'):
             self.log.debug("SetupSimulations(): simulation name: %s", sim.get('name'))
             sim_config_tree = ConfigTree(sim)
-            simulation = Simulation(self.work_dir, sim_config_tree)
+            simulation = Simulation(self.work_dir, sim_config_tree, self.cache_dir, \
+                                    self.restart)
             self.simulations.append(simulation)
 #---------------------- end def __setup_simulations():----------------------------
 
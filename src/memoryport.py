@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+MemoryPort and MemoryPortHub classes of Cortix. Ports in mode="memory" exchange
+Python objects (e.g. an ElementTree node or a NumPy array) between the module slots
+of a task through a manager process instead of port files.
+
+Cortix: a program for system-level modules coupling, execution, and analysis.
+"""
+#*********************************************************************************
+import time
+import multiprocessing
+#*********************************************************************************
+
+class MemoryPort:
+    """
+    Handle to one in-memory port connection, identified by the key
+    '<provider slot>/<provider port>'. The provider puts the data of a time stamp;
+    users get the latest data published at or after a given time stamp, or held
+    over it: a subcycled provider publishes once per macro step, and its data hold
+    until its next publication (see set_hold()). A provider may also touch() the
+    port: its last data stand for a later time stamp without being sent again,
+    and users only read data they do not have yet. When the provider is done
+    (see close()) users are no longer left waiting for data that will not come.
+    MemoryPort objects are picklable and are handed to the launchers.
+    """
+
+    def __init__(self, key=None, board=None, condition=None):
+
+        assert isinstance(key, str), '-> key not a str.'
+        assert board is not None, '-> board missing.'
+        assert condition is not None, '-> condition missing.'
+
+        self.key = key
+        self.board = board
+        self.condition = condition
+        self.hold = 0.0 # time span over which the data put hold (minutes)
+        self.data_key = key + '#data' # board entry of the data
+        self.status_key = key + '#status' # 'closed' or 'failed' provider
+        self.data_time = None # provider: time stamp of the data last put
+        self.cached = None # user: (time stamp, data) of the data last read
+#---------------------- end def __init__():---------------------------------------
+
+    def get_key(self):
+        """
+        Returns the key of the port connection.
+        """
+
+        return self.key
+#---------------------- end def get_key():----------------------------------------
+
+    def set_hold(self, hold):
+        """
+        Sets the time span over which the data put by the provider hold: data
+        published at time t serve the users up to t + hold.
+        """
+
+        assert hold >= 0.0, '-> hold invalid.'
+
+        self.hold = float(hold)
+#---------------------- end def set_hold():---------------------------------------
+
+    def put(self, time_stamp, data):
+        """
+        Publishes data at time_stamp and wakes up the waiting users.
+        """
+
+        time_stamp = float(time_stamp)
+
+        with self.condition:
+            self.board[self.data_key] = (time_stamp, data)
+            self.board[self.key] = (time_stamp, self.hold, time_stamp)
+            self.condition.notify_all()
+
+        self.data_time = time_stamp
+#---------------------- end def put():--------------------------------------------
+
+    def touch(self, time_stamp):
+        """
+        Publishes the data last put as the data at time_stamp (unchanged data are
+        not sent again) and wakes up the waiting users.
+        """
+
+        assert self.data_time is not None, 'touch before put; key %r' % self.key
+
+        with self.condition:
+            self.board[self.key] = (float(time_stamp), self.hold, self.data_time)
+            self.condition.notify_all()
+#---------------------- end def touch():------------------------------------------
+
+    def get(self, time_stamp=None, timeout=None):
+        """
+        Returns (time stamp, data) of the latest publication; if time_stamp is
+        given, waits until the publication is at least that recent (or holds over
+        it). Returns None on timeout or if the provider closed the port before;
+        raises RuntimeError if the provider failed.
+        """
+
+        if timeout is not None:
+            deadline = time.time() + timeout
+
+        with self.condition:
+            while True:
+                entry = self.board.get(self.key, None)
+                if entry is not None:
+                    if time_stamp is None or entry[0] >= time_stamp - entry[1]:
+                        return (entry[0], self.__get_data(entry[2]))
+
+                status = self.board.get(self.status_key, None)
+                if status == 'failed':
+                    raise RuntimeError('provider of memory port %r failed' \
+                                       % self.key)
+                if status == 'closed':
+                    return None
+
+                if timeout is None:
+                    self.condition.wait()
+                else:
+                    remaining = deadline - time.time()
+                    if remaining <= 0.0:
+                        return None
+                    self.condition.wait(remaining)
+#---------------------- end def get():--------------------------------------------
+
+    def has_data(self, time_stamp=None):
+        """
+        Returns true iff data (at least as recent as time_stamp, or holding over
+        it) was published.
+        """
+
+        entry = self.board.get(self.key, None)
+        if entry is None:
+            return False
+
+        return time_stamp is None or entry[0] >= time_stamp - entry[1]
+#---------------------- end def has_data():---------------------------------------
+
+    def close(self, failed=False):
+        """
+        Records that the provider is done putting (failed or not) and wakes up the
+        waiting users (see get()).
+        """
+
+        with self.condition:
+            self.board[self.status_key] = 'failed' if failed else 'closed'
+            self.condition.notify_all()
+#---------------------- end def close():------------------------------------------
+
+#*********************************************************************************
+# Private helper functions (internal use: __)
+
+    def __get_data(self, data_time):
+        """
+        Returns the data put at data_time; read from the board only if not read
+        already.
+        """
+
+        if self.cached is None or self.cached[0] != data_time:
+            self.cached = self.board[self.data_key]
+
+        return self.cached[1]
+#---------------------- end def __get_data():-------------------------------------
+
+    def __str__(self):
+        """
+        MemoryPort to string conversion
+        """
+
+        return 'memory:' + self.key
+#---------------------- end def __str__():----------------------------------------
+
+    def __repr__(self):
+        """
+        MemoryPort to string conversion
+        """
+
+        return 'memory:' + self.key
+#---------------------- end def __repr__():---------------------------------------
+
+#====================== end class MemoryPort: ====================================
+
+class MemoryPortHub:
+    """
+    Owns the manager process that holds the in-memory port data of a task. It is
+    created by the task before the launchers are submitted and shut down after they
+    are joined.
+    """
+
+    def __init__(self):
+
+        self.manager = multiprocessing.Manager()
+        self.board = self.manager.dict()
+        self.condition = self.manager.Condition()
+        self.ports = dict()
+#---------------------- end def __init__():---------------------------------------
+
+    def get_port(self, key):
+        """
+        Returns the MemoryPort of a port connection key; created on first use.
+        """
+
+        if key not in self.ports:
+            self.ports[key] = MemoryPort(key, self.board, self.condition)
+
+        return self.ports[key]
+#---------------------- end def get_port():---------------------------------------
+
+    def get_ports(self):
+        """
+        Returns a dictionary of all MemoryPort objects created so far by key.
+        """
+
+        return self.ports
+#---------------------- end def get_ports():--------------------------------------
+
+    def close_provider(self, slot_name, failed=False):
+        """
+        Closes the ports provided by a slot (see MemoryPort.close()), e.g. when its
+        launcher died without closing them.
+        """
+
+        for (key, port) in self.ports.items():
+            if key.split('/')[0] == slot_name:
+                port.close(failed)
+#---------------------- end def close_provider():---------------------------------
+
+    def shutdown(self):
+        """
+        Stops the manager process.
+        """
+
+        self.manager.shutdown()
+#---------------------- end def shutdown():---------------------------------------
+
+#====================== end class MemoryPortHub: =================================
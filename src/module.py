@@ -14,9 +14,9 @@ Cortix: a program for system-level modules coupling, execution, and analysis.
 """
 #*********************************************************************************
 import os
-from mpi4py.futures import MPIPoolExecutor
 from cortix.src.utils.configtree import ConfigTree
-from cortix.src.launcher import Launcher
+from cortix.src.utils.workspace import make_dirs
+from cortix.src.launcher import run_launcher
 #*********************************************************************************
 
 class Module:
@@ -47,7 +47,11 @@ class Module:
         self.input_file_name = 'null-input_file_name'
         self.input_file_path = 'null-input_file_path'
 
+        self.time_step_multiple = 1 # macro step of the slots in task time steps
+
         self.ports = list()  # list of (portName, portType, portMultiplicity)
+        self.port_index = dict() # portName -> (portName, portType, portMode,
+                                 #              portMultiplicity)
 
         # Save config data
         for child in self.config_node.get_node_children():
@@ -71,6 +75,11 @@ class Module:
                     text += '/'
                 self.input_file_path = text
 
+            if tag == 'time_step_multiple':
+                self.time_step_multiple = int(text)
+                assert self.time_step_multiple >= 1, \
+                'time_step_multiple of module %r invalid.' % self.mod_name
+
             if tag == 'library':
                 assert len(attributes) == 1, 'only name of library allowed.'
                 key = attributes[0][0]
@@ -103,7 +112,8 @@ class Module:
                         tmp['portType'] = val   # portType
                     elif key == 'mode':
                         file_value = val.split('.')[0]
-                        assert file_value == 'file' or file_value == 'directory',\
+                        assert file_value == 'file' or file_value == 'directory' \
+                        or file_value == 'memory' or file_value == 'mpi', \
                         'port attribute value invalid.'
                         tmp['portMode'] = val
                     elif key == 'multiplicity':
@@ -116,6 +126,7 @@ class Module:
                          tmp['portMultiplicity'])
                 self.ports.append(store) # (portName, portType, portMode,
                                          #  portMultiplicity)
+                self.port_index[tmp['portName']] = store
                 tmp = None
                 store = None
 #---------------------- end def __init__():---------------------------------------
@@ -144,6 +155,16 @@ class Module:
         return self.mod_lib_parent_dir
 #---------------------- end def get_library_parent_dir():-------------------------
 
+    def get_time_step_multiple(self):
+        """
+        Returns the macro step of the module slots in task time steps: the slots
+        are subcycled, exchanging data and stepping once every time_step_multiple
+        task time steps (1: every step).
+        """
+
+        return self.time_step_multiple
+#---------------------- end def get_time_step_multiple():-------------------------
+
     def get_ports(self):
         """
         Returns a list of the module's ports.
@@ -157,11 +178,10 @@ class Module:
         Retuns the port type specified by port_name
         """
 
-        port_type = None
-        for port in self.ports:
-            if port[0] == port_name:
-                port_type = port[1]
-        return port_type
+        port = self.port_index.get(port_name, None)
+        if port is None:
+            return None
+        return port[1]
 #---------------------- end def get_port_type():----------------------------------
 
     def get_port_mode(self, port_name):
@@ -169,11 +189,10 @@ class Module:
         Returns the port mode specified by port_name
         """
 
-        port_mode = None
-        for port in self.ports:
-            if port[0] == port_name:
-                port_mode = port[2]
-        return port_mode
+        port = self.port_index.get(port_name, None)
+        if port is None:
+            return None
+        return port[2]
 #---------------------- end def get_port_mode():----------------------------------
 
     def get_port_names(self):
@@ -193,15 +212,19 @@ class Module:
         port_name is available in the module.
         """
 
-        for port in self.ports:
-            if port[0] == port_name:
-                return True
-        return False
+        return port_name in self.port_index
 #---------------------- end def has_port_name():----------------------------------
 
-    def execute(self, slot_id, runtime_cortix_param_file, runtime_cortix_comm_file):
+    def get_launcher_args(self, slot_id, runtime_cortix_param_file,
+                          runtime_cortix_comm_file, memory_ports=None,
+                          mpi_transport=False, conductor=None, restart_step=None):
         """
-        Spawns a worker process to execute the module.
+        Prepares the module slot work directory and returns the runtime status
+        file and the arguments of run_launcher() for the slot. memory_ports is a
+        dictionary of the task's MemoryPort objects by key, if any; mpi_transport
+        tells the launcher to set up the task's mpi ports; conductor is the
+        SlotConductor of the slot under lockstep synchronization, if any;
+        restart_step is the time step of the checkpoint to restart from, if any.
         """
 
         module_input = self.input_file_path + self.input_file_name
@@ -220,25 +243,43 @@ class Module:
         assert os.path.isdir(full_path_comm_dir), 'module directory not available.'
         mod_work_dir = full_path_comm_dir + 'wrk/'
 
-        os.system('mkdir -p ' + mod_work_dir)
+        make_dirs(mod_work_dir) # normally there already (see RunPlan.write_files())
 
         assert os.path.isdir(mod_work_dir), 'module work directory not available.'
 
         # only for wrapped modules
         mod_exec_name = self.executable_path + self.executable_name
 
-        # run module on its own thread using file IO communication
-        launch = Launcher(mod_lib_name, mod_name,
-                          slot_id,
-                          module_input,
-                          mod_exec_name,
-                          mod_work_dir,
-                          param, comm, status)
-
-        # Launch an MPI process
-        executor = MPIPoolExecutor(max_workers=1)
-        future = executor.submit(launch.run())
-        return runtime_module_status_file
+        launcher_args = (self.mod_lib_parent_dir,
+                         mod_lib_name, mod_name,
+                         slot_id,
+                         module_input,
+                         mod_exec_name,
+                         mod_work_dir,
+                         param, comm, status,
+                         memory_ports, mpi_transport, conductor, restart_step)
+
+        return (runtime_module_status_file, launcher_args)
+#---------------------- end def get_launcher_args():------------------------------
+
+    def execute(self, slot_id, runtime_cortix_param_file, runtime_cortix_comm_file,
+                executor, memory_ports=None, mpi_transport=False, conductor=None,
+                restart_step=None):
+        """
+        Submits the module launcher to the executor (shared by all slots of a
+        task). See get_launcher_args() for the other arguments. Returns the
+        runtime status file and the future of the launcher.
+        """
+
+        (runtime_module_status_file, launcher_args) = \
+        self.get_launcher_args(slot_id, runtime_cortix_param_file,
+                               runtime_cortix_comm_file, memory_ports,
+                               mpi_transport, conductor, restart_step)
+
+        # run module on its own worker; the launcher is created in the worker
+        future = executor.submit(run_launcher, *launcher_args)
+
+        return (runtime_module_status_file, future)
 #---------------------- end def execute():----------------------------------------
 
 #====================== end class Module: ========================================
@@ -0,0 +1,401 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+MPIPort class of Cortix. Ports in mode="mpi" exchange Python objects between the
+module slots of a task with MPI point-to-point messages; every (provide port, use
+port) edge of the network graph is a persistent send/receive channel between the
+ranks the slots run on.
+
+Cortix: a program for system-level modules coupling, execution, and analysis.
+"""
+#*********************************************************************************
+import time
+import pickle
+from cortix.src.utils.lazyimport import lazy_import
+np = lazy_import('numpy')
+MPI = lazy_import('mpi4py.MPI')
+#*********************************************************************************
+
+_INITIAL_CAPACITY = 4096 # bytes of the payload buffer of a new channel
+
+def _get_capacity(n_bytes, capacity):
+    """
+    Returns the payload buffer capacity needed for n_bytes; the buffer is only
+    grown, doubling its capacity.
+    """
+
+    while capacity < n_bytes:
+        capacity *= 2
+    return capacity
+#---------------------- end def _get_capacity():----------------------------------
+
+class MPIPort:
+    """
+    One end of the MPI channels of a port connection, identified by the key
+    '<provider slot>/<provider port>'. A provide end sends to every user of the
+    port; a use end receives from the provider. Messages are a header (time stamp,
+    number of bytes, hold; see set_hold()) and a pickled payload (none after a
+    touch(): the last data stand for the new time stamp); both go through
+    persistent requests on preallocated buffers that are reused (and only grown)
+    from step to step. The payload requests count the pickled bytes only; both
+    ends re-initialize them when the number of bytes changes (the receiver reads
+    it in the header).
+
+    put() returns once the sends are started (the previous ones must have
+    completed); get() returns the latest message at least as recent as the given
+    time stamp. Same interface as MemoryPort: a provider that fails ends its
+    channels with a failure header (see close()) and its users raise on it.
+    """
+
+    def __init__(self, key=None, comm=None, port_type=None, peers=list()):
+
+        assert isinstance(key, str), '-> key not a str.'
+        assert comm is not None, '-> comm missing.'
+        assert port_type == 'provide' or port_type == 'use', \
+        '-> port_type %r invalid.' % port_type
+        assert port_type == 'provide' or len(peers) == 1, \
+        '-> a use port has one provider.'
+
+        self.key = key
+        self.comm = comm
+        self.port_type = port_type
+        self.peers = peers # list of (rank, tag) of the other ends
+
+        self.header = np.zeros(3, dtype=np.float64) # (time stamp, number of bytes,
+                                                    #  hold)
+        self.capacity = _INITIAL_CAPACITY
+        self.payload = np.zeros(self.capacity, dtype=np.uint8)
+        self.payload_count = None # number of bytes of the payload requests
+        self.last_entry = None
+        self.hold = 0.0 # time span over which the data put hold (minutes)
+        self.last_hold = 0.0 # of the last message received
+        self.failed = False # use end: the provider ended the channel failing
+
+        self.header_requests = list()
+        self.payload_requests = list()
+        self.__init_requests()
+
+        if self.port_type == 'use':
+            self.header_requests[0].Start() # always have a header receive posted
+#---------------------- end def __init__():---------------------------------------
+
+    def get_key(self):
+        """
+        Returns the key of the port connection.
+        """
+
+        return self.key
+#---------------------- end def get_key():----------------------------------------
+
+    def set_hold(self, hold):
+        """
+        Sets the time span over which the data put by the provider hold: data
+        published at time t serve the users up to t + hold (see MemoryPort).
+        """
+
+        assert hold >= 0.0, '-> hold invalid.'
+
+        self.hold = float(hold)
+#---------------------- end def set_hold():---------------------------------------
+
+    def put(self, time_stamp, data):
+        """
+        Starts sending data at time_stamp to every user of the port.
+        """
+
+        assert self.port_type == 'provide', 'cannot put on a use port.'
+
+        self.__wait_sends()
+
+        buffer = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        n_bytes = len(buffer)
+        if n_bytes != self.payload_count:
+            self.__init_payload_requests(n_bytes)
+
+        self.header[0] = float(time_stamp)
+        self.header[1] = n_bytes
+        self.header[2] = self.hold
+        self.payload[:n_bytes] = np.frombuffer(buffer, dtype=np.uint8)
+
+        MPI.Prequest.Startall(self.header_requests)
+        MPI.Prequest.Startall(self.payload_requests)
+#---------------------- end def put():--------------------------------------------
+
+    def touch(self, time_stamp):
+        """
+        Starts sending to every user that the data last put stand for time_stamp
+        (a header only; unchanged data are not sent again).
+        """
+
+        assert self.port_type == 'provide', 'cannot touch a use port.'
+
+        self.__wait_sends()
+
+        self.header[0] = float(time_stamp)
+        self.header[1] = 0.0
+        self.header[2] = self.hold
+
+        MPI.Prequest.Startall(self.header_requests)
+#---------------------- end def touch():------------------------------------------
+
+    def get(self, time_stamp=None, timeout=None):
+        """
+        Returns (time stamp, data) of the latest message received; if time_stamp
+        is given, receives until the message is at least that recent (or holds
+        over it). Returns None on timeout or if the provider closed the channel
+        before; raises RuntimeError if the provider failed.
+        """
+
+        assert self.port_type == 'use', 'cannot get on a provide port.'
+
+        if timeout is not None:
+            deadline = time.time() + timeout
+
+        # take in whatever already arrived
+        while self.__receive(block=False):
+            pass
+
+        while not self.__is_recent(time_stamp):
+            if self.header_requests[0] is None: # provider closed
+                if self.failed:
+                    raise RuntimeError('provider of mpi port %r failed' \
+                                       % self.key)
+                return None
+            if timeout is None:
+                self.__receive(block=True)
+            elif not self.__receive(block=False):
+                if time.time() >= deadline:
+                    return None
+                time.sleep(0.001)
+
+        return self.last_entry
+#---------------------- end def get():--------------------------------------------
+
+    def has_data(self, time_stamp=None):
+        """
+        Returns true iff data (at least as recent as time_stamp, or holding over
+        it) was received.
+        """
+
+        if self.port_type == 'use':
+            while self.__receive(block=False):
+                pass
+
+        return self.__is_recent(time_stamp)
+#---------------------- end def has_data():---------------------------------------
+
+    def close(self, failed=False):
+        """
+        Closes the channels: a provide end sends an end-of-channel header (a
+        failure header if failed: its users raise instead of waiting for data);
+        a use end receives (and drops) messages until it gets it, or, if failed,
+        cancels its posted receive.
+        """
+
+        if len(self.header_requests) == 0: # closed already (or no peers)
+            return
+
+        if self.port_type == 'provide':
+            self.__wait_sends()
+            self.header[0] = np.inf
+            self.header[1] = -2.0 if failed else -1.0
+            MPI.Prequest.Startall(self.header_requests)
+            MPI.Prequest.Waitall(self.header_requests)
+        elif failed:
+            if self.header_requests[0] is not None:
+                self.header_requests[0].Cancel()
+                self.header_requests[0].Wait()
+        else:
+            while self.header_requests[0] is not None:
+                self.__receive(block=True)
+
+        for request in self.header_requests + self.payload_requests:
+            if request is not None:
+                request.Free()
+        self.header_requests = list()
+        self.payload_requests = list()
+#---------------------- end def close():------------------------------------------
+
+    def __str__(self):
+        """
+        MPIPort to string conversion
+        """
+
+        return 'mpi:' + self.key
+#---------------------- end def __str__():----------------------------------------
+
+    def __repr__(self):
+        """
+        MPIPort to string conversion
+        """
+
+        return 'mpi:' + self.key
+#---------------------- end def __repr__():---------------------------------------
+
+#*********************************************************************************
+# Private helper functions (internal use: __)
+
+    def __init_requests(self):
+        """
+        Creates the persistent header requests of the channels; the payload ones
+        are created with the first payload (see __init_payload_requests()).
+        """
+
+        for (rank, tag) in self.peers:
+            if self.port_type == 'provide':
+                self.header_requests.append( \
+                     self.comm.Send_init([self.header, MPI.DOUBLE], rank, 2*tag))
+            else:
+                self.header_requests.append( \
+                     self.comm.Recv_init([self.header, MPI.DOUBLE], rank, 2*tag))
+#---------------------- end def __init_requests():--------------------------------
+
+    def __init_payload_requests(self, n_bytes):
+        """
+        Replaces the payload requests by requests of n_bytes, growing the payload
+        buffer if needed. The previous requests must be complete.
+        """
+
+        for request in self.payload_requests:
+            request.Free()
+        self.payload_requests = list()
+
+        if n_bytes > self.capacity:
+            self.capacity = _get_capacity(n_bytes, self.capacity)
+            self.payload = np.zeros(self.capacity, dtype=np.uint8)
+
+        for (rank, tag) in self.peers:
+            if self.port_type == 'provide':
+                self.payload_requests.append(self.comm.Send_init( \
+                     [self.payload, n_bytes, MPI.BYTE], rank, 2*tag+1))
+            else:
+                self.payload_requests.append(self.comm.Recv_init( \
+                     [self.payload, n_bytes, MPI.BYTE], rank, 2*tag+1))
+        self.payload_count = n_bytes
+#---------------------- end def __init_payload_requests():------------------------
+    def __wait_sends(self):
+        """
+        Waits for the previous sends; the buffers are reused.
+        """
+
+        MPI.Prequest.Waitall(self.header_requests)
+        MPI.Prequest.Waitall(self.payload_requests)
+#---------------------- end def __wait_sends():-----------------------------------
+
+    def __receive(self, block=True):
+        """
+        Completes the posted header receive and its payload. Returns true iff a
+        message (or the end of the channel) was received.
+        """
+
+        header_request = self.header_requests[0]
+        if header_request is None:
+            return False
+
+        if block:
+            header_request.Wait()
+        elif not header_request.Test():
+            return False
+
+        time_stamp = float(self.header[0])
+        n_bytes = int(self.header[1])
+
+        if n_bytes < 0: # end of channel (-2: the provider failed)
+            self.failed = n_bytes == -2
+            header_request.Free()
+            self.header_requests[0] = None
+            return True
+
+        if n_bytes == 0: # touched: same data, later time stamp
+            if self.last_entry is not None:
+                self.last_entry = (time_stamp, self.last_entry[1])
+                self.last_hold = float(self.header[2])
+            header_request.Start()
+            return True
+
+        if n_bytes != self.payload_count:
+            self.__init_payload_requests(n_bytes)
+
+        self.payload_requests[0].Start()
+        self.payload_requests[0].Wait()
+        data = pickle.loads(self.payload[:n_bytes].tobytes())
+        self.last_entry = (time_stamp, data)
+        self.last_hold = float(self.header[2])
+
+        header_request.Start()
+
+        return True
+#---------------------- end def __receive():--------------------------------------
+
+    def __is_recent(self, time_stamp):
+        """
+        Returns true iff the last message is at least as recent as time_stamp, or
+        holds over it.
+        """
+
+        if self.last_entry is None:
+            return False
+
+        return time_stamp is None or \
+               self.last_entry[0] >= time_stamp - self.last_hold
+#---------------------- end def __is_recent():------------------------------------
+
+#====================== end class MPIPort: =======================================
+
+def create_mpi_ports(slot_name, port_specs, error=None):
+    """
+    Creates the MPIPort objects of a slot. port_specs is a list of
+    (port name, port type, key) of the mode="mpi" ports of the slot (possibly
+    empty). Collective: every launcher of the task (one per rank of the worker
+    world) must call it, since the slot-to-rank map and the channel tags are
+    agreed on here; a launcher that failed before joins with its error instead
+    (e.g. repr() of the exception), and every launcher then raises
+    RuntimeError. Returns a dictionary of MPIPort objects by port name.
+    """
+
+    comm = MPI.COMM_WORLD.Dup()
+
+    table = comm.allgather((slot_name, port_specs, error))
+
+    errors = [(name, slot_error) for (name, specs, slot_error) in table \
+              if slot_error is not None]
+    if len(errors) > 0:
+        comm.Free()
+        raise RuntimeError('mpi port setup failed in slot(s): %s' % \
+                           '; '.join('%s: %s' % entry for entry in errors))
+
+    ranks = dict()
+    for (rank, (name, specs, _)) in enumerate(table):
+        ranks[name] = rank
+
+    # one channel per (provider key, user slot, use port); same order everywhere
+    channels = list()
+    for (name, specs, _) in table:
+        for (port_name, port_type, key) in specs:
+            if port_type == 'use':
+                channels.append((key, name, port_name))
+    channels.sort()
+
+    mpi_ports = dict()
+    for (port_name, port_type, key) in port_specs:
+        if port_type == 'provide':
+            peers = [(ranks[user], tag) for (tag, (chan_key, user, use_port)) \
+                     in enumerate(channels) if chan_key == key]
+        else:
+            provider = key.split('/')[0]
+            assert provider in ranks, 'provider slot %r of %r not running.' \
+            % (provider, key)
+            tag = channels.index((key, slot_name, port_name))
+            peers = [(ranks[provider], tag)]
+
+        mpi_ports[port_name] = MPIPort(key, comm, port_type, peers)
+
+    return mpi_ports
+#---------------------- end def create_mpi_ports():-------------------------------
@@ -9,13 +9,20 @@
 # https://www.gnu.org/licenses/gpl-3.0.txt
 """
 Network class for the Cortix project. A network defines the connectivity between 
-Cortix modules.
+Cortix modules. A connection may exchange data less often than every time step:
+
+  <connect fromModuleSlot="..." fromPort="..." toModuleSlot="..." toPort="..."
+           exchangeInterval="10" changeThreshold="1e-3"/>
+
+exchanges once every 10 time steps, and only data changed by more than 0.1% (see
+PortExchange).
 
 Cortix: a program for system-level modules coupling, execution, and analysis.
 """
 #*********************************************************************************
-import networkx as nx
 from cortix.src.utils.configtree import ConfigTree
+from cortix.src.utils.lazyimport import lazy_import
+nx = lazy_import('networkx')
 #*********************************************************************************
 
 class Network:
@@ -36,8 +43,9 @@ class Network:
         # cortix communication file for modules
         self.runtime_cortix_comm_file = dict()
 
-        # network graph
-        self.nx_graph = nx.MultiDiGraph(name=self.name)
+        # network graph (built on first use; networkx is only imported then)
+        self.nx_graph = None
+        self.edges = list() # (fromModuleSlot, toModuleSlot, fromPort, toPort)
 
         for child in self.config_node.get_node_children():
             (element, tag, attributes, text) = child
@@ -56,6 +64,14 @@ class Network:
                         value = value.replace(':', '_')
                     if key == 'toModuleSlot':
                         value = value.replace(':', '_')
+                    if key == 'exchangeInterval':
+                        value = int(value)
+                        assert value >= 1, 'exchangeInterval %r invalid in %r ' \
+                        'network' % (value, self.name)
+                    if key == 'changeThreshold':
+                        value = float(value)
+                        assert value >= 0.0, 'changeThreshold %r invalid in %r ' \
+                        'network' % (value, self.name)
                     tmp[key] = value
                 self.connectivity.append(tmp)
                 for (key, val) in tmp.items():
@@ -67,9 +83,7 @@ class Network:
                         'null-runtime_cortix_comm_file'
                 vtx1 = tmp['fromModuleSlot']
                 vtx2 = tmp['toModuleSlot']
-                self.nx_graph.add_edge(vtx1, vtx2,
-                                       fromPort=tmp['fromPort'],
-                                       toPort=tmp['toPort'])
+                self.edges.append((vtx1, vtx2, tmp['fromPort'], tmp['toPort']))
 
         self.slot_names = [name for name in self.runtime_cortix_comm_file.keys()]
 #---------------------- end def __init__():---------------------------------------
@@ -90,6 +104,18 @@ class Network:
         return self.connectivity
 #---------------------- end def get_connectivity():-------------------------------
 
+    def get_exchange(self, connection):
+        """
+        Returns (exchange interval, change threshold) of a connection (an entry of
+        get_connectivity()): the data are exchanged once every exchangeInterval
+        time steps, and only if changed by more than changeThreshold (relative);
+        None if not given (every time step; any change).
+        """
+
+        return (connection.get('exchangeInterval', None), \
+                connection.get('changeThreshold', None))
+#---------------------- end def get_exchange():-----------------------------------
+
     def get_slot_names(self):
         """
         Returns a list of the network's slot names.
@@ -123,9 +149,39 @@ class Network:
         Returns the NXGraph corresponding the network
         """
 
+        if self.nx_graph is None:
+            self.nx_graph = nx.MultiDiGraph(name=self.name)
+            for (vtx1, vtx2, from_port, to_port) in self.edges:
+                self.nx_graph.add_edge(vtx1, vtx2, fromPort=from_port, \
+                                       toPort=to_port)
+
         return self.nx_graph
 #---------------------- end def get_nx_graph():-----------------------------------
 
+    def get_slot_placement(self):
+        """
+        Returns the slot names in the order they are submitted to the executor: a
+        breadth-first traversal of each connected part of the network graph from
+        its most connected slot, so that slots exchanging data are submitted one
+        after the other. This is a best-effort placement only: the executor picks
+        the rank of each submission, and the slots learn each other's ranks when
+        the mpi ports are created (see create_mpi_ports()).
+        """
+
+        graph = self.get_nx_graph().to_undirected()
+
+        placement = list()
+        for component in sorted(nx.connected_components(graph), key=len, \
+                                reverse=True):
+            start = max(sorted(component), key=graph.degree)
+            placement.append(start)
+            placement += [vtx for (_, vtx) in nx.bfs_edges(graph, start)]
+
+        placement += [name for name in self.slot_names if name not in placement]
+
+        return placement
+#---------------------- end def get_slot_placement():-----------------------------
+
     def __str__(self):
         """
         Network to string conversion
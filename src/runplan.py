@@ -0,0 +1,389 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+RunPlan class of Cortix. A run plan is the compiled form of a task: the contents
+of its cortix-param.xml and of the cortix-comm.xml of every module slot, and the
+keys of its memory and mpi ports. Plans are cached on disk keyed by a hash of the
+simulation configuration and of the plan format (PLAN_VERSION), so a repeated
+launch of the same study skips generating them, and a plan compiled by another
+version of Cortix is compiled again instead of being reused.
+
+Cortix: a program for system-level modules coupling, execution, and analysis.
+"""
+#*********************************************************************************
+import os
+import pickle
+import hashlib
+from types import MappingProxyType
+import xml.etree.ElementTree as ElementTree
+from cortix.src.utils.workspace import Workspace
+#*********************************************************************************
+
+PLAN_VERSION = 1 # format of the compiled plan; bump when what it holds changes
+
+class RunPlan:
+    """
+    Compiled, read-only setup of a task: built from the task and the application
+    (whose networks and modules give the connectivity and port modes), written
+    out with write_files() and registered with the runtime objects with apply().
+    """
+
+    def __init__(self, task=None, application=None):
+
+        assert task is not None, '-> task missing.'
+        assert application is not None, '-> application missing.'
+
+        self.version = PLAN_VERSION
+        self.task_name = task.get_name()
+        self.task_work_dir = task.get_work_dir()
+
+        self.param_file = self.task_work_dir + 'cortix-param.xml'
+        self.param_contents = self.__compile_param(task, application)
+
+        (comm_files, memory_ports, mpi_ports) = self.__compile_comm(application)
+
+        self.__freeze(comm_files, memory_ports, mpi_ports)
+#---------------------- end def __init__():---------------------------------------
+
+    def get_task_name(self):
+        """
+        Returns the name of the task the plan is for.
+        """
+
+        return self.task_name
+#---------------------- end def get_task_name():----------------------------------
+
+    def get_param_file(self):
+        """
+        Returns the full path of the task's cortix-param.xml.
+        """
+
+        return self.param_file
+#---------------------- end def get_param_file():---------------------------------
+
+    def get_comm_files(self):
+        """
+        Returns a read-only dictionary slot name -> (full path of cortix-comm.xml,
+        contents).
+        """
+
+        return self.comm_files
+#---------------------- end def get_comm_files():---------------------------------
+
+    def get_memory_ports(self):
+        """
+        Returns a tuple of the keys of the mode="memory" port connections.
+        """
+
+        return self.memory_ports
+#---------------------- end def get_memory_ports():-------------------------------
+
+    def get_mpi_ports(self):
+        """
+        Returns a tuple of the keys of the mode="mpi" port connections.
+        """
+
+        return self.mpi_ports
+#---------------------- end def get_mpi_ports():----------------------------------
+
+    def write_files(self):
+        """
+        Creates the module slot directories (with their wrk/ directories) and
+        writes every param and comm file in one pass. Returns the Workspace
+        report (see Workspace.get_report()).
+        """
+
+        workspace = Workspace()
+
+        workspace.add_file(self.param_file, self.param_contents)
+
+        for (comm_file, contents) in self.comm_files.values():
+            workspace.add_dir(os.path.dirname(comm_file) + '/wrk/')
+            workspace.add_file(comm_file, contents)
+
+        return workspace.provision()
+#---------------------- end def write_files():------------------------------------
+
+    def apply(self, task, application):
+        """
+        Registers the files and ports of the plan with the task and its network.
+        """
+
+        assert task.get_name() == self.task_name, 'plan is for task %r' \
+        % self.task_name
+
+        task.set_runtime_cortix_param_file(self.param_file)
+
+        for key in self.memory_ports:
+            task.add_runtime_memory_port(key)
+        for key in self.mpi_ports:
+            task.add_runtime_mpi_port(key)
+
+        net = application.get_network(self.task_name)
+        for (slot_name, (comm_file, contents)) in self.comm_files.items():
+            net.set_runtime_cortix_comm_file(slot_name, comm_file)
+#---------------------- end def apply():------------------------------------------
+
+    def save(self, file_name):
+        """
+        Stores the plan in file_name (atomically; concurrent launches may race).
+        """
+
+        os.makedirs(os.path.dirname(file_name), exist_ok=True)
+
+        tmp_file_name = file_name + '.' + str(os.getpid()) + '.tmp'
+        with open(tmp_file_name, 'wb') as fout:
+            pickle.dump(self, fout, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file_name, file_name)
+#---------------------- end def save():-------------------------------------------
+
+    def __getstate__(self):
+
+        state = dict(self.__dict__)
+        state['comm_files'] = dict(self.comm_files)
+        return state
+#---------------------- end def __getstate__():-----------------------------------
+
+    def __setstate__(self, state):
+
+        self.__dict__.update(state)
+        self.__freeze(state['comm_files'], state['memory_ports'], \
+                      state['mpi_ports'])
+#---------------------- end def __setstate__():-----------------------------------
+
+    def __str__(self):
+        """
+        RunPlan to string conversion
+        """
+
+        return 'RunPlan data members: task=%s; slots=%s' % \
+               (self.task_name, str(sorted(self.comm_files.keys())))
+#---------------------- end def __str__():----------------------------------------
+
+    def __repr__(self):
+        """
+        RunPlan to string conversion
+        """
+
+        return self.__str__()
+#---------------------- end def __repr__():---------------------------------------
+
+#*********************************************************************************
+# Private helper functions (internal use: __)
+
+    def __freeze(self, comm_files, memory_ports, mpi_ports):
+        """
+        Stores the containers of the plan as read-only views.
+        """
+
+        self.comm_files = MappingProxyType(dict(comm_files))
+        self.memory_ports = tuple(memory_ports)
+        self.mpi_ports = tuple(mpi_ports)
+#---------------------- end def __freeze():---------------------------------------
+
+    def __compile_param(self, task, application):
+        """
+        Returns the contents of the task's cortix-param.xml.
+        """
+
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>\n',
+                 '<!-- Written by RunPlan -->\n',
+                 '<cortix_param>\n']
+
+        lines.append('<start_time unit="' + task.get_start_time_unit() + '">' + \
+                     str(task.get_start_time()) + '</start_time>\n')
+        lines.append('<evolve_time unit="' + task.get_evolve_time_unit() + '">' + \
+                     str(task.get_evolve_time()) + '</evolve_time>\n')
+        lines.append('<time_step unit="' + task.get_time_step_unit() + '">' + \
+                     str(task.get_time_step()) + '</time_step>\n')
+
+        profiling = task.get_profiling()
+        lines.append('<profiling buffer="' + str(profiling['buffer']) + \
+                     '" sample_interval="' + str(profiling['sample_interval']) + \
+                     '" memory="' + str(profiling['memory']).lower() + \
+                     '" top="' + str(profiling['top']) + '"/>\n')
+
+        checkpoint = task.get_checkpoint()
+        lines.append('<checkpoint interval="' + str(checkpoint['interval']) + \
+                     '" keep="' + str(checkpoint['keep']) + '"/>\n')
+
+        # subcycled slots (see Launcher)
+        net = application.get_network(self.task_name)
+        assert net is not None, 'no network for task %r' % self.task_name
+        for slot_name in net.get_slot_names():
+            module = application.get_module(slot_name.split('_')[0])
+            if module is None or module.get_time_step_multiple() == 1:
+                continue
+            lines.append('<time_step_multiple slot="' + slot_name + '">' + \
+                         str(module.get_time_step_multiple()) + \
+                         '</time_step_multiple>\n')
+
+        lines.append('</cortix_param>')
+
+        return ''.join(lines)
+#---------------------- end def __compile_param():--------------------------------
+
+    def __compile_comm(self, application):
+        """
+        Returns the cortix-comm.xml file name and contents of every slot of the
+        task network, and the keys of the memory and mpi ports.
+        """
+
+        comm_lines = dict() # slot name -> list of port entries
+        memory_ports = list()
+        mpi_ports = list()
+
+        def port_entry(port_name, port_type, to_module, to_slot, to_port, \
+                       exchange=(None, None)):
+            # the provider's port mode decides the transport of both ends
+            to_slot_work_dir = self.task_work_dir + to_slot + '/'
+            mode = to_module.get_port_mode(to_port)
+            head = '<port name="' + port_name + '" type="' + port_type + '" '
+            (intervals, threshold) = exchange # see PortExchange
+            if intervals is not None:
+                head += 'interval="' + ' '.join(str(i) for i in intervals) + '" '
+            if threshold is not None:
+                head += 'threshold="' + repr(threshold) + '" '
+            if mode.split('.')[0] == 'file':
+                ext = mode.split('.')[1]
+                return head + 'file="' + to_slot_work_dir + to_port + '.' + ext + \
+                       '"/>\n'
+            if mode == 'directory':
+                return head + 'directory="' + to_slot_work_dir + to_port + '"/>\n'
+            key = to_slot + '/' + to_port
+            if mode == 'memory':
+                if key not in memory_ports:
+                    memory_ports.append(key)
+                return head + 'memory="' + key + '"/>\n'
+            if mode == 'mpi':
+                assert to_module.get_port_type(to_port) == 'provide', \
+                'mpi port mode requires a provide port; module %r, port %r' \
+                % (to_module.get_name(), to_port)
+                if key not in mpi_ports:
+                    mpi_ports.append(key)
+                return head + 'mpi="' + key + '"/>\n'
+            assert False, 'invalid port mode. fatal.'
+
+        net = application.get_network(self.task_name)
+        assert net is not None, 'no network for task %r' % self.task_name
+
+        # a provide port exchanges when any of its connections does
+        provider_exchange = dict() # (slot, port) -> (intervals, threshold)
+        for con in net.get_connectivity():
+            (interval, threshold) = net.get_exchange(con)
+            key = (con['toModuleSlot'], con['toPort'])
+            (intervals, thresholds) = provider_exchange.get(key, (set(), set()))
+            intervals.add(interval)
+            thresholds.add(threshold)
+            provider_exchange[key] = (intervals, thresholds)
+        for (key, (intervals, thresholds)) in provider_exchange.items():
+            provider_exchange[key] = \
+            (None if None in intervals else tuple(sorted(intervals)),
+             None if None in thresholds else min(thresholds))
+
+        provided = set()
+        for con in net.get_connectivity():
+            # "to" is who receives the "call", hence the provider
+            to_slot = con['toModuleSlot']
+            to_port = con['toPort']
+            to_module = application.get_module(to_slot.split('_')[0])
+
+            assert to_module is not None, \
+            'module %r does not exist in application' % to_slot.split('_')[0]
+            assert to_module.has_port_name(to_port), \
+            'module %r has no port %r.' % (to_module.get_name(), to_port)
+
+            to_port_type = to_module.get_port_type(to_port)
+            lines = comm_lines.setdefault(to_slot, list())
+
+            if to_port_type != 'input':
+                assert to_port_type == 'provide', \
+                'port type %r invalid. Module %r, port %r' \
+                % (to_port_type, to_module.get_name(), to_port)
+                if (to_slot, to_port) not in provided:
+                    lines.append(port_entry(to_port, 'provide', to_module, \
+                                            to_slot, to_port, \
+                                            provider_exchange[(to_slot, to_port)]))
+                    provided.add((to_slot, to_port))
+
+            # "from" is who makes the "call", hence the user
+            from_slot = con['fromModuleSlot']
+            from_port = con['fromPort']
+            from_module = application.get_module(from_slot.split('_')[0])
+
+            assert from_module is not None, \
+            'module %r does not exist in application' % from_slot.split('_')[0]
+            assert from_module.has_port_name(from_port), \
+            'module %r has no port %r' % (from_module.get_name(), from_port)
+
+            from_port_type = from_module.get_port_type(from_port)
+            lines = comm_lines.setdefault(from_slot, list())
+
+            if from_port_type != 'output':
+                assert from_port_type == 'use', \
+                'port type %r invalid. Module %r, port %r' \
+                % (from_port_type, from_module.get_name(), from_port)
+                (interval, threshold) = net.get_exchange(con)
+                if interval is not None:
+                    interval = (interval,)
+                lines.append(port_entry(from_port, 'use', to_module, to_slot, \
+                                        to_port, (interval, threshold)))
+
+        comm_files = dict()
+        for (slot_name, lines) in comm_lines.items():
+            contents = '<?xml version="1.0" encoding="UTF-8"?>\n' + \
+                       '<!-- Written by RunPlan -->\n' + \
+                       '<cortix_comm>\n' + ''.join(lines) + '</cortix_comm>'
+            comm_file = self.task_work_dir + slot_name + '/cortix-comm.xml'
+            comm_files[slot_name] = (comm_file, contents)
+
+        return (comm_files, memory_ports, mpi_ports)
+#---------------------- end def __compile_comm():---------------------------------
+
+#====================== end class RunPlan: =======================================
+
+def get_run_plan_key(sim_config_node, task_name, task_work_dir):
+    """
+    Returns the cache key of a task's run plan: a hash of the plan format
+    (PLAN_VERSION), of the simulation configuration (which holds the application,
+    networks and tasks) and of where the task runs.
+    """
+
+    digest = hashlib.sha256()
+    digest.update(str(PLAN_VERSION).encode())
+    digest.update(ElementTree.tostring(sim_config_node.get_root_node()))
+    digest.update(task_name.encode())
+    digest.update(task_work_dir.encode())
+
+    return digest.hexdigest()
+#---------------------- end def get_run_plan_key():-------------------------------
+
+def load_run_plan(file_name):
+    """
+    Returns the RunPlan stored in file_name; None if there is none, if it is
+    unreadable, or if its format is not PLAN_VERSION (a plan that unpickles fine
+    may still have been compiled by another version of Cortix).
+    """
+
+    if not os.path.isfile(file_name):
+        return None
+
+    try:
+        with open(file_name, 'rb') as fin:
+            plan = pickle.load(fin)
+    except Exception:
+        return None
+
+    if not isinstance(plan, RunPlan) or \
+       getattr(plan, 'version', None) != PLAN_VERSION:
+        return None
+
+    return plan
+#---------------------- end def load_run_plan():----------------------------------
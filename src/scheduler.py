@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+SlotScheduler class of Cortix. Assigns the module slots of a task network to
+workers so that few connections cross workers and the workers carry about the same
+cost. Also helpers to measure and store per-slot costs between runs.
+
+Cortix: a program for system-level modules coupling, execution, and analysis.
+"""
+#*********************************************************************************
+import os
+import json
+from cortix.src.slotprofiler import read_slot_profiles
+from cortix.src.utils.lazyimport import lazy_import
+nx = lazy_import('networkx')
+#*********************************************************************************
+
+class SlotScheduler:
+    """
+    Partitions the slots of a network graph into n_workers groups. The cost of a
+    slot is its mean wall time per time step (see read_slot_costs()); slots with
+    no measured cost get the mean of the known ones (or 1.0).
+
+    The partition is grown breadth-first over the graph (so connected slots stay
+    together), then refined by moving single slots between workers while this
+    cuts fewer edges and keeps every worker load under (1 + imbalance) times the
+    mean load. Starting from a previous assignment rebalances it with the least
+    number of moves.
+    """
+
+    def __init__(self, nx_graph=None, slot_names=list(), n_workers=1,
+                 slot_costs=dict(), imbalance=0.1):
+
+        assert nx_graph is not None, '-> nx_graph missing.'
+        assert isinstance(n_workers, int), '-> n_workers not an int.'
+        assert n_workers >= 1, '-> n_workers must be >= 1.'
+        assert isinstance(slot_costs, dict), '-> slot_costs not a dict.'
+        assert imbalance >= 0.0, '-> imbalance must be >= 0.'
+
+        self.slot_names = list(slot_names)
+        self.n_workers = min(n_workers, max(1, len(self.slot_names)))
+        self.imbalance = imbalance
+
+        # undirected, no self loops; edge weight is the number of connections
+        self.graph = nx.Graph()
+        self.graph.add_nodes_from(self.slot_names)
+        for (vtx1, vtx2) in nx_graph.edges():
+            if vtx1 == vtx2 or vtx1 not in self.graph or vtx2 not in self.graph:
+                continue
+            if self.graph.has_edge(vtx1, vtx2):
+                self.graph[vtx1][vtx2]['weight'] += 1
+            else:
+                self.graph.add_edge(vtx1, vtx2, weight=1)
+
+        self.slot_costs = dict()
+        self.set_slot_costs(slot_costs)
+
+        self.assignment = dict() # slot name -> worker id
+#---------------------- end def __init__():---------------------------------------
+
+    def set_slot_costs(self, slot_costs):
+        """
+        Sets the per-slot costs; missing slots get the mean of the given ones.
+        """
+
+        known = [cost for (slot, cost) in slot_costs.items() \
+                 if slot in self.graph and cost > 0.0]
+        default = sum(known) / len(known) if len(known) > 0 else 1.0
+
+        self.slot_costs = dict()
+        for slot in self.slot_names:
+            cost = slot_costs.get(slot, default)
+            self.slot_costs[slot] = cost if cost > 0.0 else default
+#---------------------- end def set_slot_costs():---------------------------------
+
+    def partition(self, initial_assignment=None):
+        """
+        Computes the assignment of slots to workers. If initial_assignment (slot
+        name -> worker id) covers all slots, it is rebalanced instead of starting
+        over. Returns the assignment.
+        """
+
+        if initial_assignment is not None and \
+           set(initial_assignment.keys()) == set(self.slot_names) and \
+           all(0 <= wid < self.n_workers for wid in initial_assignment.values()):
+            self.assignment = dict(initial_assignment)
+            self.__unload()
+        else:
+            self.assignment = self.__grow()
+
+        self.__refine()
+
+        return self.assignment
+#---------------------- end def partition():--------------------------------------
+
+    def get_assignment(self):
+        """
+        Returns the assignment: a dictionary slot name -> worker id.
+        """
+
+        return self.assignment
+#---------------------- end def get_assignment():---------------------------------
+
+    def get_groups(self):
+        """
+        Returns a list of the (non empty) lists of slot names of each worker.
+        """
+
+        groups = [list() for wid in range(self.n_workers)]
+        for slot in self.slot_names:
+            groups[self.assignment[slot]].append(slot)
+
+        return [group for group in groups if len(group) > 0]
+#---------------------- end def get_groups():-------------------------------------
+
+    def get_loads(self):
+        """
+        Returns a list of the total slot cost of each worker.
+        """
+
+        loads = [0.0] * self.n_workers
+        for (slot, wid) in self.assignment.items():
+            loads[wid] += self.slot_costs[slot]
+
+        return loads
+#---------------------- end def get_loads():--------------------------------------
+
+    def get_cut_edges(self):
+        """
+        Returns the number of connections between slots on different workers.
+        """
+
+        cut = 0
+        for (vtx1, vtx2, weight) in self.graph.edges(data='weight'):
+            if self.assignment[vtx1] != self.assignment[vtx2]:
+                cut += weight
+
+        return cut
+#---------------------- end def get_cut_edges():----------------------------------
+
+#*********************************************************************************
+# Private helper functions (internal use: __)
+
+    def __get_max_load(self):
+        """
+        Returns the load a worker may carry.
+        """
+
+        total = sum(self.slot_costs.values())
+        largest = max(self.slot_costs.values()) if len(self.slot_costs) > 0 else 0.0
+
+        return max(total / self.n_workers * (1.0 + self.imbalance), largest)
+#---------------------- end def __get_max_load():---------------------------------
+
+    def __get_order(self):
+        """
+        Returns the slots in breadth-first order of each connected part of the
+        graph, starting from its most connected slot.
+        """
+
+        order = list()
+        for component in sorted(nx.connected_components(self.graph), key=len, \
+                                reverse=True):
+            start = max(sorted(component), key=self.graph.degree)
+            order.append(start)
+            order += [vtx for (_, vtx) in nx.bfs_edges(self.graph, start)]
+
+        return order
+#---------------------- end def __get_order():------------------------------------
+
+    def __grow(self):
+        """
+        Cuts the breadth-first order of the slots into consecutive runs of about
+        the mean load.
+        """
+
+        target = sum(self.slot_costs.values()) / self.n_workers
+
+        assignment = dict()
+        wid = 0
+        load = 0.0
+        order = self.__get_order()
+        for (i, slot) in enumerate(order):
+            cost = self.slot_costs[slot]
+            n_left = len(order) - i
+            # move on when full, but leave a slot for every remaining worker
+            if load > 0.0 and wid < self.n_workers - 1 and \
+               (load + cost / 2.0 > target or n_left <= self.n_workers - 1 - wid):
+                wid += 1
+                load = 0.0
+            assignment[slot] = wid
+            load += cost
+
+        return assignment
+#---------------------- end def __grow():-----------------------------------------
+
+    def __get_gain(self, slot, wid):
+        """
+        Returns the decrease of cut edges when slot moves to worker wid.
+        """
+
+        gain = 0
+        for (nbr, attributes) in self.graph[slot].items():
+            if self.assignment[nbr] == wid:
+                gain += attributes['weight']
+            elif self.assignment[nbr] == self.assignment[slot]:
+                gain -= attributes['weight']
+
+        return gain
+#---------------------- end def __get_gain():-------------------------------------
+
+    def __unload(self):
+        """
+        Moves slots off overloaded workers, to the least loaded worker, choosing
+        the slot that cuts the fewest extra edges.
+        """
+
+        max_load = self.__get_max_load()
+
+        for _ in range(len(self.slot_names)):
+            loads = self.get_loads()
+            source = max(range(self.n_workers), key=lambda wid: loads[wid])
+            if loads[source] <= max_load:
+                return
+            target = min(range(self.n_workers), key=lambda wid: loads[wid])
+            candidates = [slot for slot in self.slot_names \
+                          if self.assignment[slot] == source and \
+                          loads[target] + self.slot_costs[slot] < loads[source]]
+            if len(candidates) == 0:
+                return
+            slot = max(candidates, key=lambda slot: self.__get_gain(slot, target))
+            self.assignment[slot] = target
+#---------------------- end def __unload():---------------------------------------
+
+    def __refine(self):
+        """
+        Moves single slots to another worker while that cuts edges (or, at equal
+        cut, lowers the largest load) without exceeding the load limit or leaving
+        a worker empty.
+        """
+
+        max_load = self.__get_max_load()
+
+        moved = True
+        while moved:
+            moved = False
+            loads = self.get_loads()
+            sizes = [0] * self.n_workers
+            for wid in self.assignment.values():
+                sizes[wid] += 1
+
+            for slot in self.slot_names:
+                source = self.assignment[slot]
+                if sizes[source] == 1:
+                    continue
+                cost = self.slot_costs[slot]
+                best = None
+                for wid in range(self.n_workers):
+                    if wid == source or loads[wid] + cost > max_load:
+                        continue
+                    gain = self.__get_gain(slot, wid)
+                    balances = loads[wid] + cost < loads[source]
+                    if gain > 0 or (gain == 0 and balances):
+                        if best is None or (gain, -loads[wid]) > best[0]:
+                            best = ((gain, -loads[wid]), wid)
+                if best is not None:
+                    target = best[1]
+                    self.assignment[slot] = target
+                    loads[source] -= cost
+                    loads[target] += cost
+                    sizes[source] -= 1
+                    sizes[target] += 1
+                    moved = True
+#---------------------- end def __refine():---------------------------------------
+
+#====================== end class SlotScheduler: =================================
+
+def read_slot_costs(task_work_dir, slot_names):
+    """
+    Returns a dictionary of the mean wall time (s) per time step of each slot,
+    from the step totals of its profile summary (see SlotProfiler; exact also for
+    steps shorter than the log precision), else as logged ("elapsed time (s):
+    ...") in the slot's launcher.log. Slots with neither are left out.
+    """
+
+    slot_costs = dict()
+    slot_profiles = read_slot_profiles(task_work_dir, slot_names)
+    for slot in slot_names:
+        profile = slot_profiles.get(slot, None)
+        if profile is not None:
+            n_time_steps = profile.get('n_time_steps', profile['n_steps'])
+            if n_time_steps > 0:
+                slot_costs[slot] = profile['total']['step'] / n_time_steps
+                continue
+        log_file = os.path.join(task_work_dir, slot, 'launcher.log')
+        if not os.path.isfile(log_file):
+            continue
+        times = list()
+        with open(log_file, 'r') as fin:
+            for line in fin:
+                (_, tag, value) = line.partition('elapsed time (s): ')
+                if tag:
+                    try:
+                        times.append(float(value.strip()))
+                    except ValueError:
+                        continue
+        if len(times) > 0:
+            slot_costs[slot] = sum(times) / len(times)
+
+    return slot_costs
+#---------------------- end def read_slot_costs():--------------------------------
+
+def load_slot_costs(file_name):
+    """
+    Returns the slot costs stored in a JSON file; empty if there is none.
+    """
+
+    if file_name is None or not os.path.isfile(file_name):
+        return dict()
+
+    with open(file_name, 'r') as fin:
+        slot_costs = json.load(fin)
+
+    return {str(slot): float(cost) for (slot, cost) in slot_costs.items()}
+#---------------------- end def load_slot_costs():--------------------------------
+
+def save_slot_costs(file_name, slot_costs):
+    """
+    Stores slot costs in a JSON file (merged with the ones already there).
+    """
+
+    merged = load_slot_costs(file_name)
+    merged.update(slot_costs)
+
+    tmp_file_name = file_name + '.tmp'
+    with open(tmp_file_name, 'w') as fout:
+        json.dump(merged, fout, indent=1, sort_keys=True)
+    os.replace(tmp_file_name, file_name)
+#---------------------- end def save_slot_costs():--------------------------------
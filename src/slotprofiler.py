@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+Per-slot profiling of the launcher time stepping. A SlotProfiler records the wall
+time of CallPorts() (port I/O, including the wait for the providers) and
+Execute() (compute) of every time step in a ring buffer of the last steps, and the
+totals of all steps; every sample_interval steps (if given) the step runs under
+cProfile, and optionally tracemalloc (sampled steps run slower, which shows in
+the high percentiles). The summary (JSON) is written in the slot work directory
+(profile.json); the task gathers the summaries of its slots in a task report
+(see write_task_profile()).
+
+Cortix: a program for system-level modules coupling, execution, and analysis.
+"""
+#*********************************************************************************
+import os
+import json
+import time
+import cProfile
+import pstats
+import tracemalloc
+from collections import deque
+#*********************************************************************************
+
+PHASES = ('call_ports', 'execute', 'step')
+PERCENTILES = (50, 90, 99)
+
+class SlotProfiler:
+    """
+    Step timing and sampled profiling of a module slot.
+    """
+
+    def __init__(self, slot_name, buffer_size=1000, sample_interval=0, \
+                 memory=False, top=10):
+
+        assert isinstance(slot_name, str), '-> slot_name invalid.'
+        assert buffer_size >= 1, '-> buffer_size invalid.'
+        assert sample_interval >= 0, '-> sample_interval invalid.'
+        assert top >= 0, '-> top invalid.'
+
+        self.slot_name = slot_name
+        self.sample_interval = sample_interval # 0: no sampling
+        self.memory = memory # sample memory with tracemalloc too
+        self.top = top
+
+        self.steps = deque(maxlen=buffer_size) # (time, call ports, execute) (s)
+        self.n_steps = 0
+        self.n_time_steps = 0 # task time steps spanned (see time_step_multiple)
+        self.totals = dict.fromkeys(PHASES, 0.0)
+
+        self.n_samples = 0
+        self.stats = None # pstats.Stats of the sampled steps
+        self.memory_peak = None # bytes
+
+        self.__profile = None
+        self.__tracing = False
+        self.__start = None
+        self.__mark = None
+        self.__call_ports_time = 0.0
+#---------------------- end def __init__():---------------------------------------
+
+    def start_step(self):
+        """
+        Starts the timing of a time step; a sampled step starts profiling too.
+        """
+
+        if self.sample_interval > 0 and self.n_steps % self.sample_interval == 0:
+            self.__start_sampling()
+
+        self.__start = self.__mark = time.perf_counter()
+#---------------------- end def start_step():-------------------------------------
+
+    def end_call_ports(self):
+        """
+        Marks the end of CallPorts() in the current step.
+        """
+
+        now = time.perf_counter()
+        self.__call_ports_time = now - self.__mark
+        self.__mark = now
+#---------------------- end def end_call_ports():---------------------------------
+
+    def end_step(self, facility_time, n_time_steps=1):
+        """
+        Ends the current step (at facility_time; a macro step of a subcycled slot
+        spans n_time_steps task time steps); the remainder of the step since
+        end_call_ports() is Execute(). Returns the wall time of the step (s).
+        """
+
+        now = time.perf_counter()
+        execute_time = now - self.__mark
+        step_time = now - self.__start
+
+        self.__stop_sampling()
+
+        self.steps.append((facility_time, self.__call_ports_time, execute_time))
+        self.n_steps += 1
+        self.n_time_steps += n_time_steps
+        self.totals['call_ports'] += self.__call_ports_time
+        self.totals['execute'] += execute_time
+        self.totals['step'] += step_time
+
+        return step_time
+#---------------------- end def end_step():---------------------------------------
+
+    def get_summary(self):
+        """
+        Returns a dictionary of the slot timings: totals and means over all steps,
+        percentiles over the steps in the buffer, the top hot functions of the
+        sampled steps (by own time) and their memory peak (bytes; None if not
+        sampled).
+        """
+
+        summary = dict()
+        summary['slot'] = self.slot_name
+        summary['n_steps'] = self.n_steps
+        summary['n_time_steps'] = self.n_time_steps
+        summary['n_buffered_steps'] = len(self.steps)
+        summary['total'] = dict(self.totals)
+        summary['mean'] = {phase: total / max(self.n_steps, 1) \
+                           for (phase, total) in self.totals.items()}
+
+        columns = dict()
+        columns['call_ports'] = [step[1] for step in self.steps]
+        columns['execute'] = [step[2] for step in self.steps]
+        columns['step'] = [step[1] + step[2] for step in self.steps]
+        summary['percentiles'] = dict()
+        for (phase, values) in columns.items():
+            values.sort()
+            percentiles = {'p%i' % p: get_percentile(values, p) for p in PERCENTILES}
+            percentiles['max'] = values[-1] if len(values) > 0 else 0.0
+            summary['percentiles'][phase] = percentiles
+
+        summary['sample_interval'] = self.sample_interval
+        summary['n_samples'] = self.n_samples
+        summary['hot_functions'] = self.__get_hot_functions()
+        summary['memory_peak'] = self.memory_peak
+
+        return summary
+#---------------------- end def get_summary():------------------------------------
+
+    def write_summary(self, file_name):
+        """
+        Writes the summary (JSON) to file_name.
+        """
+
+        write_json(file_name, self.get_summary())
+#---------------------- end def write_summary():----------------------------------
+
+#*********************************************************************************
+# Private helper functions (internal use: __)
+
+    def __start_sampling(self):
+        """
+        Profiles the time step; cProfile may be taken by another slot thread of the
+        worker, and tracemalloc by anyone, in which case they are not sampled.
+        """
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            profile = None
+        self.__profile = profile
+
+        self.__tracing = False
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.__tracing = True
+#---------------------- end def __start_sampling():-------------------------------
+
+    def __stop_sampling(self):
+
+        if self.__profile is not None:
+            self.__profile.disable()
+            if self.stats is None:
+                self.stats = pstats.Stats(self.__profile)
+            else:
+                self.stats.add(self.__profile)
+            self.n_samples += 1
+            self.__profile = None
+
+        if self.__tracing:
+            (_, peak) = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self.memory_peak = max(self.memory_peak or 0, peak)
+            self.__tracing = False
+#---------------------- end def __stop_sampling():--------------------------------
+
+    def __get_hot_functions(self):
+        """
+        Returns the top functions of the sampled steps by own time.
+        """
+
+        if self.stats is None:
+            return list()
+
+        entries = list()
+        for ((file_name, line, name), (_, n_calls, own_time, cumulative_time, _)) \
+            in self.stats.stats.items():
+            if file_name == __file__:
+                continue # the profiler itself
+            entries.append({'function': '%s:%i(%s)' % (file_name, line, name),
+                            'ncalls': n_calls, 'tottime': own_time,
+                            'cumtime': cumulative_time})
+        entries.sort(key=lambda entry: entry['tottime'], reverse=True)
+
+        return entries[:self.top]
+#---------------------- end def __get_hot_functions():----------------------------
+
+#====================== end class SlotProfiler: ==================================
+
+def get_percentile(sorted_values, percent):
+    """
+    Returns the percentile (nearest rank) of a sorted list; 0.0 if empty.
+    """
+
+    if len(sorted_values) == 0:
+        return 0.0
+
+    rank = int(round(percent / 100.0 * (len(sorted_values) - 1)))
+
+    return sorted_values[rank]
+#---------------------- end def get_percentile():---------------------------------
+
+def write_json(file_name, contents):
+    """
+    Writes contents to a JSON file atomically (the task may read it meanwhile).
+    """
+
+    tmp_file_name = file_name + '.tmp'
+    with open(tmp_file_name, 'w') as fout:
+        json.dump(contents, fout, indent=1, sort_keys=True)
+    os.replace(tmp_file_name, file_name)
+#---------------------- end def write_json():-------------------------------------
+
+def read_slot_profiles(task_work_dir, slot_names):
+    """
+    Returns a dictionary of the profile summaries of the slots (written in each
+    slot work directory). Slots without a summary are left out.
+    """
+
+    slot_profiles = dict()
+    for slot in slot_names:
+        file_name = os.path.join(task_work_dir, slot, 'wrk', 'profile.json')
+        if not os.path.isfile(file_name):
+            continue
+        try:
+            with open(file_name, 'r') as fin:
+                slot_profiles[slot] = json.load(fin)
+        except ValueError:
+            continue
+
+    return slot_profiles
+#---------------------- end def read_slot_profiles():-----------------------------
+
+def write_task_profile(file_name, slot_profiles):
+    """
+    Writes the task report (JSON) of the slot profiles: the slots ordered by their
+    total Execute() time, with the bottleneck (the slot that computes the longest;
+    CallPorts() time is mostly waiting for the others). Returns the report.
+    """
+
+    slots = list()
+    for (slot, profile) in slot_profiles.items():
+        total = profile['total']
+        slots.append({'slot': slot,
+                      'n_steps': profile['n_steps'],
+                      'call_ports': total['call_ports'],
+                      'execute': total['execute'],
+                      'step': total['step'],
+                      'execute_fraction': total['execute'] / total['step'] \
+                                          if total['step'] > 0.0 else 0.0,
+                      'execute_p99': profile['percentiles']['execute']['p99'],
+                      'hot_function': profile['hot_functions'][0]['function'] \
+                                      if len(profile['hot_functions']) > 0 else None})
+    slots.sort(key=lambda entry: entry['execute'], reverse=True)
+
+    report = dict()
+    report['slots'] = slots
+    report['bottleneck'] = slots[0]['slot'] if len(slots) > 0 else None
+    report['total_execute'] = sum(entry['execute'] for entry in slots)
+    report['total_call_ports'] = sum(entry['call_ports'] for entry in slots)
+
+    write_json(file_name, report)
+
+    return report
+#---------------------- end def write_task_profile():-----------------------------
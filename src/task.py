@@ -14,11 +14,22 @@ Cortix: a program for system-level modules coupling, execution, and analysis.
 """
 #*********************************************************************************
 import os
-import time
 import logging
-from xml.etree.cElementTree import ElementTree
+from cortix.src.taskmonitor import TaskMonitor
 from cortix.src.utils.configtree import ConfigTree
+from cortix.src.utils.executor import create_executor
+from cortix.src.utils.workspace import make_dirs
+from cortix.src.memoryport import MemoryPortHub
+from cortix.src.conductor import TimeConductor, get_slot_dependencies
+from cortix.src.conductor import COUPLING_SCHEMES
+from cortix.src.scheduler import SlotScheduler
+from cortix.src.scheduler import read_slot_costs, load_slot_costs, save_slot_costs
+from cortix.src.launcher import run_launcher, run_launcher_group
+from cortix.src.slotprofiler import read_slot_profiles, write_task_profile
+from cortix.src.checkpoint import get_restart_step
 from cortix.src.utils.set_logger_level import set_logger_level
+from cortix.src.utils.lazyimport import lazy_import
+nx = lazy_import('networkx')
 #*********************************************************************************
 
 class Task:
@@ -42,7 +53,7 @@ class Task:
         # Set the work directory (previously created)
         assert os.path.isdir(parent_work_dir), 'work directory not available.'
         self.work_dir = parent_work_dir + 'task_' + self.name + '/'
-        os.system('mkdir -p ' + self.work_dir)
+        make_dirs(self.work_dir)
 
         # Create the logging facility for the object
         node = task_config_node.get_sub_node('logger')
@@ -89,9 +100,34 @@ class Task:
         self.start_time_unit = 'null-start_time_unit'
         self.evolve_time_unit = 'null-evolve_time_unit'
         self.time_step_unit = 'null-time_step_unit'
+        self.monitor_interval = 1.0 # second
+        self.executor_backend = 'process'
+        self.executor_max_workers = None # one worker per module slot
         self.runtime_cortix_param_file = 'null-runtime_cortix_param_file'
+        self.runtime_transitions = list()
+        self.runtime_memory_ports = list() # keys of mode="memory" port connections
+        self.runtime_mpi_ports = list() # keys of mode="mpi" port connections
+        self.scheduler_policy = 'none' # 'none': one worker per slot; or 'graph'
+        self.scheduler_costs_file = None # slot costs kept between runs (json)
+        self.scheduler_rebalance = False # use the previous task's slot costs
+        self.scheduler_imbalance = 0.1
+        self.slot_costs = dict() # mean wall time (s) per time step of each slot
+        self.slot_assignment = dict() # slot name -> worker id
+        self.profiling = {'buffer': 1000, # steps timed in the slot ring buffers
+                          'sample_interval': 0, # cProfile every n steps; 0: none
+                          'memory': False, # sample tracemalloc too
+                          'top': 10} # hot functions reported
+        self.profile_report = dict()
+        self.synchronization = 'free' # 'free' or 'lockstep' (see TimeConductor)
+        self.coupling_scheme = 'jacobi' # of the slots under lockstep
+        self.checkpoint = {'interval': 0, # time steps between checkpoints; 0: none
+                           'keep': 2} # checkpoints retained per slot
+        self.restart = False # resume from the latest consistent checkpoint
+        self.restart_step = None # time step the last execute() resumed from
 
         self.log.debug('start __init__()')
+        coupling_scheme_given = False
+        synchronization_given = False
         for child in self.config_node.get_node_children():
             (elem, tag, items, text) = child
             if tag == 'start_time':
@@ -112,6 +148,88 @@ class Task:
                         self.time_step_unit = value
                 self.time_step = float(text.strip())
 
+            if tag == 'coupling_scheme':
+                self.coupling_scheme = text.strip()
+                assert self.coupling_scheme in COUPLING_SCHEMES, \
+                'invalid coupling scheme %r; options: %r' \
+                % (self.coupling_scheme, COUPLING_SCHEMES)
+                coupling_scheme_given = True
+
+            if tag == 'monitor_interval':
+                # fallback poll interval of the runtime status monitor
+                self.monitor_interval = float(text.strip())
+                for (key, value) in items:
+                    if key == 'unit':
+                        if value == 'minute':
+                            self.monitor_interval *= 60.0
+                        else:
+                            assert value == 'second', \
+                            'invalid monitor_interval unit = %r' % value
+                assert self.monitor_interval > 0.0, 'monitor_interval invalid.'
+
+            if tag == 'executor':
+                for (key, value) in items:
+                    if key == 'backend':
+                        self.executor_backend = value.strip()
+                    elif key == 'max_workers':
+                        self.executor_max_workers = int(value.strip())
+                    else:
+                        assert False, 'invalid executor attribute %r' % key
+
+            if tag == 'scheduler':
+                for (key, value) in items:
+                    if key == 'policy':
+                        self.scheduler_policy = value.strip()
+                        assert self.scheduler_policy in ('none', 'graph'), \
+                        'invalid scheduler policy %r' % self.scheduler_policy
+                    elif key == 'costs':
+                        self.scheduler_costs_file = value.strip()
+                    elif key == 'rebalance':
+                        self.scheduler_rebalance = value.strip() == 'true'
+                    elif key == 'imbalance':
+                        self.scheduler_imbalance = float(value.strip())
+                    else:
+                        assert False, 'invalid scheduler attribute %r' % key
+
+            if tag == 'synchronization':
+                for (key, value) in items:
+                    if key == 'mode':
+                        self.synchronization = value.strip()
+                        assert self.synchronization in ('free', 'lockstep'), \
+                        'invalid synchronization mode %r' % self.synchronization
+                        synchronization_given = True
+                    else:
+                        assert False, 'invalid synchronization attribute %r' % key
+
+            if tag == 'profiling':
+                for (key, value) in items:
+                    if key in ('buffer', 'sample_interval', 'top'):
+                        self.profiling[key] = int(value.strip())
+                    elif key == 'memory':
+                        self.profiling[key] = value.strip() == 'true'
+                    else:
+                        assert False, 'invalid profiling attribute %r' % key
+                assert self.profiling['buffer'] >= 1, 'profiling buffer invalid.'
+                assert self.profiling['sample_interval'] >= 0, \
+                'profiling sample_interval invalid.'
+
+            if tag == 'checkpoint':
+                for (key, value) in items:
+                    if key in ('interval', 'keep'):
+                        self.checkpoint[key] = int(value.strip())
+                    else:
+                        assert False, 'invalid checkpoint attribute %r' % key
+                assert self.checkpoint['interval'] >= 0, \
+                'checkpoint interval invalid.'
+                assert self.checkpoint['keep'] >= 1, 'checkpoint keep invalid.'
+
+        # a coupling scheme steps the slots in lockstep
+        if coupling_scheme_given:
+            assert not synchronization_given or self.synchronization == 'lockstep', \
+            'coupling scheme %r requires lockstep synchronization; task %r' \
+            % (self.coupling_scheme, self.name)
+            self.synchronization = 'lockstep'
+
         if self.start_time_unit == 'null-start_time_unit':
             self.start_time_unit = self.evolve_time_unit
         assert self.evolve_time_unit != 'null-evolve_time_unit', \
@@ -121,35 +239,192 @@ class Task:
         self.log.debug('start_time unit  = %s', str(self.start_time_unit))
         self.log.debug('evolve_time value = %s', str(self.evolve_time))
         self.log.debug('evolve_time unit  = %s', str(self.evolve_time_unit))
+        self.log.debug('monitor_interval [s] = %s', str(self.monitor_interval))
+        self.log.debug('executor backend = %s', self.executor_backend)
+        self.log.debug('scheduler policy = %s', self.scheduler_policy)
+        self.log.debug('synchronization = %s', self.synchronization)
+        self.log.debug('coupling scheme = %s', self.coupling_scheme)
         self.log.debug('end __init__()')
         self.log.info('created task: %s', self.name)
 #---------------------- end def __init__():---------------------------------------
 
     def execute(self, application):
         """
-        This method is used to execute (accomplish) the given task.
+        This method is used to execute (accomplish) the given task. All module
+        slots of the task network run concurrently on one executor; the method
+        returns when every slot has finished and raises the first exception of a
+        failed slot, if any.
         """
         network = application.get_network(self.name)
+        slot_names = network.get_slot_names()
+
+        max_workers = self.executor_max_workers
+        if max_workers is None:
+            max_workers = max(1, len(slot_names))
+
+        # mpi ports: one rank per slot; connected slots submitted one after the
+        # other (best effort, see Network.get_slot_placement())
+        mpi_transport = len(self.runtime_mpi_ports) > 0
+        if mpi_transport:
+            assert self.executor_backend == 'mpi', \
+            'mpi ports require the mpi executor backend; task %r' % self.name
+            assert max_workers == len(slot_names), \
+            'mpi ports require one worker per module slot; task %r' % self.name
+            slot_names = network.get_slot_placement()
+            self.log.info('mpi ports: %s', str(self.runtime_mpi_ports))
+            self.log.info('slot placement: %s', str(slot_names))
+
+        # slots sharing a worker run in threads of that worker
+        groups = [[slot_name] for slot_name in slot_names]
+        if self.scheduler_policy == 'graph':
+            assert not mpi_transport, \
+            'mpi ports require one worker per module slot; task %r' % self.name
+            groups = self.__schedule_slots(network, slot_names, \
+                                           self.executor_max_workers)
+            max_workers = len(groups)
+
+        executor = create_executor(self.executor_backend, max_workers)
+        self.log.info('created %s executor with %s workers', self.executor_backend, \
+                      str(max_workers))
+
+        # memory ports live in a manager process reachable from the local workers
+        memory_port_hub = None
+        memory_ports = None
+        if len(self.runtime_memory_ports) > 0:
+            assert self.executor_backend == 'process', \
+            'memory ports require the process executor backend; task %r' % self.name
+            memory_port_hub = MemoryPortHub()
+            memory_ports = dict()
+            for key in self.runtime_memory_ports:
+                memory_ports[key] = memory_port_hub.get_port(key)
+            self.log.info('created memory ports: %s', str(self.runtime_memory_ports))
+
+        # lockstep: the slots step under a conductor; they must all run at once
+        conductor = None
+        if self.synchronization == 'lockstep':
+            assert self.executor_backend == 'process', \
+            'lockstep synchronization requires the process executor backend; ' \
+            'task %r' % self.name
+            assert max_workers >= len(groups), \
+            'lockstep synchronization requires a worker per slot group; task %r' \
+            % self.name
+            conductor = TimeConductor()
+            slot_dependencies = get_slot_dependencies( \
+                                self.__get_data_graph(application, network), \
+                                self.coupling_scheme)
+            self.log.info('created time conductor; coupling scheme: %s', \
+                          self.coupling_scheme)
+
+        # restart: every slot resumes from the latest time step checkpointed by all
+        self.restart_step = None
+        if self.restart:
+            self.restart_step = get_restart_step(self.work_dir, slot_names)
+            if self.restart_step is None:
+                self.log.warning('no consistent checkpoint; starting anew')
+            else:
+                self.log.info('restarting from the checkpoints of time step %s', \
+                              str(self.restart_step))
+
         runtime_status_files = dict()
-        for slot_name in network.get_slot_names():
-            module_name = slot_name.split('_')[0]
-            slot_id = int(slot_name.split('_')[1])
-            mod = application.get_module(module_name)
-            param_file = self.runtime_cortix_param_file
-            comm_file = network.get_runtime_cortix_comm_file(slot_name)
-            # Run module in the slot
-            status_file = mod.execute(slot_id, param_file, comm_file)
-            assert status_file is not None, 'module launching failed.'
-            runtime_status_files[slot_name] = status_file
-
-        # monitor runtime status
-        status = 'running'
-        while status == 'running':
-            time.sleep(10)  # hard coded; fix me.
-            (status, slot_names) = self.__get_runtime_status(runtime_status_files)
-            self.log.info('runtime status: %s; module slots running: %s', status, \
-                          str(slot_names))
-#---------------------- end def execute():---------------------------------------
+        futures = dict()
+        for group in groups:
+            launcher_args_list = list()
+            for slot_name in group:
+                module_name = slot_name.split('_')[0]
+                slot_id = int(slot_name.split('_')[1])
+                mod = application.get_module(module_name)
+                param_file = self.runtime_cortix_param_file
+                comm_file = network.get_runtime_cortix_comm_file(slot_name)
+                slot_conductor = None
+                if conductor is not None:
+                    slot_conductor = conductor.get_slot_conductor(slot_name, \
+                                     slot_dependencies.get(slot_name))
+                (status_file, launcher_args) = \
+                mod.get_launcher_args(slot_id, param_file, comm_file, memory_ports, \
+                                      mpi_transport, slot_conductor, \
+                                      self.restart_step)
+                assert status_file is not None, 'module launching failed.'
+                # the status of a previous run is not this run's
+                if self.restart and os.path.isfile(status_file):
+                    os.remove(status_file)
+                runtime_status_files[slot_name] = status_file
+                launcher_args_list.append(launcher_args)
+
+            # Run the module slot(s) on a worker
+            if len(group) == 1:
+                future = executor.submit(run_launcher, *launcher_args_list[0])
+            else:
+                future = executor.submit(run_launcher_group, launcher_args_list)
+            for slot_name in group:
+                futures[slot_name] = future
+
+        # monitor runtime status; wakes up on every status change of a slot
+        monitor = TaskMonitor(runtime_status_files, self.monitor_interval)
+        while monitor.is_running():
+            n_transitions = len(monitor.get_transitions())
+            monitor.wait(self.monitor_interval)
+
+            # a launcher that died without writing its status is failed too
+            for (slot_name, future) in futures.items():
+                if future.done() and future.exception() is not None and \
+                   slot_name in monitor.get_running_slot_names():
+                    monitor.set_slot_status(slot_name, 'failed')
+
+            transitions = monitor.get_transitions()[n_transitions:]
+            for (slot_name, old_status, new_status, time_stamp) in transitions:
+                self.log.info('slot %s: %s -> %s', slot_name, old_status, new_status)
+                # users of the memory ports of a failed slot raise instead of
+                # waiting (its launcher may have died before closing them)
+                if new_status == 'failed' and memory_port_hub is not None:
+                    memory_port_hub.close_provider(slot_name, failed=True)
+            if len(transitions) > 0:
+                self.log.info('module slots running: %s', \
+                              str(monitor.get_running_slot_names()))
+
+        self.runtime_transitions = monitor.get_transitions()
+        monitor.close()
+
+        for slot_name in monitor.get_slot_names():
+            self.log.info('slot %s wall time (s): %s', slot_name, \
+                          str(round(monitor.get_elapsed_time(slot_name), 2)))
+
+        # join the launchers and surface their exceptions
+        first_error = None
+        for (slot_name, future) in futures.items():
+            error = future.exception()
+            if error is not None:
+                self.log.error('module slot %s failed: %r', slot_name, error)
+                if first_error is None:
+                    first_error = error
+
+        # measured costs for the next partition (this run's or a later one)
+        self.slot_costs.update(read_slot_costs(self.work_dir, slot_names))
+        if self.scheduler_costs_file is not None:
+            save_slot_costs(self.scheduler_costs_file, self.slot_costs)
+
+        # task report of the slot profiles: which module bottlenecks the network
+        slot_profiles = read_slot_profiles(self.work_dir, slot_names)
+        if len(slot_profiles) > 0:
+            self.profile_report = write_task_profile(self.work_dir + 'profile.json', \
+                                                     slot_profiles)
+            for entry in self.profile_report['slots']:
+                self.log.info('slot %s: execute (s): %s; call ports (s): %s; ' \
+                              'hot function: %s', entry['slot'], \
+                              str(round(entry['execute'], 3)), \
+                              str(round(entry['call_ports'], 3)), entry['hot_function'])
+            self.log.info('bottleneck slot: %s', self.profile_report['bottleneck'])
+
+        executor.shutdown(wait=True)
+
+        if memory_port_hub is not None:
+            memory_port_hub.shutdown()
+
+        if conductor is not None:
+            conductor.shutdown()
+
+        if first_error is not None:
+            raise first_error
+#---------------------- end def execute():----------------------------------------
 
     def get_name(self):
         """
@@ -217,6 +492,171 @@ class Task:
         return self.time_step_unit
 #---------------------- end def get_time_step_unit():-----------------------------
 
+    def get_monitor_interval(self):
+        """
+        Returns the fallback poll interval (s) of the runtime status monitor.
+        """
+
+        return self.monitor_interval
+#---------------------- end def get_monitor_interval():---------------------------
+
+    def get_executor_backend(self):
+        """
+        Returns the name of the executor backend used to run the module slots.
+        """
+
+        return self.executor_backend
+#---------------------- end def get_executor_backend():---------------------------
+
+    def get_profiling(self):
+        """
+        Returns the profiling parameters of the module slots: 'buffer' (steps timed),
+        'sample_interval' (steps between cProfile samples; 0: none), 'memory'
+        (sample tracemalloc too) and 'top' (hot functions reported).
+        """
+
+        return self.profiling
+#---------------------- end def get_profiling():----------------------------------
+
+    def get_profile_report(self):
+        """
+        Returns the task report of the slot profiles of the last execute() (see
+        write_task_profile()); also in the task work directory (profile.json).
+        """
+
+        return self.profile_report
+#---------------------- end def get_profile_report():-----------------------------
+
+    def get_checkpoint(self):
+        """
+        Returns the checkpoint parameters of the module slots: 'interval' (time
+        steps between checkpoints; 0: none) and 'keep' (checkpoints retained).
+        """
+
+        return self.checkpoint
+#---------------------- end def get_checkpoint():---------------------------------
+
+    def set_restart(self, restart):
+        """
+        Sets whether execute() resumes the slots from their latest consistent
+        checkpoint (see checkpoint.py), if any, instead of the start time.
+        """
+
+        self.restart = restart
+#---------------------- end def set_restart():------------------------------------
+
+    def get_restart_step(self):
+        """
+        Returns the time step the last execute() resumed from; None if it started
+        anew.
+        """
+
+        return self.restart_step
+#---------------------- end def get_restart_step():-------------------------------
+
+    def get_synchronization(self):
+        """
+        Returns the time synchronization of the module slots: 'free' (each slot
+        steps on its own) or 'lockstep' (under a TimeConductor).
+        """
+
+        return self.synchronization
+#---------------------- end def get_synchronization():----------------------------
+
+    def get_coupling_scheme(self):
+        """
+        Returns the coupling scheme of the slots under lockstep synchronization:
+        'jacobi', 'gauss-seidel' or 'pipelined' (see conductor.py).
+        """
+
+        return self.coupling_scheme
+#---------------------- end def get_coupling_scheme():----------------------------
+
+    def get_runtime_transitions(self):
+        """
+        Returns the slot status transitions (slot_name, old_status, new_status,
+        time stamp) recorded by the last execute().
+        """
+
+        return self.runtime_transitions
+#---------------------- end def get_runtime_transitions():------------------------
+
+    def add_runtime_memory_port(self, key):
+        """
+        Registers the key ('<slot>/<port>') of a mode="memory" port connection.
+        """
+
+        if key not in self.runtime_memory_ports:
+            self.runtime_memory_ports.append(key)
+#---------------------- end def add_runtime_memory_port():------------------------
+
+    def get_runtime_memory_ports(self):
+        """
+        Returns the list of keys of the mode="memory" port connections.
+        """
+
+        return self.runtime_memory_ports
+#---------------------- end def get_runtime_memory_ports():-----------------------
+
+    def add_runtime_mpi_port(self, key):
+        """
+        Registers the key ('<slot>/<port>') of a mode="mpi" port connection.
+        """
+
+        if key not in self.runtime_mpi_ports:
+            self.runtime_mpi_ports.append(key)
+#---------------------- end def add_runtime_mpi_port():---------------------------
+
+    def get_runtime_mpi_ports(self):
+        """
+        Returns the list of keys of the mode="mpi" port connections.
+        """
+
+        return self.runtime_mpi_ports
+#---------------------- end def get_runtime_mpi_ports():--------------------------
+
+    def get_scheduler_rebalance(self):
+        """
+        Returns true iff the task partition uses the costs of the previous task.
+        """
+
+        return self.scheduler_rebalance
+#---------------------- end def get_scheduler_rebalance():------------------------
+
+    def get_slot_costs(self):
+        """
+        Returns a dictionary of the mean wall time (s) per time step of each slot,
+        measured in the last execution (or given by set_slot_costs()).
+        """
+
+        return self.slot_costs
+#---------------------- end def get_slot_costs():---------------------------------
+
+    def set_slot_costs(self, slot_costs):
+        """
+        Sets the slot costs used to partition the slots on the workers.
+        """
+
+        self.slot_costs = dict(slot_costs)
+#---------------------- end def set_slot_costs():---------------------------------
+
+    def get_slot_assignment(self):
+        """
+        Returns the slot partition of the last execution: a dictionary slot name
+        -> worker id (empty unless the scheduler policy is 'graph').
+        """
+
+        return self.slot_assignment
+#---------------------- end def get_slot_assignment():----------------------------
+
+    def set_slot_assignment(self, slot_assignment):
+        """
+        Sets a previous slot partition to be rebalanced instead of recomputed.
+        """
+
+        self.slot_assignment = dict(slot_assignment)
+#---------------------- end def set_slot_assignment():----------------------------
+
     def set_runtime_cortix_param_file(self, full_path):
         """
         Sets the task config file to the specified file.
@@ -240,35 +680,46 @@ class Task:
 #*********************************************************************************
 # Private helper functions (internal use: __)
 
-    def __get_runtime_status(self, runtime_status_files):
+    def __schedule_slots(self, network, slot_names, n_workers):
         """
-        Helper funcion for montioring the status of the task.
+        Partitions the slots on n_workers workers (default: one per cpu) following
+        the network graph and the slot costs. Returns the list of slot groups.
         """
 
-        task_status = 'finished'
-        running_module_slots = list()
+        if n_workers is None:
+            n_workers = min(len(slot_names), os.cpu_count() or 1)
 
-        for (slot_name, status_file) in runtime_status_files.items():
-            if not os.path.isfile(status_file):
-                time.sleep(0.1)
+        slot_costs = load_slot_costs(self.scheduler_costs_file)
+        slot_costs.update(self.slot_costs)
 
-            assert os.path.isfile(status_file), 'runtime status file %r not found.' \
-            % status_file
+        scheduler = SlotScheduler(network.get_nx_graph(), slot_names, n_workers, \
+                                  slot_costs, self.scheduler_imbalance)
+        self.slot_assignment = scheduler.partition(self.slot_assignment or None)
 
-            tree = ElementTree()
-            tree.parse(status_file)
-            status_file_xml_root_node = tree.getroot()
-            node = status_file_xml_root_node.find('status')
+        self.log.info('slot partition: %s', str(scheduler.get_groups()))
+        self.log.info('slot partition cut edges: %s; worker loads: %s', \
+                      str(scheduler.get_cut_edges()), \
+                      str([round(load, 3) for load in scheduler.get_loads()]))
 
-            status = node.text.strip()
+        return scheduler.get_groups()
+#---------------------- end def __schedule_slots():-------------------------------
 
-            if status == 'running':
-                task_status = 'running'
-                running_module_slots.append(slot_name)
+    def __get_data_graph(self, application, network):
+        """
+        Returns the data flow of the network: a networkx DiGraph of the slots with
+        an edge from the provider to the user of every use port.
+        """
 
-        return (task_status, running_module_slots)
-#---------------------- end def __get_runtime_status():---------------------------
+        graph = nx.DiGraph()
+        graph.add_nodes_from(network.get_slot_names())
+        for (user, provider, data) in network.get_nx_graph().edges(data=True):
+            module = application.get_module(provider.split('_')[0])
+            if user != provider and \
+               module.get_port_type(data['toPort']) == 'provide':
+                graph.add_edge(provider, user)
 
+        return graph
+#---------------------- end def __get_data_graph():-------------------------------
 
 #====================== end class Task: ==========================================
 
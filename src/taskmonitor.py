@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+TaskMonitor class of Cortix. Tracks the runtime status of every module slot of a
+task as the launchers report it.
+
+Cortix: a program for system-level modules coupling, execution, and analysis.
+"""
+#*********************************************************************************
+import time
+from xml.etree.ElementTree import ElementTree
+from xml.etree.ElementTree import ParseError
+from cortix.src.utils.filewatcher import FileWatcher
+#*********************************************************************************
+
+class TaskMonitor:
+    """
+    Monitors the runtime-status.xml files written by the launchers of a task. The
+    files are watched for changes (see FileWatcher) and re-parsed only when they
+    change; every status change of a slot is recorded as a transition
+    (slot_name, old_status, new_status, time stamp).
+
+    Slot statuses are: 'pending' (no status file yet), 'running', 'finished' and
+    'failed'. The latter two are terminal.
+    """
+
+    terminal_status = ('finished', 'failed')
+
+    def __init__(self, runtime_status_files=dict(), poll_interval=1.0):
+
+        assert isinstance(runtime_status_files, dict), \
+        '-> runtime_status_files not a dict.'
+        assert isinstance(poll_interval, float), '-> poll_interval not a float.'
+
+        self.runtime_status_files = runtime_status_files
+        self.poll_interval = poll_interval
+
+        self.slot_status = dict()
+        self.transitions = list()
+
+        self.watcher = FileWatcher(list(runtime_status_files.values()), poll_interval)
+
+        for slot_name in runtime_status_files.keys():
+            self.slot_status[slot_name] = 'pending'
+
+        # status files may already exist when the monitor is created
+        self.__update(list(runtime_status_files.values()))
+#---------------------- end def __init__():---------------------------------------
+
+    def wait(self, timeout=None):
+        """
+        Blocks until a slot changes status or timeout (s) expires. Returns the list
+        of new transitions (empty on timeout).
+        """
+
+        changed_files = self.watcher.wait(timeout)
+        return self.__update(changed_files)
+#---------------------- end def wait():-------------------------------------------
+
+    def update(self):
+        """
+        Checks the status files without blocking. Returns the list of new
+        transitions.
+        """
+
+        return self.__update(self.watcher.changed())
+#---------------------- end def update():-----------------------------------------
+
+    def set_slot_status(self, slot_name, status):
+        """
+        Records a status reported by other means than the status file, e.g. a
+        launcher that died before it could write it.
+        """
+
+        assert slot_name in self.slot_status, 'slot %r not monitored.' % slot_name
+        self.__record(slot_name, status)
+#---------------------- end def set_slot_status():--------------------------------
+
+    def is_running(self):
+        """
+        Returns true iff at least one slot has not reached a terminal status.
+        """
+
+        for status in self.slot_status.values():
+            if status not in TaskMonitor.terminal_status:
+                return True
+        return False
+#---------------------- end def is_running():-------------------------------------
+
+    def get_slot_status(self, slot_name):
+        """
+        Returns the current status of a slot. None if the slot is not monitored.
+        """
+
+        return self.slot_status.get(slot_name, None)
+#---------------------- end def get_slot_status():--------------------------------
+
+    def get_slot_names(self, status=None):
+        """
+        Returns a list of the monitored slot names; only those with the given
+        status if status is not None.
+        """
+
+        if status is None:
+            return list(self.slot_status.keys())
+
+        return [slot for (slot, stat) in self.slot_status.items() if stat == status]
+#---------------------- end def get_slot_names():---------------------------------
+
+    def get_running_slot_names(self):
+        """
+        Returns a list of the slots that have not reached a terminal status.
+        """
+
+        return [slot for (slot, stat) in self.slot_status.items() \
+                if stat not in TaskMonitor.terminal_status]
+#---------------------- end def get_running_slot_names():-------------------------
+
+    def get_transitions(self, slot_name=None):
+        """
+        Returns the list of transitions (slot_name, old_status, new_status,
+        time stamp); only those of slot_name if given.
+        """
+
+        if slot_name is None:
+            return list(self.transitions)
+
+        return [trans for trans in self.transitions if trans[0] == slot_name]
+#---------------------- end def get_transitions():--------------------------------
+
+    def get_elapsed_time(self, slot_name):
+        """
+        Returns the wall time (s) the slot spent from its first to its latest
+        transition.
+        """
+
+        transitions = self.get_transitions(slot_name)
+        if len(transitions) == 0:
+            return 0.0
+
+        return transitions[-1][3] - transitions[0][3]
+#---------------------- end def get_elapsed_time():-------------------------------
+
+    def close(self):
+        """
+        Stops watching the status files.
+        """
+
+        self.watcher.close()
+#---------------------- end def close():------------------------------------------
+
+#*********************************************************************************
+# Private helper functions (internal use: __)
+
+    def __update(self, changed_files):
+        """
+        Re-parses the given status files and records status changes.
+        """
+
+        n_transitions = len(self.transitions)
+
+        for (slot_name, status_file) in self.runtime_status_files.items():
+            if status_file not in changed_files:
+                continue
+            status = self.__read_status(status_file)
+            if status is not None:
+                self.__record(slot_name, status)
+
+        return self.transitions[n_transitions:]
+#---------------------- end def __update():---------------------------------------
+
+    def __record(self, slot_name, status):
+        """
+        Appends a transition if the status of the slot changed.
+        """
+
+        old_status = self.slot_status[slot_name]
+        if status == old_status:
+            return
+
+        self.slot_status[slot_name] = status
+        self.transitions.append((slot_name, old_status, status, time.time()))
+#---------------------- end def __record():---------------------------------------
+
+    def __read_status(self, status_file):
+        """
+        Returns the status in a runtime status file; None if the file is missing or
+        caught half written (a later change will bring it back).
+        """
+
+        tree = ElementTree()
+        try:
+            tree.parse(status_file)
+        except (OSError, ParseError):
+            return None
+
+        node = tree.getroot().find('status')
+        if node is None or node.text is None:
+            return None
+
+        return node.text.strip()
+#---------------------- end def __read_status():----------------------------------
+
+#====================== end class TaskMonitor: ===================================
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+This file contains a helper function used to create the executor that runs the
+module launchers of a task concurrently.
+
+Cortix: a program for system-level modules coupling, execution, and analysis.
+"""
+#*********************************************************************************
+from concurrent.futures import ProcessPoolExecutor
+#*********************************************************************************
+
+EXECUTOR_BACKENDS = ('process', 'mpi')
+
+def create_executor(backend='process', max_workers=1):
+    """
+    Returns a concurrent.futures compatible executor for the given backend:
+    'process' is a pool of local processes; 'mpi' is an mpi4py pool of spawned
+    MPI processes, one rank per worker.
+    """
+
+    assert backend in EXECUTOR_BACKENDS, 'executor backend %r invalid; options: %r' \
+    % (backend, EXECUTOR_BACKENDS)
+    assert isinstance(max_workers, int), '-> max_workers not an int.'
+    assert max_workers >= 1, '-> max_workers must be >= 1.'
+
+    if backend == 'mpi':
+        from mpi4py.futures import MPIPoolExecutor
+        return MPIPoolExecutor(max_workers=max_workers)
+
+    return ProcessPoolExecutor(max_workers=max_workers)
+#---------------------- end def create_executor():--------------------------------
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+This file contains the class definition of FileWatcher, which reports changes to a
+set of files. On Linux the kernel inotify facility is used so that a waiting caller
+wakes up as soon as a watched file is written; elsewhere (or if inotify cannot be
+set up) the files are polled with os.stat() at a fixed interval.
+
+Cortix: a program for system-level modules coupling, execution, and analysis.
+"""
+#*********************************************************************************
+import os
+import time
+import select
+import ctypes
+import ctypes.util
+#*********************************************************************************
+
+# inotify constants (linux/inotify.h)
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+class FileWatcher:
+    """
+    Watches a set of files (which may not exist yet) and reports which of them
+    changed since the last check. A file signature is its (inode, size, mtime);
+    any difference counts as a change.
+    """
+
+    def __init__(self, file_names=list(), poll_interval=1.0):
+
+        assert isinstance(poll_interval, float), '-> poll_interval not a float.'
+        assert poll_interval > 0.0, '-> poll_interval must be positive.'
+
+        self.poll_interval = poll_interval
+        self.signatures = dict()
+
+        self.__inotify_fd = None
+        self.__watched_dirs = dict()
+        self.__setup_inotify()
+
+        for file_name in file_names:
+            self.add_file(file_name)
+#---------------------- end def __init__():---------------------------------------
+
+    def add_file(self, file_name):
+        """
+        Adds a file to the watch list; its current state is not a change.
+        """
+
+        assert isinstance(file_name, str), '-> file_name not a str.'
+
+        self.signatures[file_name] = self.__get_signature(file_name)
+
+        dir_name = os.path.dirname(os.path.abspath(file_name))
+        if self.__inotify_fd is not None and dir_name not in self.__watched_dirs:
+            mask = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_MODIFY
+            wd = self.__libc.inotify_add_watch(self.__inotify_fd, \
+                                               dir_name.encode(), mask)
+            if wd >= 0:
+                self.__watched_dirs[dir_name] = wd
+#---------------------- end def add_file():---------------------------------------
+
+    def get_files(self):
+        """
+        Returns a list of the watched file names.
+        """
+
+        return list(self.signatures.keys())
+#---------------------- end def get_files():--------------------------------------
+
+    def is_event_driven(self):
+        """
+        Returns true iff changes are notified by the kernel rather than polled.
+        """
+
+        return self.__inotify_fd is not None
+#---------------------- end def is_event_driven():--------------------------------
+
+    def changed(self):
+        """
+        Returns a list of the files that changed since the last call.
+        """
+
+        changed_files = list()
+        for (file_name, signature) in self.signatures.items():
+            new_signature = self.__get_signature(file_name)
+            if new_signature != signature:
+                self.signatures[file_name] = new_signature
+                changed_files.append(file_name)
+
+        return changed_files
+#---------------------- end def changed():----------------------------------------
+
+    def wait(self, timeout=None):
+        """
+        Blocks until at least one watched file changes or timeout (s) expires.
+        Returns the list of changed files (empty on timeout).
+        """
+
+        if timeout is not None:
+            deadline = time.time() + timeout
+
+        while True:
+            changed_files = self.changed()
+            if len(changed_files) > 0:
+                return changed_files
+
+            interval = self.poll_interval
+            if timeout is not None:
+                remaining = deadline - time.time()
+                if remaining <= 0.0:
+                    return changed_files
+                interval = min(interval, remaining)
+
+            if self.__inotify_fd is not None:
+                # the poll interval is only a safety net against missed events
+                (ready, _, _) = select.select([self.__inotify_fd], [], [], interval)
+                if ready:
+                    self.__drain_inotify()
+            else:
+                time.sleep(interval)
+#---------------------- end def wait():-------------------------------------------
+
+    def close(self):
+        """
+        Releases the kernel resources, if any.
+        """
+
+        if self.__inotify_fd is not None:
+            os.close(self.__inotify_fd)
+            self.__inotify_fd = None
+            self.__watched_dirs = dict()
+#---------------------- end def close():------------------------------------------
+
+    def __del__(self):
+
+        self.close()
+#---------------------- end def __del__():----------------------------------------
+
+#*********************************************************************************
+# Private helper functions (internal use: __)
+
+    def __get_signature(self, file_name):
+        """
+        Returns the (inode, size, mtime) of a file; None if it does not exist.
+        """
+
+        try:
+            stat = os.stat(file_name)
+        except OSError:
+            return None
+
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+#---------------------- end def __get_signature():--------------------------------
+
+    def __setup_inotify(self):
+        """
+        Opens an inotify instance when the platform provides it.
+        """
+
+        self.__libc = None
+
+        lib_name = ctypes.util.find_library('c')
+        if lib_name is None:
+            return
+
+        try:
+            libc = ctypes.CDLL(lib_name, use_errno=True)
+            inotify_init1 = libc.inotify_init1
+        except (OSError, AttributeError):
+            return
+
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, \
+                                           ctypes.c_uint32]
+        fd = inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            return
+
+        self.__libc = libc
+        self.__inotify_fd = fd
+#---------------------- end def __setup_inotify():--------------------------------
+
+    def __drain_inotify(self):
+        """
+        Discards pending inotify events; the file signatures tell what changed.
+        """
+
+        while True:
+            try:
+                data = os.read(self.__inotify_fd, 4096)
+            except BlockingIOError:
+                return
+            if not data:
+                return
+#---------------------- end def __drain_inotify():--------------------------------
+
+#====================== end class FileWatcher: ===================================
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+This file contains the lazy import helper of Cortix. Heavy dependencies (mpi4py,
+networkx, pandas, matplotlib) are bound at module level to a stand-in that imports
+the real module on first attribute access, so they load only when the backend that
+needs them is actually used:
+
+    MPI = lazy_import('mpi4py.MPI')
+    ...
+    comm = MPI.COMM_WORLD   # mpi4py is imported here
+
+Cortix: a program for system-level modules coupling, execution, and analysis.
+"""
+#*********************************************************************************
+import sys
+import types
+import importlib
+#*********************************************************************************
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module that is imported on first attribute access. The
+    optional before() callable runs right before the import (e.g. to select the
+    matplotlib backend). After loading, the module attributes are copied in so
+    later lookups cost the same as on the real module.
+    """
+
+    def __init__(self, name, before=None):
+
+        super().__init__(name)
+        self.__dict__['_LazyModule__before'] = before
+        self.__dict__['_LazyModule__module'] = None
+#---------------------- end def __init__():---------------------------------------
+
+    def __getattr__(self, attribute):
+
+        return getattr(self.__load(), attribute)
+#---------------------- end def __getattr__():------------------------------------
+
+    def __dir__(self):
+
+        return dir(self.__load())
+#---------------------- end def __dir__():----------------------------------------
+
+    def __repr__(self):
+
+        if self.__dict__['_LazyModule__module'] is None:
+            return '<lazy module %r (not loaded)>' % self.__name__
+        return repr(self.__dict__['_LazyModule__module'])
+#---------------------- end def __repr__():---------------------------------------
+
+#*********************************************************************************
+# Private helper functions (internal use: __)
+
+    def __load(self):
+        """
+        Imports the module (once) and returns it.
+        """
+
+        module = self.__dict__['_LazyModule__module']
+        if module is None:
+            before = self.__dict__['_LazyModule__before']
+            if before is not None:
+                before()
+            module = importlib.import_module(self.__name__)
+            self.__dict__.update(module.__dict__)
+            self.__dict__['_LazyModule__module'] = module
+
+        return module
+#---------------------- end def __load():-----------------------------------------
+
+#====================== end class LazyModule: ====================================
+
+def lazy_import(name, before=None):
+    """
+    Returns the module name if it is already imported, else a LazyModule that
+    imports it on first use.
+    """
+
+    module = sys.modules.get(name, None)
+    if module is not None:
+        return module
+
+    return LazyModule(name, before)
+#---------------------- end def lazy_import():------------------------------------
+
+def is_loaded(module):
+    """
+    Returns true iff module is a real module or a LazyModule already imported.
+    """
+
+    if isinstance(module, LazyModule):
+        return module.__dict__['_LazyModule__module'] is not None
+
+    return True
+#---------------------- end def is_loaded():--------------------------------------
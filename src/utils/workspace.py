@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+This file contains the work directory helpers of Cortix. Directories are created,
+files written and inputs staged in-process (no shell), and a Workspace collects
+the whole directory tree of a task with its files so it is provisioned in one pass.
+
+Cortix: a program for system-level modules coupling, execution, and analysis.
+"""
+#*********************************************************************************
+import os
+import time
+import shutil
+try:
+    import fcntl
+except ImportError: # not on POSIX
+    fcntl = None
+#*********************************************************************************
+
+_FICLONE = 0x40049409 # Linux ioctl: share the extents of a file (copy-on-write)
+
+class Workspace:
+    """
+    Batch of directories, files and staged inputs of a work directory tree. Add
+    them with add_dir(), add_file() and add_input(); provision() then creates
+    each directory once (deepest first, so parents come along), writes the files
+    and stages the inputs. get_report() tells what was done and how long it took.
+    """
+
+    def __init__(self):
+
+        self.dirs = set()
+        self.files = list()  # (full path, contents)
+        self.inputs = list() # (source, destination, read only)
+
+        self.report = dict()
+#---------------------- end def __init__():---------------------------------------
+
+    def add_dir(self, path):
+        """
+        Adds a directory to create (with its parents).
+        """
+
+        self.dirs.add(os.path.normpath(path))
+#---------------------- end def add_dir():----------------------------------------
+
+    def add_file(self, full_path_file_name, contents):
+        """
+        Adds a text file to write (its directory is created too).
+        """
+
+        self.add_dir(os.path.dirname(full_path_file_name))
+        self.files.append((full_path_file_name, contents))
+#---------------------- end def add_file():---------------------------------------
+
+    def add_input(self, source, destination, read_only=False):
+        """
+        Adds an input file to stage at destination (see stage_file()).
+        """
+
+        self.add_dir(os.path.dirname(destination))
+        self.inputs.append((source, destination, read_only))
+#---------------------- end def add_input():--------------------------------------
+
+    def provision(self):
+        """
+        Creates the directories, writes the files and stages the inputs. Returns
+        the report (see get_report()).
+        """
+
+        start = time.time()
+
+        # a directory that is the parent of another is created along with it
+        leaves = set(self.dirs)
+        for path in self.dirs:
+            parent = os.path.dirname(path)
+            while parent and parent != os.path.dirname(parent):
+                leaves.discard(parent)
+                parent = os.path.dirname(parent)
+
+        for path in sorted(leaves):
+            os.makedirs(path, exist_ok=True)
+
+        for (full_path_file_name, contents) in self.files:
+            with open(full_path_file_name, 'w') as fout:
+                fout.write(contents)
+
+        methods = {'clone': 0, 'link': 0, 'copy': 0}
+        for (source, destination, read_only) in self.inputs:
+            methods[stage_file(source, destination, read_only)] += 1
+
+        self.report = {'directories': len(self.dirs),
+                       'files': len(self.files),
+                       'cloned': methods['clone'],
+                       'linked': methods['link'],
+                       'copied': methods['copy'],
+                       'time': time.time() - start}
+
+        return self.report
+#---------------------- end def provision():--------------------------------------
+
+    def get_report(self):
+        """
+        Returns a dictionary of the number of directories and files of the last
+        provision(), the number of inputs cloned, linked and copied, and the time
+        (s) it took.
+        """
+
+        return self.report
+#---------------------- end def get_report():-------------------------------------
+
+    def __str__(self):
+        """
+        Workspace to string conversion
+        """
+
+        if len(self.report) == 0:
+            return 'Workspace: %i directories; %i files; %i inputs (not provisioned)' \
+                   % (len(self.dirs), len(self.files), len(self.inputs))
+
+        return 'Workspace: %i directories; %i files; %i cloned, %i linked, ' \
+               '%i copied inputs; %.4f s' % (self.report['directories'], \
+               self.report['files'], self.report['cloned'], self.report['linked'], \
+               self.report['copied'], self.report['time'])
+#---------------------- end def __str__():----------------------------------------
+
+    def __repr__(self):
+        """
+        Workspace to string conversion
+        """
+
+        return self.__str__()
+#---------------------- end def __repr__():---------------------------------------
+
+#====================== end class Workspace: =====================================
+
+def make_dirs(path):
+    """
+    Creates the directory path with its parents, if not there (mkdir -p).
+    """
+
+    os.makedirs(path, exist_ok=True)
+#---------------------- end def make_dirs():--------------------------------------
+
+def remove_dir(path):
+    """
+    Removes the directory path and all its contents, if there (rm -rf).
+    """
+
+    shutil.rmtree(path, ignore_errors=True)
+#---------------------- end def remove_dir():-------------------------------------
+
+def stage_file(source, destination, read_only=False):
+    """
+    Places a copy of the file source at destination, replacing it (cp -f). The
+    copy shares the data of the source when the file system allows: a
+    copy-on-write clone, or, if read_only (neither file is written afterwards),
+    a hard link; else the data is copied. Returns 'clone', 'link' or 'copy'.
+    """
+
+    if os.path.lexists(destination):
+        os.remove(destination)
+
+    if fcntl is not None:
+        with open(source, 'rb') as fin, open(destination, 'wb') as fout:
+            try:
+                fcntl.ioctl(fout.fileno(), _FICLONE, fin.fileno())
+                cloned = True
+            except OSError: # not supported across or by these file systems
+                cloned = False
+        if cloned:
+            return 'clone'
+        os.remove(destination)
+
+    if read_only:
+        try:
+            os.link(source, destination)
+            return 'link'
+        except OSError:
+            pass
+
+    shutil.copyfile(source, destination)
+    return 'copy'
+#---------------------- end def stage_file():-------------------------------------
@@ -21,8 +21,8 @@ Mon Dec 12 00:32:35 EST 2016
 #*******************************************************************************
 import os, sys
 import math
-import pandas
-from copy import deepcopy
+from cortix.src.utils.lazyimport import lazy_import
+pandas = lazy_import('pandas')
 
 from ._fuelbucket import _FuelBucket  # constructor
 #*******************************************************************************
@@ -32,7 +32,7 @@ class FuelBucket():
 
 #*******************************************************************************
  def __init__( self, 
-               specs = pandas.DataFrame()
+               specs = None # pandas.DataFrame
              ):
 
      # constructor
@@ -160,13 +160,13 @@ class FuelBucket():
  def GetFuelPhase(self): 
      return self._fuelPhase
  def SetFuelPhase(self,phase): 
-     self._fuelPhase = deepcopy( phase )
+     self._fuelPhase = phase.Copy() # copy-on-write
  fuelPhase = property(GetFuelPhase,SetFuelPhase,None,None)
 
  def GetCladdingPhase(self): 
      return self._claddingPhase
  def SetCladdingPhase(self,phase): 
-     self._claddingPhase = deepcopy( phase )
+     self._claddingPhase = phase.Copy() # copy-on-write
  claddingPhase = property(GetCladdingPhase,SetCladdingPhase,None,None)
 
 #*******************************************************************************
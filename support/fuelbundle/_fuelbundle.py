@@ -8,16 +8,19 @@ Sat Sep  5 13:59:00 EDT 2015
 
 #*******************************************************************************
 import os, sys
-import pandas
+from cortix.src.utils.lazyimport import lazy_import
+pandas = lazy_import('pandas')
 #*******************************************************************************
 
 #*******************************************************************************
 # constructor
 
 def _FuelBundle( self, 
-                 specs = pandas.DataFrame()
+                 specs = None # pandas.DataFrame
                ):
 
+     if specs is None: specs = pandas.DataFrame()
+
      assert type(specs) == type(pandas.DataFrame()), 'oops not pandas table.'
 
      self._specs = specs
@@ -21,8 +21,8 @@ Sun Dec 27 15:06:55 EST 2015
 #*******************************************************************************
 import os, sys
 import math
-import pandas
-from copy import deepcopy
+from cortix.src.utils.lazyimport import lazy_import
+pandas = lazy_import('pandas')
 
 from ._fuelbundle import _FuelBundle  # constructor
 #*******************************************************************************
@@ -32,7 +32,7 @@ class FuelBundle():
 
 #*******************************************************************************
  def __init__( self, 
-               specs = pandas.DataFrame()
+               specs = None # pandas.DataFrame
              ):
 
      # constructor
@@ -131,13 +131,13 @@ class FuelBundle():
  def GetSolidPhase(self): 
      return self._solidPhase
  def SetSolidPhase(self,phase): 
-     self._solidPhase = deepcopy( phase )
+     self._solidPhase = phase.Copy() # copy-on-write
  solidPhase = property(GetSolidPhase,SetSolidPhase,None,None)
 
  def GetGasPhase(self): 
      return self._gasPhase
  def SetGasPhase(self,phase): 
-     self._gasPhase = deepcopy( phase )
+     self._gasPhase = phase.Copy() # copy-on-write
  gasPhase = property(GetGasPhase,SetGasPhase,None,None)
  
 
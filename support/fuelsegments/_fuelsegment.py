@@ -10,7 +10,8 @@ Sat May  9 21:40:48 EDT 2015 created; vfda
 
 #*******************************************************************************
 import os, sys
-import pandas
+from cortix.src.utils.lazyimport import lazy_import
+pandas = lazy_import('pandas')
 
 from ..specie.interface import Specie 
 #*******************************************************************************
@@ -20,6 +21,8 @@ from ..specie.interface import Specie
 
 def _FuelSegment( self, geometry, species ):
 
+  if geometry is None: geometry = pandas.Series()
+
   assert type(geometry) == type(pandas.Series()), 'fatal.'
   assert type(species)  == type(list()), 'fatal.'
   if type(species) == type(list()) and len(species) > 0:
@@ -31,4 +34,6 @@ def _FuelSegment( self, geometry, species ):
   self._geometry = geometry
   self._species  = species
 
+  self._speciesMatrix = None # see _GetAttribute()
+
 #*******************************************************************************
@@ -12,6 +12,7 @@ Sat May  9 21:40:48 EDT 2015 created; vfda
 import os, sys
 
 from .fuelsegment import FuelSegment
+from ._segmentstore import _SegmentStore
 #*******************************************************************************
 
 #*******************************************************************************
@@ -35,6 +36,9 @@ def _FuelSegmentsGroups( self, key, fuelSegments=None ):
   else:
      self.groups[key] = list()
 
+# Struct-of-arrays form of the groups for attribute queries (see _SegmentStore)
+  self._store = _SegmentStore()
+
   return
 
 #*******************************************************************************
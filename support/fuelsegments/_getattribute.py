@@ -14,6 +14,7 @@ import os, sys, io, time, datetime
 import math, random
 from ..periodictable import ELEMENTS
 from ..periodictable import SERIES
+from ..speciesmatrix import SpeciesMatrix
 #*********************************************************************************
 
 # Get stored fuel segment property either overall or on a nuclide basis 
@@ -28,8 +29,6 @@ def _GetAttribute(self, attributeName, nuclide=None, series=None ):
   if nuclide is not None: assert series is None, 'fail.'
   if series is not None: assert nuclide is None, 'fail.'
 
-  if series is not None: assert False,' not implemented.'
-
   if attributeName == 'isotopes': assert nuclide is not None, 'need a nuclide symbol.'
 
 #.................................................................................
@@ -78,9 +77,7 @@ def _GetAttribute(self, attributeName, nuclide=None, series=None ):
 
 # mass or mass concentration
      if attributeName == 'massCC' or attributeName == 'massDens' or attributeName == 'mass': 
-        massCC = 0.0
-        for spc in self._species:
-            massCC += spc.massCC
+        massCC = __GetSpeciesMatrix( self ).GetTotal( 'massCC' )
         if attributeName == 'massCC' or attributeName == 'massDens': 
           return massCC
         else:
@@ -88,9 +85,7 @@ def _GetAttribute(self, attributeName, nuclide=None, series=None ):
           return massCC * volume
 # radioactivity 
      if attributeName == 'radioactivtyDens' or attributeName == 'radioactivity':
-        radDens = 0.0
-        for spc in self._species:
-            radDens += spc.molarRadioactivity * spc.molarCC
+        radDens = __GetSpeciesMatrix( self ).GetTotal( 'molarRadioactivity', 'molarCC' )
         if attributeName == 'radioactivityDens': 
           return radDens
         else:
@@ -98,9 +93,7 @@ def _GetAttribute(self, attributeName, nuclide=None, series=None ):
           return radDens * volume
 # gamma          
      if attributeName == 'gammaDens' or attributeName == 'gamma':
-        gammaDens = 0.0
-        for spc in self._species:
-            gammaDens += spc.molarGammaPwr * spc.molarCC
+        gammaDens = __GetSpeciesMatrix( self ).GetTotal( 'molarGammaPwr', 'molarCC' )
         if attributeName == 'gammaDens': 
           return gammaDens
         else:
@@ -108,9 +101,7 @@ def _GetAttribute(self, attributeName, nuclide=None, series=None ):
           return gammaDens * volume
 # heat           
      if attributeName == 'heatDens' or attributeName == 'heat':
-        heatDens = 0.0
-        for spc in self._species:
-            heatDens += spc.molarHeatPwr * spc.molarCC
+        heatDens = __GetSpeciesMatrix( self ).GetTotal( 'molarHeatPwr', 'molarCC' )
         if attributeName == 'heatDens': 
           return heatDens
         else:
@@ -182,101 +173,25 @@ def _GetAttribute(self, attributeName, nuclide=None, series=None ):
 #        return density
    
 #.................................................................................
-# get specific nuclide (either the isotopes of the nuclide or the specific isotope) property
-
-  if nuclide is not None:
-
-    # a particular nuclide given (atomic number and atomic mass number)
-    if len(nuclide.split('-')) == 2: 
-
-       nuclideMassNumber = int(nuclide.split('-')[1].strip('m'))
-       nuclideSymbol     = nuclide.split('-')[0]
-       nuclideMolarMass  = ELEMENTS[nuclideSymbol].isotopes[nuclideMassNumber].mass
-
-       massCC = 0.0
-
-       for spc in self._species:
-
-         formula = spc.atoms
-
-         moleFraction = 0.0
-
-         for item in formula:
-
-           if len(item.split('*')) == 1: # no multiplier (implies 1.0)
-
-             formulaNuclideSymbol = item.split('-')[0].strip()
-             if formulaNuclideSymbol == nuclideSymbol: assert len(item.split('-')) == 2
-
-             if item.split('*')[0].strip() == nuclide: 
-                moleFraction = 1.0
-             else:
-                moleFraction = 0.0
-
-           elif len(item.split('*')) == 2: # with multiplier
-
-             formulaNuclideSymbol = item.split('*')[1].split('-')[0].strip()
-             if formulaNuclideSymbol == nuclideSymbol: assert len(item.split('*')[1].split('-')) == 2
-
-             if item.split('*')[1].strip() == nuclide: 
-                moleFraction = float(item.split('*')[0].strip()) 
-             else:
-                moleFraction = 0.0
+# get specific nuclide (either the isotopes of the nuclide or the specific isotope)
+# or chemical series (e.g. 'actinides') mass; see SpeciesMatrix
 
-           else:
-             assert False
+  if nuclide is not None or series is not None:
 
-           massCC += spc.molarCC * moleFraction * nuclideMolarMass
+     massCC = __GetSpeciesMatrix( self ).GetMassCC( nuclide, series )
 
-       return  massCC * __GetFuelSegmentVolume( self )
+     return  massCC * __GetFuelSegmentVolume( self )
 
-  # chemical element given (only atomic number given)
-    elif len(nuclide.split('-')) == 1: 
-
-       massCC = 0.0
-
-       for spc in self._species:
-
-         formula = spc.atoms
-
-         for item in formula:
-
-           moleFraction = 0.0
-
-           if len(item.split('*')) == 1: # no multiplier (implies 1.0)
-
-             assert len(item.split('-')) == 2
-             formulaNuclideSymbol = item.split('-')[0].strip()
-             formulaNuclideMassNumber = int(item.split('-')[1].strip('m'))
-             formulaNuclideMolarMass = ELEMENTS[formulaNuclideSymbol].isotopes[formulaNuclideMassNumber].mass
-
-             if formulaNuclideSymbol == nuclide: 
-                moleFraction = 1.0
-             else:
-                moleFraction = 0.0
-
-           elif len(item.split('*')) == 2: # with multiplier
-
-             assert len(item.split('*')[1].split('-')) == 2
-             formulaNuclideSymbol = item.split('*')[1].split('-')[0].strip()
-             formulaNuclideMassNumber = int(item.split('*')[1].split('-')[1].strip('m'))
-             formulaNuclideMolarMass = ELEMENTS[formulaNuclideSymbol].isotopes[formulaNuclideMassNumber].mass
-
-             if formulaNuclideSymbol == nuclide: 
-                moleFraction = float(item.split('*')[0].strip()) 
-             else:
-                moleFraction = 0.0
-
-           else:
-             assert False
-
-           massCC += spc.molarCC * moleFraction * formulaNuclideMolarMass
+#---------------------------------------------------------------------------------
+def __GetSpeciesMatrix(self):
 
-       return  massCC * __GetFuelSegmentVolume( self )
+  # compiled once per species list; rebuilt if the species change
+  species = self._species
 
-    else:
+  if self._speciesMatrix is None or not self._speciesMatrix.Matches( species ):
+     self._speciesMatrix = SpeciesMatrix( species )
 
-      assert False
+  return self._speciesMatrix
 
 #---------------------------------------------------------------------------------
 def __GetFuelSegmentVolume(self):
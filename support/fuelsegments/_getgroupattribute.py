@@ -21,6 +21,8 @@ def _GetGroupAttribute(self, groupKey=None, attributeName=None, symbol=None, ser
  
   attribute = None 
 
+  density = attributeName[-4:] == 'Dens' or attributeName[-2:] == 'CC'
+
 # Either cumulative or average density property for all fuel segments for *all* groups
 # BE VERY CAREFUL HERE: groups with no segments will reduce the average density value
   if groupKey is None:  
@@ -30,21 +32,15 @@ def _GetGroupAttribute(self, groupKey=None, attributeName=None, symbol=None, ser
      for (key, fuelSegments) in self.groups.items():
        assert type(fuelSegments) == type(list()), 'fail.'
        if len(fuelSegments) == 0: continue  # this will reduce the average value
-       groupAttribute = 0
-       for fuelSegment in fuelSegments:
-          groupAttribute += fuelSegment.GetAttribute( attributeName, symbol, series )
+       groupAttribute = __GetSum( self, key, fuelSegments, attributeName, symbol, series )
 
-       if attributeName[-4:] == 'Dens' or attributeName[-2:] == 'CC': 
+       if density:
           groupAttribute /= len(fuelSegments)
        attribute += groupAttribute 
 
-     if attribute != 0 and \
-        (attributeName[-4:] == 'Dens' or attributeName[-2:] == 'CC'):
+     if attribute != 0 and density:
         attribute /= len(self.groups)
 
-#     if attributeName[-4:] == 'Dens' or attributeName[-2:] == 'CC': 
-#        print('HELLO density '+attributeName+' ', attribute)
-
 # Get average property in all fuel segments within a groupKey
   else:                
 
@@ -52,17 +48,35 @@ def _GetGroupAttribute(self, groupKey=None, attributeName=None, symbol=None, ser
 
      fuelSegments = self.groups[ groupKey ]
 
-     if len(fuelSegments) is 0: return 0
-
-     attribute = 0
+     if len(fuelSegments) == 0: return 0
 
-     for fuelSegment in fuelSegments:
-       attribute += fuelSegment.GetAttribute( attributeName, symbol, series )
+     attribute = __GetSum( self, groupKey, fuelSegments, attributeName, symbol, series )
 
-     if attribute != 0 and \
-        (attributeName[-4:] == 'Dens' or attributeName[-2:] == 'CC'):
+     if attribute != 0 and density:
         attribute /= len(fuelSegments)
    
   return attribute
 
+#---------------------------------------------------------------------------------
+# Sum of an attribute over the segments of a group: vectorized over the group's
+# block in the segment store; segment by segment for attributes it does not cover
+
+def __GetSum(self, groupKey, fuelSegments, attributeName, symbol, series):
+
+  assert attributeName in fuelSegments[0].attributeNames, ' attribute name: %r; options: %r; fail.' % (attributeName,fuelSegments[0].attributeNames)
+  if attributeName == 'isotopes': assert symbol is not None, 'need a nuclide symbol.'
+
+  block  = self._store.GetBlock( groupKey, fuelSegments )
+  values = self._store.GetValues( block, attributeName, symbol, series )
+
+  if values is not None:
+     if values.dtype.kind == 'i': return int( values.sum() )  # nSegments
+     return float( values.sum() )
+
+  attribute = 0
+  for fuelSegment in fuelSegments:
+    attribute += fuelSegment.GetAttribute( attributeName, symbol, series )
+
+  return attribute
+
 #*********************************************************************************
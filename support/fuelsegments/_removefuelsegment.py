@@ -17,12 +17,11 @@ def _RemoveFuelSegment(self, groupKey, fuelSegment_remove):
   assert groupKey in self.groups.keys(), 'fail.'
 
   fuelSegments = self.groups[ groupKey ]
-  nSegments    = len(fuelSegments)
 
-  for fuelSegment in fuelSegments:
-    if fuelSegment.GetAttribute('segmentId') == fuelSegment_remove.GetAttribute('segmentId'): 
-       fuelSegments.remove( fuelSegment )
+  # id -> row lookup in the group's block (see _SegmentStore)
+  removed = self._store.RemoveSegment( groupKey, fuelSegments, 
+                                       fuelSegment_remove.geometry['segment id'] )
 
-  assert len(self.groups[groupKey]) == nSegments-1, 'fatal.'
+  assert removed, 'fatal.'
 
 #*********************************************************************************
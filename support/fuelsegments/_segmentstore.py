@@ -0,0 +1,223 @@
+"""
+Fuel segment store: struct-of-arrays form of the fuel segments of the groups of a
+FuelSegmentsGroups object. Each group has a block with the segment ids (and an
+id -> row index) and the flat list of the species of all its segments (row of the
+segment, species column) so that per-segment sums over species are one bincount.
+The species values (molarCC, massCC, ...) and the geometry columns (fuel length
+and diameter) are read from the Specie objects and the segment geometries on each
+query since they change during a simulation; nuclide and series masses use a
+SpeciesMatrix of the distinct species.
+
+Removing a segment by id is a dictionary lookup: its row is only marked dead
+(the block is compacted once half of its rows are). A block is rebuilt when the
+segment list of its group changes otherwise, or the species list of one of its
+segments does (checked on each query by segment, species and atoms identity), so
+segments added to, or removed from, the lists returned by GetFuelSegments(), and
+species added to or removed from a segment, are always accounted for.
+
+VFdALib support classes
+"""
+
+#*******************************************************************************
+import math
+import copy
+from operator import attrgetter
+import numpy as np
+
+from ..speciesmatrix import SpeciesMatrix
+#*******************************************************************************
+
+#*******************************************************************************
+class _SegmentStore():
+
+ def __init__( self ):
+
+     self._blocks = dict()      # group key -> block (dictionary of columns)
+
+     # distinct species, by (name, atoms); one representative Specie object each,
+     # copied since the atoms of a segment's species may be changed in place
+     self._speciesIndex  = dict()
+     self._speciesList   = list()
+     self._speciesMatrix = None
+     self._coefficients  = dict() # (nuclide, series) -> mass per mole of species
+
+     return
+#*******************************************************************************
+
+#*******************************************************************************
+# Setters and Getters methods
+
+ # block of a group's segments list; rebuilt if the list changed
+ def GetBlock(self, groupKey, fuelSegments):
+     block = self._blocks.get(groupKey)
+     if block is None or block['segments'] is not fuelSegments or \
+        block['objectIds'] != list(map(id,fuelSegments)) or \
+        block['speciesKeys'] != list(map(self.__GetSpeciesKey,fuelSegments)):
+        block = self.__BuildBlock( fuelSegments )
+        self._blocks[groupKey] = block
+     return block
+
+ # remove the segment with segmentId from a group's list, keeping the block in
+ # step; returns False if there is none
+ def RemoveSegment(self, groupKey, fuelSegments, segmentId):
+     block = self._blocks.get(groupKey)
+     if block is None or block['segments'] is not fuelSegments or \
+        len(block['objectIds']) != len(fuelSegments):
+        block = self.GetBlock( groupKey, fuelSegments )
+     row = block['idIndex'].get(segmentId)
+     if row is None: return False
+
+     segment = block['rowSegments'][row]
+     if segment not in fuelSegments or \
+        segment.geometry['segment id'] != segmentId: # changed otherwise: resync
+        block = self.GetBlock( groupKey, fuelSegments )
+        row = block['idIndex'].get(segmentId)
+        if row is None: return False
+        segment = block['rowSegments'][row]
+     pos = fuelSegments.index( segment )
+
+     del block['idIndex'][segmentId]
+     del fuelSegments[pos]
+     del block['objectIds'][pos]
+     del block['speciesKeys'][pos]
+     block['alive'][row] = False
+     block['nDead'] += 1
+
+     if 2*block['nDead'] > len(block['alive']):
+        self._blocks[groupKey] = self.__BuildBlock( fuelSegments )
+     return True
+
+ # per-segment values (NumPy array) of an attribute (see FuelSegment's
+ # _GetAttribute); None if it is not one computed here
+ def GetValues(self, block, attributeName, symbol=None, series=None):
+
+     values = self.__GetRowValues( block, attributeName, symbol, series )
+     if values is None or block['nDead'] == 0:
+        return values
+     return values[block['alive']]
+
+#*******************************************************************************
+# Internal helpers
+
+ # values of all rows, dead ones included
+ def __GetRowValues(self, block, attributeName, symbol, series):
+
+     n = len(block['alive'])
+
+     if attributeName == 'nSegments':  return np.ones( n, dtype=np.intp )
+
+     if attributeName == 'fuelVolume':   return self.__GetFuelVolume( block )
+     if attributeName == 'fuelDiameter': return self.__GetGeometry( block )[1]
+     if attributeName == 'fuelLength':   return self.__GetGeometry( block )[0]
+
+     if symbol is None and series is None:
+        if attributeName in ('massCC','massDens','mass'):
+           dens = self.__SumSpecies( block, 'massCC' )
+           if attributeName == 'mass': return dens * self.__GetFuelVolume( block )
+           return dens
+        if attributeName == 'radioactivity':
+           return self.__SumSpecies( block, 'molarRadioactivity', 'molarCC' ) * self.__GetFuelVolume( block )
+        if attributeName in ('gammaDens','gamma'):
+           dens = self.__SumSpecies( block, 'molarGammaPwr', 'molarCC' )
+           if attributeName == 'gamma': return dens * self.__GetFuelVolume( block )
+           return dens
+        if attributeName in ('heatDens','heat'):
+           dens = self.__SumSpecies( block, 'molarHeatPwr', 'molarCC' )
+           if attributeName == 'heat': return dens * self.__GetFuelVolume( block )
+           return dens
+        return None
+
+     if attributeName in ('radioactivityDens','radioactivity','thermalDens','thermal',
+                          'heatDens','heat','gammaDens','gamma'):
+        return None
+
+     # nuclide or series mass (whatever the attribute name; as _GetAttribute)
+     coefficients = self.__GetCoefficients( symbol, series )
+     molarCCs = self.__GetEntryValues( block, 'molarCC' )
+     dens = np.bincount( block['entryRows'], weights=molarCCs*coefficients[block['entryCols']],
+                         minlength=n )
+     return dens * self.__GetFuelVolume( block )
+
+ def __BuildBlock(self, fuelSegments):
+
+     n = len(fuelSegments)
+
+     block = dict()
+     block['segments']    = fuelSegments        # the group's list
+     block['objectIds']   = list(map(id,fuelSegments))
+     block['speciesKeys'] = list(map(self.__GetSpeciesKey,fuelSegments))
+     block['rowSegments'] = list(fuelSegments)  # segment of each row
+     block['alive']       = np.ones( n, dtype=bool )
+     block['nDead']       = 0
+
+     block['idIndex'] = dict()
+     for (row,seg) in enumerate(fuelSegments):
+         block['idIndex'].setdefault( seg.geometry['segment id'], row )
+
+     entryRows = list()
+     entryCols = list()
+     entrySpecies = list()
+     for (row,seg) in enumerate(fuelSegments):
+         for spc in seg.species:
+             entryRows.append(row)
+             entryCols.append( self.__GetSpeciesColumn(spc) )
+             entrySpecies.append(spc)
+
+     block['entryRows']    = np.array( entryRows, dtype=np.intp )
+     block['entryCols']    = np.array( entryCols, dtype=np.intp )
+     block['entrySpecies'] = entrySpecies
+
+     return block
+
+ # identity of the species list of a segment (see GetBlock())
+ def __GetSpeciesKey(self, seg):
+     return tuple( (id(spc),id(spc.atoms)) for spc in seg.species )
+
+ # fuel length and diameter of all rows; the geometries may change in place
+ def __GetGeometry(self, block):
+     geometries = [ seg.geometry for seg in block['rowSegments'] ]
+     fuelLength   = np.fromiter( (g['fuel length [cm]'] for g in geometries),
+                                 dtype=np.float64, count=len(geometries) )
+     fuelDiameter = np.fromiter( (g['fuel diameter [cm]'] for g in geometries),
+                                 dtype=np.float64, count=len(geometries) )
+     return (fuelLength,fuelDiameter)
+
+ def __GetFuelVolume(self, block):
+     (fuelLength,fuelDiameter) = self.__GetGeometry( block )
+     return fuelLength * math.pi * (fuelDiameter/2.0)**2
+
+ def __GetSpeciesColumn(self, spc):
+     key = (spc.name, tuple(spc.atoms))
+     col = self._speciesIndex.get(key)
+     if col is None:
+        col = len(self._speciesList)
+        self._speciesIndex[key] = col
+        self._speciesList.append(copy.deepcopy(spc))
+        self._speciesMatrix = None  # new species: recompile
+        self._coefficients  = dict()
+     return col
+
+ def __GetCoefficients(self, symbol, series):
+     key = (symbol,series)
+     coefficients = self._coefficients.get(key)
+     if coefficients is None:
+        if self._speciesMatrix is None:
+           self._speciesMatrix = SpeciesMatrix( self._speciesList )
+        coefficients = self._speciesMatrix.GetMassCoefficients( symbol, series )
+        self._coefficients[key] = coefficients
+     return coefficients
+
+ def __GetEntryValues(self, block, attributeName):
+     entrySpecies = block['entrySpecies']
+     return np.fromiter( map(attrgetter(attributeName),entrySpecies),
+                         dtype=np.float64, count=len(entrySpecies) )
+
+ # per-segment sum over its species of an attribute (times weight attribute)
+ def __SumSpecies(self, block, attributeName, weightName=None):
+     values = self.__GetEntryValues( block, attributeName )
+     if weightName is not None:
+        values = values * self.__GetEntryValues( block, weightName )
+     return np.bincount( block['entryRows'], weights=values,
+                         minlength=len(block['alive']) )
+
+#*******************************************************************************
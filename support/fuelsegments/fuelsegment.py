@@ -11,7 +11,8 @@ Sat Jun 27 14:46:49 EDT 2015
 
 #*******************************************************************************
 import os, sys
-import pandas
+from cortix.src.utils.lazyimport import lazy_import
+pandas = lazy_import('pandas')
 from ._fuelsegment  import _FuelSegment      # constructor
 from ._getattribute import _GetAttribute  
 #*******************************************************************************
@@ -23,7 +24,7 @@ class FuelSegment():
 #      Chopper will be affected
 
  def __init__( self, 
-               geometry = pandas.Series(),
+               geometry = None, # pandas.Series
                species  = list()
              ):
 
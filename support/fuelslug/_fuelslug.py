@@ -11,8 +11,8 @@ Sat May  9 21:40:48 EDT 2015 created; vfda
 #*******************************************************************************
 import os, sys
 import math, random
-import pandas
-from copy import deepcopy
+from cortix.src.utils.lazyimport import lazy_import
+pandas = lazy_import('pandas')
 
 from ..phase.interface  import Phase
 
@@ -24,6 +24,10 @@ from ._getattribute import _GetAttribute
 
 def _FuelSlug( self, specs, fuelPhase, claddingPhase ):
 
+  if specs is None: specs = pandas.Series()
+  if fuelPhase is None: fuelPhase = Phase()
+  if claddingPhase is None: claddingPhase = Phase()
+
   assert type(specs)         == type(pandas.Series()), 'fatal.'
   assert type(fuelPhase)     == type(Phase()), 'fatal.'
   assert type(claddingPhase) == type(Phase()), 'fatal.'
@@ -31,10 +35,12 @@ def _FuelSlug( self, specs, fuelPhase, claddingPhase ):
   self.attributeNames = \
   ['nSlugs','slugType','slugVolume','slugArea','fuelVolume','claddingVolume','fuelArea','claddingArea','equivalentCladdingVolume','equivalentCladdingArea','equivalentFuelVolume','equivalentFuelArea','fuelLength','slugLength','fuelMass','fuelMassDens','fuelMassCC','claddingMass','claddingMassDens','claddingMassCC','nuclides','isotopes','radioactivity','radioactivityDens','gamma','gammaDens','heat','heatDens','molarHeatPwr','molarGammaPwr']
 
-  # own internal copy
-  self._specs         = deepcopy( specs )
-  self._fuelPhase     = deepcopy( fuelPhase )
-  self._claddingPhase = deepcopy( claddingPhase )
+  # own internal copy (copy-on-write phases; see Phase.Copy())
+  self._specs         = specs.copy()
+  self._fuelPhase     = fuelPhase.Copy()
+  self._claddingPhase = claddingPhase.Copy()
+
+  self._speciesMatrix = None # see _GetAttribute()
 
   # setup the equivalent cladding hollow sphere
   pi = math.pi
@@ -19,7 +19,8 @@ Thu Dec 15 16:18:39 EST 2016
 
 #*******************************************************************************
 import os, sys
-import pandas
+from cortix.src.utils.lazyimport import lazy_import
+pandas = lazy_import('pandas')
 from ..phase.interface import Phase
 from ._fuelslug        import _FuelSlug      # constructor
 from ._getattribute    import _GetAttribute  
@@ -32,9 +33,9 @@ from ._reducefuelvolume import _ReduceFuelVolume
 class FuelSlug():
 
  def __init__( self, 
-               specs         = pandas.Series(),
-               fuelPhase     = Phase(),
-               claddingPhase = Phase()
+               specs         = None, # pandas.Series
+               fuelPhase     = None, # Phase
+               claddingPhase = None  # Phase
              ):
 
   # constructor
@@ -0,0 +1,307 @@
+#!/usr/bin/env python
+"""
+History container: a table of float values with one row per time stamp and one
+column per actor (specie or quantity name). Values are held in a NumPy array
+preallocated for more rows than used, so appending a time stamp is amortized
+O(1); time stamps are kept in a sorted array. A pandas DataFrame of the table is
+built only on request (GetDataFrame()).
+
+Column and time stamp positions are kept in dictionaries, so a scalar access is
+two lookups and an array index; GetValues()/SetValues() read or write a set of
+columns of a row in one vectorized operation.
+
+Copy() makes a copy-on-write snapshot: the copy shares the arrays and the index
+dictionaries with the original until either one changes a shared value. Rows
+present when the snapshot is taken are frozen; appending new rows at the end does
+not copy anything as long as only one of the sharing histories appends (the others
+copy the table when they first change it). Handing a Phase history over to
+another module is therefore O(1) instead of O(history).
+
+Time stamps are unique. "The last time stamp" is the largest one.
+
+VFdALib support classes
+"""
+
+#*******************************************************************************
+import numpy as np
+from cortix.src.utils.lazyimport import lazy_import
+pandas = lazy_import('pandas')
+#*******************************************************************************
+
+#*******************************************************************************
+class History():
+
+ def __init__( self,
+               timeStamp = 0.0,
+               columns   = None,
+               value     = 0.0,
+               capacity  = 16
+             ):
+
+     if columns is None:
+        columns = list()
+
+     self._columns  = list(columns)
+     self._colIndex = dict()   # name -> column position
+     self._colSets  = dict()   # tuple of names -> array of column positions
+     for (i,name) in enumerate(self._columns):
+         assert name not in self._colIndex, 'column %r repeated.'%(name)
+         self._colIndex[name] = i
+
+     capacity = max(int(capacity),1)
+     self._times = np.empty( capacity, dtype=np.float64 )
+     self._data  = np.empty( (capacity,len(self._columns)), dtype=np.float64 )
+     self._size  = 0
+     self._timeIndex = dict()  # time stamp -> row position
+
+     # copy-on-write state shared by the histories sharing the arrays (see Copy()):
+     # [number of frozen rows, number of rows written, id of the appending history]
+     self._share = None
+
+     if timeStamp is not None:
+        self.AddRow( timeStamp, [float(value)]*len(self._columns) )
+
+     return
+#*******************************************************************************
+
+#*******************************************************************************
+# Setters and Getters methods
+
+ def GetColumns(self):
+     return list(self._columns)  # all names in order
+
+ def GetTimeStamps(self):
+     return self._times[:self._size].tolist()  # all time stamps in order
+
+ def GetSize(self):
+     return self._size
+
+ def __len__(self):
+     return self._size
+
+ def HasColumn(self, name):
+     return name in self._colIndex
+
+ def HasTimeStamp(self, timeStamp):
+     return self.__FindRow( float(timeStamp) ) is not None
+
+ def GetLastTimeStamp(self):
+     assert self._size > 0, 'empty history.'
+     return float(self._times[self._size-1])
+
+ # new column filled with value at all time stamps
+ def AddColumn(self, name, value=0.0):
+     assert name not in self._colIndex, 'column %r exists.'%(name)
+     self.__Own()
+     column = np.full( (self._data.shape[0],1), float(value), dtype=np.float64 )
+     self._data = np.hstack( (self._data, column) )
+     self._colIndex[name] = len(self._columns)
+     self._columns.append(name)
+     return
+
+ # time stamps are usually added in increasing order: amortized O(1)
+ def AddRow(self, timeStamp, rowValues):
+     timeStamp = float(timeStamp)
+     assert len(rowValues) == len(self._columns), \
+            'row size %r; columns %r'%(len(rowValues),len(self._columns))
+
+     assert self.__FindRow( timeStamp ) is None, 'timeStamp = %r exists.'%(timeStamp)
+
+     if self._size == self._times.shape[0]:
+        self.__Grow( 2*self._size )
+
+     times = self._times[:self._size]
+     if self._size == 0 or timeStamp > times[-1]:
+        row = self._size
+        self.__OwnRow( row )
+     else:
+        self.__Own()
+        row = int( np.searchsorted( times, timeStamp ) )
+        self._times[row+1:self._size+1] = self._times[row:self._size]
+        self._data[row+1:self._size+1,:] = self._data[row:self._size,:]
+        for t in self._times[row+1:self._size+1].tolist():
+            self._timeIndex[t] += 1
+
+     self._times[row]  = timeStamp
+     self._data[row,:] = rowValues
+     self._timeIndex[timeStamp] = row
+     self._size += 1
+     return
+
+ def GetRow(self, timeStamp=None):
+     return self._data[self.__GetRowIndex(timeStamp),:].tolist()
+
+ def GetColumn(self, name):
+     assert name in self._colIndex, 'no column %r'%(name)
+     return self._data[:self._size,self._colIndex[name]].tolist()
+
+ def GetValue(self, name, timeStamp=None):
+     col = self._colIndex.get(name)
+     assert col is not None, 'no column %r'%(name)
+     return float( self._data[self.__GetRowIndex(timeStamp),col] )
+
+ def SetValue(self, name, value, timeStamp=None):
+     col = self._colIndex.get(name)
+     assert col is not None, 'no column %r'%(name)
+     row = self.__GetRowIndex(timeStamp)
+     self.__OwnRow( row )
+     self._data[row,col] = float(value)
+     return
+
+ # values (NumPy array, a copy) of names (default all columns) at a time stamp
+ def GetValues(self, names=None, timeStamp=None):
+     row = self.__GetRowIndex(timeStamp)
+     if names is None:
+        return self._data[row,:].copy()
+     return self._data[row,self.__GetColumnPositions(names)]
+
+ # set the values of names (default all columns) at a time stamp; values is a
+ # sequence in the order of names, or a scalar for all of them
+ def SetValues(self, names=None, values=0.0, timeStamp=None):
+     row = self.__GetRowIndex(timeStamp)
+     self.__OwnRow( row )
+     if names is None:
+        self._data[row,:] = values
+     else:
+        self._data[row,self.__GetColumnPositions(names)] = values
+     return
+
+ def ScaleRow(self, timeStamp, value):
+     row = self.__GetRowIndex(timeStamp)
+     self.__OwnRow( row )
+     self._data[row,:] *= float(value)
+     return
+
+ # set all values at all time stamps
+ def Fill(self, value=0.0):
+     self.__Own()
+     self._data[:self._size,:] = float(value)
+     return
+
+ # keep only one time stamp (default to last); its values or value
+ def Reset(self, timeStamp=None, value=None):
+     row = self.__GetRowIndex(timeStamp)
+     timeStamp = float(self._times[row])
+     values = self._data[row,:].copy()
+     if value is not None:
+        values[:] = float(value)
+
+     self.__Own()
+     self._size = 0
+     self._timeIndex = dict()
+     self.AddRow( timeStamp, values )
+     return
+
+ # pandas view of the table (a copy); built on request only
+ def GetDataFrame(self):
+     return pandas.DataFrame( self._data[:self._size,:].copy(),
+                              index=self.GetTimeStamps(), columns=self.GetColumns() )
+
+ # copy-on-write snapshot (O(1)): an independent history that shares the table
+ # with this one until either changes it
+ def Copy(self):
+     share = self._share
+     if share is None:
+        share = [self._size, self._size, None]
+        self._share = share
+     else:
+        share[0] = max( share[0], self._size )
+
+     other = History.__new__( History )
+     other.__dict__.update( self.__dict__ )
+     other._colSets = dict()
+     return other
+
+ def __copy__(self):
+     return self.Copy()
+
+ def __deepcopy__(self, memo):
+     return self.Copy()
+
+#*******************************************************************************
+# Internal helpers
+
+ def __GetRowIndex(self, timeStamp):
+     if timeStamp is None:
+        assert self._size > 0, 'empty history.'
+        return self._size-1
+     row = self.__FindRow( float(timeStamp) )
+     assert row is not None, 'no timeStamp = %r'%(timeStamp)
+     return row
+
+ # the time index may be shared with histories holding more rows (see Copy())
+ def __FindRow(self, timeStamp):
+     row = self._timeIndex.get(timeStamp)
+     if row is None or row >= self._size:
+        return None
+     return row
+
+ # before writing a row, possibly the next one appended: rows written in place
+ # must be this history's own rows past the frozen ones
+ def __OwnRow(self, row):
+     share = self._share
+     if share is None:
+        return
+     (frozen,written,appender) = share
+     if row == self._size and written == self._size:
+        share[1] = self._size + 1
+        share[2] = id(self)
+        return
+     if row >= frozen and row < written and appender == id(self):
+        return
+     self.__Own()
+     return
+
+ # stop sharing: private copies of the table and indices
+ def __Own(self, capacity=None):
+     if self._share is None:
+        return
+     if capacity is None:
+        capacity = self._times.shape[0]
+     size = self._size
+     times = np.empty( capacity, dtype=np.float64 )
+     data  = np.empty( (capacity,len(self._columns)), dtype=np.float64 )
+     times[:size]  = self._times[:size]
+     data[:size,:] = self._data[:size,:]
+     self._times     = times
+     self._data      = data
+     self._columns   = list(self._columns)
+     self._colIndex  = dict(self._colIndex)
+     self._colSets   = dict()
+     self._timeIndex = { t:row for (t,row) in self._timeIndex.items() if row < size }
+     self._share     = None
+     return
+
+ # column positions only grow (columns are never removed): cache them
+ def __GetColumnPositions(self, names):
+     key = tuple(names)
+     positions = self._colSets.get(key)
+     if positions is None:
+        for name in key:
+            assert name in self._colIndex, 'no column %r'%(name)
+        positions = np.array( [self._colIndex[name] for name in key], dtype=np.intp )
+        self._colSets[key] = positions
+     return positions
+
+ def __Grow(self, capacity):
+     capacity = max(capacity,1)
+     if self._share is not None:
+        self.__Own( capacity )
+        return
+     times = np.empty( capacity, dtype=np.float64 )
+     data  = np.empty( (capacity,len(self._columns)), dtype=np.float64 )
+     times[:self._size]  = self._times[:self._size]
+     data[:self._size,:] = self._data[:self._size,:]
+     self._times = times
+     self._data  = data
+     return
+
+#*******************************************************************************
+# Printing of data members
+ def __str__( self ):
+     s = '\n\t **History()**: #timeStamps=%s; columns=%s'
+     return s % (self._size, self._columns)
+
+ def __repr__( self ):
+     return self.__str__()
+#*******************************************************************************
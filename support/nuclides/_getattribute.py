@@ -9,11 +9,14 @@ Thu Jun 25 18:16:06 EDT 2015
 #*********************************************************************************
 import os, sys, io, time, datetime
 import math, random
+import numpy as np
 
-from cortix.support.periodictable import ELEMENTS
-from cortix.support.periodictable import SERIES
+from ._nuclidesindex import _GetNuclidesIndex
 #*********************************************************************************
 
+# property density columns of the propertyDensities table
+_ColumnNames = {'massCC':'Mass CC [g/cc]', 'massDens':'Mass CC [g/cc]', 'radioactivityDens':'Radioactivity Dens. [Ci/cc]', 'thermalDens':'Thermal Dens. [W/cc]', 'heatDens':'Thermal Dens. [W/cc]', 'gammaDens':'Gamma Dens. [W/cc]'}
+
 # Get property either overall or on a nuclide basis 
 
 #---------------------------------------------------------------------------------
@@ -26,14 +29,15 @@ def _GetAttribute(self, attributeName, symbol=None, series=None ):
 
   if attributeName == 'isotopes': assert symbol is not None, 'need an element symbol.'
 
+  index = _GetNuclidesIndex( self )
+
 #.................................................................................
 # isotopes python list
 
   if attributeName == 'isotopes': 
 
-     nuclidesNames = self.propertyDensities.index
-     isotopes = [x for x in nuclidesNames if x.split('-')[0].strip()==symbol]
-     return isotopes
+     rows = index['isotopes'].get( symbol, list() )
+     return [ index['names'][row] for row in rows ]
 
 #.................................................................................
 # nuclides python list
@@ -41,163 +45,70 @@ def _GetAttribute(self, attributeName, symbol=None, series=None ):
   if attributeName == 'nuclides': 
 
      if series is not None:
-        # CREATE A HELPER FUNCTION FOR THIS; NOTE THIS IS USED BELOW TOO!!!
-        nuclidesNames = self.propertyDensities.index
-
-        seriesNameMap = {'alkali metals':'Alkali metals', 'alkali earth metals':'Alkaline earth metals', 'lanthanides':'Lanthanides', 'actinides':'Actinides', 'transition metals':'Transition metals','noble gases':'Noble gases','metalloids':'Metalloids','fission products':'fission products','nonmetals':'Nonmetals','oxide fission products':'oxide fission products','halogens':'Halogens', 'minor actinides':'minor actnides', 'volatile fission products':'volatile fission products','poor metals':'Poor metals'}
-        #
-        if series == 'fission products':
-           nuclides = [ x for x in nuclidesNames if SERIES[ ELEMENTS[x.split('-')[0].strip()].series ] != seriesNameMap['actinides'] ]
-        #
-        elif series == 'oxide fission products':
-           collec = [ seriesNameMap['actinides'],
-                      seriesNameMap['halogens'],
-                      seriesNameMap['noble gases']
-                    ]
-           nuclides = [ x for x in nuclidesNames if SERIES[ ELEMENTS[x.split('-')[0].strip()].series ] not in collec ]
-           collec = ['C','N','O','H']
-           nuclides = [ x for x in nuclides if x.split('-')[0].strip() not in collec ]
-        #
-        elif series == 'volatile fission products':
-           collec = [ seriesNameMap['actinides'],
-                      seriesNameMap['alkali metals'],
-                      seriesNameMap['alkali earth metals'],
-                      seriesNameMap['lanthanides'],
-                      seriesNameMap['metalloids'],
-                      seriesNameMap['transition metals'],
-                      seriesNameMap['poor metals']
-                    ]
-           nuclides = [ x for x in nuclidesNames if SERIES[ ELEMENTS[x.split('-')[0].strip()].series ] not in collec ]
-           collec = ['C','O']
-           nuclides = [ x for x in nuclides if x.split('-')[0].strip() not in collec ]
-        #
-        elif series == 'minor actinides':
-           nuclides = [ x for x in nuclidesNames if SERIES[ ELEMENTS[x.split('-')[0].strip()].series ] == seriesNameMap['actinides'] ]
-           collec = ['U','Pu']
-           nuclides = [ x for x in nuclides if x.split('-')[0].strip() not in collec ]
-        #
-        else:
-           nuclides = [ x for x in nuclidesNames if SERIES[ ELEMENTS[x.split('-')[0].strip()].series ]== seriesNameMap[series] ]
-
-        return nuclides
+        rows = np.flatnonzero( __GetSeriesMask( self, index, series ) )
+        return [ index['names'][row] for row in rows ]
 
      if series is None:
 
-        nuclidesNames = self.propertyDensities.index
-        return list( nuclidesNames )
+        return list( index['names'] )
 
 #.................................................................................
-# mass or mass concentration
+# property density
 
-  if attributeName == 'massCC': 
-     colName = 'Mass CC [g/cc]'
+  return _GetAttributes( self, [attributeName], symbol, series )[attributeName]
 
-#.................................................................................
-# radioactivity               
+#---------------------------------------------------------------------------------
+# Get property densities (see _ColumnNames) in one pass, either overall or on a 
+# nuclide or series basis; returns a dictionary of attribute name to value
 
-  if attributeName == 'radioactivityDens': 
-     colName = 'Radioactivity Dens. [Ci/cc]'
+def _GetAttributes(self, attributeNames=None, symbol=None, series=None ):
 
-#.................................................................................
-# thermal                     
+  if attributeNames is None: 
+     attributeNames = [ name for name in self.attributeNames if name in _ColumnNames ]
 
-  if attributeName == 'thermalDens' or  attributeName == 'heatDens': 
-     colName = 'Thermal Dens. [W/cc]'
+  for attributeName in attributeNames:
+     assert attributeName in _ColumnNames, ' attribute name: %r; options: %r; fail.' % (attributeName,list(_ColumnNames.keys()))
 
-#.................................................................................
-# gamma                       
+  if symbol is not None: assert series is None, 'fail.'
+  if series is not None: assert symbol is None, 'fail.'
 
-  if attributeName == 'gammaDens': 
-     colName = 'Gamma Dens. [W/cc]'
+  index = _GetNuclidesIndex( self )
 
-#.................................................................................
-##################################################################################
-#.................................................................................
+  colNames = [ _ColumnNames[name] for name in attributeNames ]
+  values   = self.propertyDensities[ colNames ].to_numpy( dtype=np.float64 )
 
 #.................................................................................
 # all nuclide content added
 
   if symbol is None and series is None:
-
-     density = 0.0
-     density = self.propertyDensities[ colName ].sum()
-     return float(density) # avoid numpy.float64 type
+     densities = values.sum( axis=0 )
 
 #.................................................................................
 # get chemical element series
 
-  if series is not None:
- 
-     density = 0.0
-
-     assert series in self.chemicalElementSeries, 'series: %r; fail.'%(series)
-
-     seriesNameMap = {'alkali metals':'Alkali metals', 'alkali earth metals':'Alkaline earth metals', 'lanthanides':'Lanthanides', 'actinides':'Actinides', 'transition metals':'Transition metals','noble gases':'Noble gases','metalloids':'Metalloids','fission products':'fission products','nonmetals':'Nonmetals','oxide fission products':'oxide fission products','halogens':'Halogens', 'minor actinides':'minor actnides', 'volatile fission products':'volatile fission products','poor metals':'Poor metals'}
-
-     if series in self.chemicalElementSeries:
-
-       nuclidesNames = self.propertyDensities.index
-       #
-       if series == 'fission products':
-          nuclides = [ x for x in nuclidesNames if SERIES[ ELEMENTS[x.split('-')[0].strip()].series ] != seriesNameMap['actinides'] ]
-       #
-       elif series == 'oxide fission products':
-          collec = [ seriesNameMap['actinides'],
-                     seriesNameMap['halogens'],
-                     seriesNameMap['noble gases']
-                   ]
-          nuclides = [ x for x in nuclidesNames if SERIES[ ELEMENTS[x.split('-')[0].strip()].series ] not in collec ]
-          collec = ['C','N','O','H']
-          nuclides = [ x for x in nuclides if x.split('-')[0].strip() not in collec ]
-        #
-       elif series == 'volatile fission products':
-          collec = [ seriesNameMap['actinides'],
-                     seriesNameMap['alkali metals'],
-                     seriesNameMap['alkali earth metals'],
-                     seriesNameMap['lanthanides'],
-                     seriesNameMap['metalloids'],
-                     seriesNameMap['transition metals'],
-                     seriesNameMap['poor metals']
-                    ]
-          nuclides = [ x for x in nuclidesNames if SERIES[ ELEMENTS[x.split('-')[0].strip()].series ] not in collec ]
-          collec = ['C','O']
-          nuclides = [ x for x in nuclides if x.split('-')[0].strip() not in collec ]
-       #
-       elif series == 'minor actinides':
-          nuclides = [ x for x in nuclidesNames if SERIES[ ELEMENTS[x.split('-')[0].strip()].series ] == seriesNameMap['actinides'] ]
-          collec = ['U','Pu']
-          nuclides = [ x for x in nuclides if x.split('-')[0].strip() not in collec ]
-       #
-       else:
-          nuclides = [ x for x in nuclidesNames if SERIES[ ELEMENTS[x.split('-')[0].strip()].series ]== seriesNameMap[series] ]
-
-#       print('fission products ',nuclides)
-
-       for nuclide in nuclides:
-         density += self.propertyDensities.loc[nuclide,colName]
-
-     return float(density) # avoid numpy.float64 type
-   
+  elif series is not None:
+     densities = values[ __GetSeriesMask( self, index, series ) ].sum( axis=0 )
+
 #.................................................................................
 # get specific nuclide (either the isotopes of the nuclide or the specific isotope) property
 
-  if symbol is not None:
-
-    density = 0.0
-
   # single isotope
-    if len(symbol.split('-')) == 2:
-      density = self.propertyDensities.loc[symbol,colName]
+  elif len(symbol.split('-')) == 2:
+     assert symbol in index['rows'], 'nuclide: %r; fail.'%(symbol)
+     densities = values[ index['rows'][symbol] ]
 
   # many isotopes         
-    else:
-      nuclidesNames = self.propertyDensities.index
-#    print(self.propertyDensities)
-      isotopes = [x for x in nuclidesNames if x.split('-')[0].strip()==symbol]
-#    print(isotopes)
-      for isotope in isotopes:
-        density += self.propertyDensities.loc[isotope,colName]
-
-    return float(density) # avoid numpy.float64.type
+  else:
+     densities = values[ index['isotopes'].get( symbol, list() ) ].sum( axis=0 )
+
+  # avoid numpy.float64 type
+  return { name:float(density) for (name,density) in zip( attributeNames, densities ) }
+
+#---------------------------------------------------------------------------------
+def __GetSeriesMask(self, index, series):
+
+  assert series in self.chemicalElementSeries, 'series: %r; fail.'%(series)
+
+  return index['series'][series]
 
 #*********************************************************************************
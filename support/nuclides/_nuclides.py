@@ -8,7 +8,8 @@ Sat May  9 21:40:48 EDT 2015 created; vfda
 
 #*******************************************************************************
 import os, sys
-import pandas
+from cortix.src.utils.lazyimport import lazy_import
+pandas = lazy_import('pandas')
 #*******************************************************************************
 
 #*******************************************************************************
@@ -16,6 +17,8 @@ import pandas
 
 def _Nuclides( self, propertyDensities ):
 
+  if propertyDensities is None: propertyDensities = pandas.DataFrame()
+
   assert type(propertyDensities) == type(pandas.DataFrame()), 'fatal.'
 
   self.attributeNames = \
@@ -28,4 +31,8 @@ def _Nuclides( self, propertyDensities ):
 
   self.propertyDensities = propertyDensities; 
 
+  # nuclide, element and series rows of the table; built on first query
+  # (see _GetNuclidesIndex)
+  self._nuclidesIndex = None
+
 #*******************************************************************************
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+Nuclides container index: the row of every nuclide, the row positions of the
+isotopes of every element, and a boolean row mask for every chemical element
+series (see chemicalElementSeries), built once from the index of the
+propertyDensities table. The index is rebuilt if the table gets a new index
+(e.g. the table is replaced or nuclides are added).
+
+VFdALib support classes
+"""
+#*********************************************************************************
+import numpy as np
+
+from cortix.support.periodictable import ELEMENTS
+from cortix.support.periodictable import SERIES
+#*********************************************************************************
+
+# series name (as in chemicalElementSeries) -> periodic table SERIES name
+_SeriesNameMap = {'alkali metals':'Alkali metals', 'alkali earth metals':'Alkaline earth metals', 'lanthanides':'Lanthanides', 'actinides':'Actinides', 'transition metals':'Transition metals','noble gases':'Noble gases','metalloids':'Metalloids','nonmetals':'Nonmetals','halogens':'Halogens','poor metals':'Poor metals'}
+
+#---------------------------------------------------------------------------------
+def _GetNuclidesIndex(self):
+
+  index = self._nuclidesIndex
+
+  if index is None or index['index'] is not self.propertyDensities.index:
+     index = __BuildIndex( self )
+     self._nuclidesIndex = index
+
+  return index
+
+#---------------------------------------------------------------------------------
+def __BuildIndex(self):
+
+  names = list( self.propertyDensities.index )
+
+  symbols = [ x.split('-')[0].strip() for x in names ]
+  seriesNames = [ SERIES[ELEMENTS[s].series] if s in ELEMENTS else None for s in symbols ]
+
+  index = dict()
+  index['index'] = self.propertyDensities.index
+  index['names'] = names
+  index['rows']  = { name:row for (row,name) in enumerate(names) }
+
+  isotopes = dict() # element symbol -> rows
+  for (row,symbol) in enumerate(symbols):
+      isotopes.setdefault( symbol, list() ).append(row)
+  index['isotopes'] = { s:np.array(rows,dtype=np.intp) for (s,rows) in isotopes.items() }
+
+  symbols     = np.array( symbols, dtype=object )
+  seriesNames = np.array( seriesNames, dtype=object )
+
+  masks = dict()
+  for (series,seriesName) in _SeriesNameMap.items():
+      masks[series] = seriesNames == seriesName
+
+  actinides = masks['actinides']
+
+  masks['fission products'] = ~actinides
+
+  masks['oxide fission products'] = ~( actinides | masks['halogens'] | masks['noble gases'] | \
+                                       np.isin( symbols, ['C','N','O','H'] ) )
+
+  masks['volatile fission products'] = ~( actinides | masks['alkali metals'] | \
+                                          masks['alkali earth metals'] | masks['lanthanides'] | \
+                                          masks['metalloids'] | masks['transition metals'] | \
+                                          masks['poor metals'] | np.isin( symbols, ['C','O'] ) )
+
+  masks['minor actinides'] = actinides & ~np.isin( symbols, ['U','Pu'] )
+
+  index['series'] = masks
+
+  return index
+
+#*********************************************************************************
@@ -14,17 +14,19 @@ Sat Jun 27 14:46:49 EDT 2015
 
 #*******************************************************************************
 import os, sys
-import pandas
+from cortix.src.utils.lazyimport import lazy_import
+pandas = lazy_import('pandas')
 
 from ._nuclides  import _Nuclides      # constructor
 from ._getattribute import _GetAttribute  
+from ._getattribute import _GetAttributes
 #*******************************************************************************
 
 #*******************************************************************************
 class Nuclides():
 
  def __init__( self, 
-               propertyDensities = pandas.DataFrame()
+               propertyDensities = None # pandas.DataFrame
              ):
 
   # constructor
@@ -42,6 +44,11 @@ class Nuclides():
  def GetAttribute(self, name, symbol=None, series=None):
      return _GetAttribute( self, name, symbol, series )
 
+ # all (or the given) property densities for a nuclide, element or series in one
+ # pass; a dictionary of attribute name to value
+ def GetAttributes(self, names=None, symbol=None, series=None):
+     return _GetAttributes( self, names, symbol, series )
+
 #*******************************************************************************
 # Printing of data members
 # def __str__( self ):
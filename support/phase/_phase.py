@@ -9,11 +9,11 @@ Sat Sep  5 13:44:19 EDT 2015
 """
 #*******************************************************************************
 import os, sys
-import pandas
-from copy import deepcopy
+from copy import copy
 
 from ..specie.interface   import Specie
 from ..quantity import Quantity
+from ..history  import History
 #*******************************************************************************
 
 #*******************************************************************************
@@ -38,8 +38,15 @@ def _Phase( self, timeStamp=None, species=None, quantities=None, value=0.0 ):
   assert type(value) == type(float())
 
 # List of species and quantities objects; columns of data frame are named by objects
-  self._species    = deepcopy(species)       # a new object held by a Phase() object
-  self._quantities = deepcopy(quantities)    # a new object held by a Phase() object
+# (shallow copies: the parsed formula data of a specie is shared, see Specie)
+  self._species    = None
+  self._quantities = None
+  if species is not None:
+     self._species = [ copy(specie) for specie in species ]   # new objects held by a Phase() object
+  if quantities is not None:
+     self._quantities = [ copy(quant) for quant in quantities ] # new objects held by a Phase() object
+
+  self._sharedActors = False # species and quantities shared with a copy (see Copy())
 
   names = list()
 
@@ -53,11 +60,9 @@ def _Phase( self, timeStamp=None, species=None, quantities=None, value=0.0 ):
          names.append(quant.name)
          quant.value = value       # value in quant is overriden here on local copy
 
-# Table data phase 
-  self._phase = pandas.DataFrame( index=[timeStamp], columns = names )
-  self._phase.fillna( float(value), inplace = True )
-  
- 
+# Table data phase (columnar history; see History)
+  self._phase = History( timeStamp, names, value )
+
   return
 
 #*******************************************************************************
@@ -14,9 +14,16 @@ no point in the history. This needs to be removed in the future.
 
 To obtain history values, associated to the phase, at a particular point in time, 
 use the GetValue() method to access the history data frame (pandas) via columns and 
-rows. The corresponding values in species and quantities are OVERRIDEN and NOT to
+rows. The history is a NumPy-backed History table; a pandas data frame of it is
+built only on request (GetDataFrame(), WriteHTML()). The corresponding values in species and quantities are OVERRIDEN and NOT to
 be used through the phase interface.
 
+Copy() (also used by copy.deepcopy()) is copy-on-write: the copy shares the
+history table and the species and quantities objects with the original; the
+history is copied when either one changes an existing row (appends are not), and
+the species and quantities lists are copied when either one hands them out
+(GetSpecie(), GetSpecies(), ...) or adds to them.
+
 VFdALib support classes 
 
 Sat Sep  5 01:26:53 EDT 2015
@@ -24,8 +31,8 @@ Sat Sep  5 01:26:53 EDT 2015
 
 #*******************************************************************************
 import os, sys
+from copy import copy, deepcopy
 from ._phase  import _Phase
-import pandas
 
 from ..specie.interface import Specie
 from ..quantity import Quantity
@@ -55,33 +62,42 @@ class Phase():
 # passed into/out of the function are immutable.
 
  def GetActors(self): 
-     return list(self._phase.columns)  # return all names in order
+     return self._phase.GetColumns()  # return all names in order
 
  def GetTimeStamps(self): 
-     return list(self._phase.index)  # return all time stamps 
+     return self._phase.GetTimeStamps()  # return all time stamps 
  timeStamps = property(GetTimeStamps,None,None,None)
 
+ # pandas data frame of the history (a copy; built on each call)
+ def GetDataFrame(self):
+     return self._phase.GetDataFrame()
+
  def GetSpecie(self, name):
+     self.__OwnActors()
      for specie in self._species:
          if specie.name == name:
             return specie
      return None 
 
  def GetSpecies(self):
+     self.__OwnActors()
      return self._species
  species = property(GetSpecies,None,None,None)
 
  def GetQuantities(self):
+     self.__OwnActors()
      return self._quantities
  quantities = property(GetQuantities,None,None,None)
 
  def SetSpecieId(self, name, val):
+     self.__OwnActors()
      for specie in self._species:
          if specie.name == name:
             specie.flag = val
             return 
 
  def GetQuantity(self, name):
+     self.__OwnActors()
      for quant in self._quantities:
          if quant.name == name:
             return quant
@@ -89,110 +105,70 @@ class Phase():
 
  def AddSpecie(self, newSpecie):
      assert type(newSpecie) == type(Specie())
-     assert newSpecie.name not in list(self._phase.columns), 'quantity: %r exists. Current names: %r'%(newQuant,self._phase.columns)
+     assert not self._phase.HasColumn(newSpecie.name), 'specie: %r exists. Current names: %r'%(newSpecie,self._phase.GetColumns())
      speciesFormulae = [ specie.formulaName for specie in self._species ]
      assert newSpecie.formulaName not in speciesFormulae
+     self.__OwnActors()
      self._species.append( newSpecie )
-     newName = newSpecie.name
-     col = pandas.DataFrame( index=list(self._phase.index), columns=[newName] )
-     tmp = self._phase
-     df = tmp.join( col, how='outer' )
-     self._phase = df.fillna(0.0)
+     self._phase.AddColumn( newSpecie.name, 0.0 )
 
  def AddQuantity(self, newQuant):
      assert type(newQuant) == type(Quantity())
-     assert newQuant.name not in list(self._phase.columns), 'quantity: %r exists. Current names: %r'%(newQuant,self._phase.columns)
+     assert not self._phase.HasColumn(newQuant.name), 'quantity: %r exists. Current names: %r'%(newQuant,self._phase.GetColumns())
      quantFormalNames = [ quant.formalName for quant in self._quantities ]
      assert newQuant.formalName not in quantFormalNames
+     self.__OwnActors()
      self._quantities.append( newQuant )
-     newName = newQuant.name
-     col = pandas.DataFrame( index=list(self._phase.index), columns=[newName] )
-     tmp = self._phase
-     df = tmp.join( col, how='outer' )
-     self._phase = df.fillna(0.0)
+     self._phase.AddColumn( newQuant.name, 0.0 )
 
  def AddRow(self, timeStamp, rowValues):
-
-     assert timeStamp not in self._phase.index
-
-     assert len(rowValues) == len(self._phase.columns)
-     tmp = dict()
-     for (i,v) in zip( self._phase.columns, rowValues ): 
-         tmp[i] = float(v)
-     row = pandas.DataFrame( tmp, index=[timeStamp], columns=list(self._phase.columns) )
-     frames = [self._phase, row]
-     self._phase = pandas.concat( frames )
+     self._phase.AddRow( timeStamp, rowValues )
      return
 
  def GetRow(self, timeStamp=None):
-     if timeStamp is None:
-        timeStamp = self._phase.index[-1]
-     else:
-        assert timeStamp in self._phase.index, 'no timeStamp = %r'%(timeStamp)
-     return list(self._phase.loc[timeStamp,:])
+     return self._phase.GetRow( timeStamp )
 
  def GetColumn(self, actor):
-     assert actor in self._phase.columns
-     return list(self._phase.loc[:,actor])
+     return self._phase.GetColumn( actor )
 
  def ScaleRow(self, timeStamp, value):
-     assert timeStamp in self._phase.index
-     self._phase.loc[timeStamp,:] *= float(value)
+     self._phase.ScaleRow( timeStamp, value )
      return
 
  # set species and quantities of history to a given value (default to zero value)
  # all time stamps are preserved
  def ClearHistory(self, value=0.0):
-     self._phase.loc[:,:] = float(value)
+     self._phase.Fill( value )
      return
 
  # set species and quantities of history to a given value (default to zero value)
  # only one time stamp is preserved (default to last time stamp)
  def ResetHistory(self, timeStamp=None, value=None):
-     if timeStamp is None:
-        values = self.GetRow()
-        timeStamp = self._phase.index[-1]
-     else:
-        values = self.GetRow(timeStamp)
-
-     columns = list( self._phase.columns )
-     assert len(columns) == len(values),'FATAL: oops internal error.'
-
-     self._phase = pandas.DataFrame( index=[timeStamp], columns = columns )
-     self._phase.fillna( 0.0, inplace=True )
-  
-     if value is None:
-        for v in values:
-          idx = values.index(v)
-          self._phase.loc[timeStamp,columns[idx]] = v
-     else:
-        self._phase.loc[timeStamp,:] = float(value)
-
+     self._phase.Reset( timeStamp, value )
      return
 
  def GetValue(self, actor, timeStamp=None):
-     if timeStamp is None:
-        timeStamp = self._phase.index[-1]
-     else:
-        assert timeStamp in self._phase.index
-     assert actor in self._phase.columns
-     return self._phase.loc[timeStamp,actor]
+     return self._phase.GetValue( actor, timeStamp )
+
+ # values (NumPy array) of actors (default all) at a time stamp (default last)
+ def GetValues(self, actors=None, timeStamp=None):
+     return self._phase.GetValues( actors, timeStamp )
+
+ # set values (sequence in actors order, or a scalar) of actors (default all)
+ def SetValues(self, actors=None, values=0.0, timeStamp=None):
+     self._phase.SetValues( actors, values, timeStamp )
+     return
 
 #old def SetValue(self, timeStamp, actor, value):
 #new
  def SetValue(self, actor, value, timeStamp=None):
-     if timeStamp is None:
-        timeStamp = self._phase.index[-1]
-     else:
-        assert timeStamp in self._phase.index, 'missing timeStamp = %r'%(timeStamp)
      assert type(actor) == type(str())
-     assert actor in self._phase.columns
-     self._phase.loc[timeStamp,actor] = float(value)
+     self._phase.SetValue( actor, value, timeStamp )
      return
 
  def WriteHTML( self, fileName ):
      assert type(fileName) == type(str())
-     tmp = pandas.DataFrame(self._phase)
+     tmp = self._phase.GetDataFrame()
      columnNames = tmp.columns
      speciesNames = [ specie.name for specie in self._species ]
      quantityNames = [ quantity.name for quantity in self._quantities ]
@@ -208,13 +184,46 @@ class Phase():
          else: assert False,'oops fatal.'
      tmp.to_html( fileName )
 
+ # copy-on-write snapshot (O(1)); see the module notes
+ def Copy(self):
+     other = Phase.__new__( Phase )
+     other.__dict__.update( self.__dict__ )
+     other._phase = self._phase.Copy()
+     self._sharedActors  = True
+     other._sharedActors = True
+     return other
+
+ def __deepcopy__(self, memo):
+     return self.Copy()
+
+#*******************************************************************************
+# Internal helpers
+
+ # private copies of the species and quantities objects; a Specie holds
+ # floats and an atoms list its setter replaces, while the value of a Quantity
+ # may be any object (e.g. an array changed in place), so it is copied too
+ def __OwnActors(self):
+     if not self._sharedActors:
+        return
+     if self._species is not None:
+        self._species = [ copy(specie) for specie in self._species ]
+     if self._quantities is not None:
+        self._quantities = [ self.__CopyQuantity(quant) for quant in self._quantities ]
+     self._sharedActors = False
+     return
+
+ def __CopyQuantity(self, quant):
+     quant = copy(quant)
+     quant.value = deepcopy(quant.value)
+     return quant
+
 #*******************************************************************************
 # Printing of data members
-# def __str__( self ):
+ def __str__( self ):
      s = '\n\t **Phase()**: \n\t *quantities*: %s\n\t *species*: %s\n\t *history* #timeStamps=%s\n\t *history end* @%s\n%s'
-     return s % (self._quantities, self._species, len(self._phase.index), self._phase.index[-1], self._phase.loc[self._phase.index[-1],:])
+     return s % (self._quantities, self._species, len(self._phase), self._phase.GetLastTimeStamp(), self._phase.GetRow())
 #
  def __repr__( self ):
      s = '\n\t **Phase()**: \n\t *quantities*: %s\n\t *species*: %s\n\t *history* #timeStamps=%s\n\t *history end* @%s\n%s'
-     return s % (self._quantities, self._species, len(self._phase.index), self._phase.index[-1], self._phase.loc[self._phase.index[-1],:])
+     return s % (self._quantities, self._species, len(self._phase), self._phase.GetLastTimeStamp(), self._phase.GetRow())
 #*******************************************************************************
@@ -0,0 +1,151 @@
+"""
+Formula registry of the Specie class: process-wide memo of the parsed atoms lists
+(formulas). A formula is parsed, validated against the periodic table and its
+molar mass computed once; Specie objects with the same formula share the same
+immutable FormulaData. The registry holds the most recently used formulas
+(least recently used ones are evicted).
+"""
+
+#*******************************************************************************
+import functools
+from collections import namedtuple
+
+from ..periodictable import ELEMENTS
+#*******************************************************************************
+
+_RegistrySize = 4096 # number of formulas held
+
+# nuclides: tuple of (multiplier, nuclide) for every atoms entry, in order
+FormulaData = namedtuple( 'FormulaData', ['molarMass','nAtoms','nNuclideTypes','nuclides'] )
+
+#*******************************************************************************
+# formula data of an atoms list; atoms entries in the format 3.2*O-18, or 3*O or
+# O or O-16 (whitespace around the nuclide is ignored)
+
+def _GetFormulaData( atoms ):
+
+ return __ParseFormula( tuple(atoms) )
+
+#*******************************************************************************
+# atoms list in decreasing order of multiplier with multipliers in scientific
+# notation (a new list)
+
+def _GetReorderedFormula( atoms ):
+
+ return list( __ReorderFormula( tuple(atoms) ) )
+
+#*******************************************************************************
+# number of formulas held and cache statistics
+
+def _GetRegistryInfo():
+
+ return __ParseFormula.cache_info()
+
+#*******************************************************************************
+@functools.lru_cache( maxsize=_RegistrySize )
+def __ParseFormula( atoms ):
+
+ for entry in atoms:
+     assert type(entry) == type(str()), 'oops'
+     tmp = entry.split('*')
+     nuclide = tmp[-1].strip()
+     element = nuclide.split('-')[0]
+     assert element in ELEMENTS, 'element = %r'%(element)
+
+ nuclides = list()
+ nuclideTypes = set()
+
+ nAtoms = 0
+ summ = 0.0
+ for entry in atoms:
+   # format example:  3.2*O-18, or 3*O or O or O-16
+   tmp = entry.split('*')
+   multiple  = 1.0
+   # single nuclide
+   if len(tmp) == 1:
+      nuclide = tmp[0].strip()
+   # multiple nuclide
+   elif len(tmp) == 2:
+      multiple = float(tmp[0])
+      nuclide = tmp[1].strip()
+   else:
+    assert False
+
+   nuclides.append( (multiple,nuclide) )
+   nuclideTypes.add( nuclide )
+   nAtoms += multiple
+
+   try:
+     tmp = nuclide.split('-')
+     if len(tmp) == 1:
+        element = ELEMENTS[tmp[0]]
+        molarMass = element.exactmass # from isotopic composition
+        if molarMass == 0.0: molarMass = element.mass
+     elif len(tmp) == 2:
+        element = ELEMENTS[tmp[0]].isotopes[int(tmp[1].strip('m'))]
+        molarMass = element.mass
+     else:
+        assert False
+   except KeyError:
+     summ += multiple * 0.0
+   else:
+     summ += multiple * molarMass
+
+ return FormulaData( summ, nAtoms, len(nuclideTypes), tuple(nuclides) )
+
+#*******************************************************************************
+@functools.lru_cache( maxsize=_RegistrySize )
+def __ReorderFormula( atoms ):
+
+ atoms1 = list(atoms)
+
+ if len(atoms) <= 1: return tuple(atoms1)
+
+ # save the multiplier value as a string type of scientific notation
+ for entry in atoms:
+
+   assert type(entry) == type(str()), 'oops'
+
+   # format example:  3.2*O-18, or 3*O or O or O-16
+   tmp = entry.split('*')
+
+   multiplier = 0.0
+
+   if len(tmp) == 1:
+      continue
+   elif len(tmp) == 2:
+      multiplier = float(tmp[0])
+   else:
+      assert False
+
+   assert multiplier != 0.0, 'multiplier = %r'%(multiplier)
+
+   multiplier = '{0:9.3e}'.format( multiplier )
+
+   atoms1[ atoms.index( entry ) ] = multiplier+'*'+tmp[1]
+
+ # order in decreasing order of multiplier magnitude
+ multipliers_lst = list()
+
+ for entry in atoms1:
+
+   tmp = entry.split('*')
+
+   multiplier = 0.0
+
+   if len(tmp) == 1:
+      continue
+   elif len(tmp) == 2:
+      multiplier = float(tmp[0])
+   else:
+      assert False
+
+   multipliers_lst.append( float( multiplier ) )
+
+ sortedAtoms_lst = [ a for (i,a) in sorted( zip(multipliers_lst,atoms1),
+                                            key=lambda pair: pair[0],
+                                            reverse=True ) ]
+
+ return tuple(sortedAtoms_lst)
+
+#*******************************************************************************
@@ -9,66 +9,22 @@ Sun Sep 20 17:00:09 EDT 2015
 #*******************************************************************************
 import os, sys
 
-from ..periodictable import ELEMENTS
+from ._formularegistry import _GetFormulaData
 #*******************************************************************************
 
 #*******************************************************************************
+# formula data is parsed once per formula and shared (see _formularegistry)
+
 def _UpdateMolarMass( self ):
 
  if len(self._atoms) == 0: return
 
- for entry in self._atoms:
-     assert type(entry) == type(str()), 'oops'
-     tmp = entry.split('*')
-     nuclide = tmp[-1]
-     element = nuclide.split('-')[0]
-     assert element in ELEMENTS, 'element = %r'%(element)
-
- self._nAtoms        = 0
- self._nNuclideTypes = 0
-
- nuclides = dict()
-
- nAtoms = 0
- summ = 0.0
- for entry in self._atoms:
-   assert type(entry) == type(str()), 'oops'
-   # format example:  3.2*O-18, or 3*O or O or O-16
-   tmp = entry.split('*')
-   multiple  = 1.0
-   # single nuclide    
-   if len(tmp) == 1: 
-      nuclide = tmp[0]
-   # multiple nuclide
-   elif len(tmp) == 2: 
-      multiple = float(tmp[0])
-      nuclide = tmp[1]
-   else:
-    assert False
-
-   nuclides[ nuclide ] = multiple
-   nAtoms += multiple
-
-   try: 
-     tmp = nuclide.split('-')
-     if len(tmp) == 1:
-        element = ELEMENTS[tmp[0]]
-        molarMass = element.exactmass # from isotopic composition
-        if molarMass == 0.0: molarMass = element.mass
-     elif len(tmp) == 2:
-        element = ELEMENTS[tmp[0]].isotopes[int(tmp[1].strip('m'))]
-        molarMass = element.mass
-     else:
-        assert False
-   except KeyError:
-     summ += multiple * 0.0
-   else:
-     summ += multiple * molarMass    
+ formulaData = _GetFormulaData( self._atoms )
 
- self._molarMass = summ
-#   print( summ )
- self._nAtoms        = nAtoms
- self._nNuclideTypes = len(nuclides)
+ self._formulaData   = formulaData
+ self._molarMass     = formulaData.molarMass
+ self._nAtoms        = formulaData.nAtoms
+ self._nNuclideTypes = formulaData.nNuclideTypes
 
  return
 
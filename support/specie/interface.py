@@ -228,6 +228,15 @@ class Specie():
      self._massCCUnit = v
  massCCUnit = property(GetMassCCUnit,SetMassCCUnit,None,None)
 
+ # shallow copy with its own atoms and radioactivity fractions lists; the parsed
+ # formula data (see _formularegistry) is immutable and shared
+ def __copy__(self):
+     other = Specie.__new__( Specie )
+     other.__dict__.update( self.__dict__ )
+     other._atoms = list(self._atoms)
+     other._molarRadioactivityFractions = list(self._molarRadioactivityFractions)
+     return other
+
 #*******************************************************************************
 # Internal helpers 
 
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+"""
+SpeciesMatrix container: the compiled form of a list of Specie objects. The atoms
+lists are parsed once into a (species x nuclide) stoichiometry matrix (entry: the
+multiplier of the nuclide in the species formula) with the molar mass of every
+nuclide column, and masks of the columns of each chemical element and series.
+Totals over the species (e.g. heat power density) and nuclide, element or series
+mass concentrations are then NumPy dot products with the current species property
+vectors (molarCC, massCC, ...), which are read from the Specie objects on each
+call since they change during a simulation.
+
+A SpeciesMatrix stays valid for a species list while the list holds the same
+Specie objects with the same atoms lists (see Matches()).
+
+VFdALib support classes
+"""
+
+#*******************************************************************************
+import numpy as np
+from .periodictable import ELEMENTS
+from .periodictable import SERIES
+from .specie._formularegistry import _GetFormulaData
+#*******************************************************************************
+
+#*******************************************************************************
+class SpeciesMatrix():
+
+ def __init__( self, species = None ):
+
+     if species is None:
+        species = list()
+
+     self._species  = list(species)
+     self._key      = self.__GetKey( self._species )
+
+     self._nuclides = list()   # nuclide column names, e.g. 'U-235' or 'O'
+     nucIndex       = dict()   # nuclide name -> column
+     entries        = list()   # (species row, nuclide column, multiplier)
+
+     for (row,spc) in enumerate(self._species):
+         for (multiplier,nuclide) in _GetFormulaData( spc.atoms ).nuclides:
+             if nuclide not in nucIndex:
+                nucIndex[nuclide] = len(self._nuclides)
+                self._nuclides.append(nuclide)
+             entries.append( (row,nucIndex[nuclide],multiplier) )
+
+     self._nucIndex = nucIndex
+
+     # repeated items of a formula add up
+     self._stoichiometry = np.zeros( (len(self._species),len(self._nuclides)) )
+     for (row,col,multiplier) in entries:
+         self._stoichiometry[row,col] += multiplier
+
+     self._molarMasses = np.array( [ self.__GetMolarMass(nuc) for nuc in self._nuclides ],
+                                   dtype=np.float64 )
+
+     symbols = [ nuc.split('-')[0] for nuc in self._nuclides ]
+     self._elementMasks = dict()
+     for symbol in set(symbols):
+         self._elementMasks[symbol] = np.array( [ s == symbol for s in symbols ], dtype=bool )
+
+     self._seriesMasks = dict()   # lower case series name -> mask
+     seriesIds = [ ELEMENTS[s].series for s in symbols ]
+     for (seriesId,seriesName) in SERIES.items():
+         self._seriesMasks[seriesName.lower()] = np.array( [ i == seriesId for i in seriesIds ], dtype=bool )
+
+     return
+#*******************************************************************************
+
+#*******************************************************************************
+# Setters and Getters methods
+
+ # true if built from this very species list (same objects and atoms lists)
+ def Matches(self, species):
+     return self.__GetKey( species ) == self._key
+
+ def GetNuclides(self):
+     return list(self._nuclides)
+
+ def GetStoichiometry(self):
+     return self._stoichiometry
+
+ def GetMolarMasses(self):
+     return self._molarMasses
+
+ # current values of a Specie attribute (e.g. 'molarCC') as a species vector
+ def GetVector(self, attributeName):
+     return np.fromiter( (getattr(spc,attributeName) for spc in self._species),
+                         dtype=np.float64, count=len(self._species) )
+
+ # sum over species of the product of two attributes, e.g. molarHeatPwr*molarCC
+ def GetTotal(self, attributeName, weightName=None):
+     vector = self.GetVector( attributeName )
+     if weightName is None:
+        return float( vector.sum() )
+     return float( np.dot( vector, self.GetVector(weightName) ) )
+
+ # mass concentration of every nuclide column (same order as GetNuclides())
+ def GetNuclideMassCCs(self):
+     molarCCs = np.dot( self.GetVector('molarCC'), self._stoichiometry )
+     return molarCCs * self._molarMasses
+
+ # mass concentration of a nuclide ('U-235'), an element ('U') or a series
+ def GetMassCC(self, nuclide=None, series=None):
+     coefficients = self.GetMassCoefficients( nuclide, series )
+     return float( np.dot( self.GetVector('molarCC'), coefficients ) )
+
+ # mass of a nuclide ('U-235'), an element ('U') or a series per mole of each
+ # species (a species vector)
+ def GetMassCoefficients(self, nuclide=None, series=None):
+     assert (nuclide is None) != (series is None), 'give either nuclide or series.'
+     if nuclide is not None:
+        nuclide = nuclide.strip()
+        if len(nuclide.split('-')) == 2:
+           col = self._nucIndex.get(nuclide)
+           if col is None: return np.zeros( len(self._species) )
+           return self._stoichiometry[:,col] * self._molarMasses[col]
+        assert len(nuclide.split('-')) == 1, 'nuclide %r invalid.'%(nuclide)
+        mask = self._elementMasks.get(nuclide)
+     else:
+        assert series.lower() in self._seriesMasks, 'series %r; options: %r'%(series,list(SERIES.values()))
+        mask = self._seriesMasks[series.lower()]
+     if mask is None: return np.zeros( len(self._species) )
+     return np.dot( self._stoichiometry[:,mask], self._molarMasses[mask] )
+
+#*******************************************************************************
+# Internal helpers
+
+ def __GetKey(self, species):
+     return tuple( (id(spc),id(spc.atoms)) for spc in species )
+
+ def __GetMolarMass(self, nuclide):
+     tmp = nuclide.split('-')
+     element = ELEMENTS[tmp[0]]
+     if len(tmp) == 2:
+        return element.isotopes[int(tmp[1].strip('m'))].mass
+     molarMass = element.exactmass # from isotopic composition
+     if molarMass == 0.0: molarMass = element.mass
+     return molarMass
+
+#*******************************************************************************
+# Printing of data members
+ def __str__( self ):
+     s = '\n\t **SpeciesMatrix()**: #species=%s; nuclides=%s'
+     return s % (len(self._species), self._nuclides)
+
+ def __repr__( self ):
+     return self.__str__()
+#*******************************************************************************
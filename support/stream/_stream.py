@@ -10,10 +10,10 @@ Sat Aug 15 17:24:18 EDT 2015
 
 #*******************************************************************************
 import os, sys
-import pandas
 
 from ..specie.interface   import Specie
-from ..quantity.interface import Quantity
+from ..quantity import Quantity
+from ..history  import History
 #*******************************************************************************
 
 #*******************************************************************************
@@ -50,16 +50,14 @@ def _Stream( self, timeStamp, species=None, quantities=None, values=0.0 ):
       names.append(quant.name)
 
 # ORDERED data; caution!!
-# Table data stream 
-  self.stream = pandas.DataFrame( index=[timeStamp], columns = names )
+# Table data stream (one row; see History)
   if type(values) == type(float()): 
-     self.stream.fillna( values, inplace = True )
+     self.stream = History( timeStamp, names, values )
   else:
-     self.stream.fillna( 0.0, inplace = True )
+     self.stream = History( timeStamp, names, 0.0 )
 
   if type(values) == type(list()) and len(values) == len(names):
-     for (name,val) in zip( names, values):
-         self.stream.loc[timeStamp,name] = val
+     self.stream.SetValues( None, values )
    
   return
 
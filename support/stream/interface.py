@@ -12,7 +12,6 @@ Sat Aug 15 17:24:02 EDT 2015
 #*******************************************************************************
 import os, sys
 from ._stream  import _Stream
-import pandas
 #*******************************************************************************
 
 #*******************************************************************************
@@ -42,7 +41,7 @@ class Stream():
      return self.timeStamp    
 
  def GetActors(self):
-     return list(self.stream.columns)
+     return self.stream.GetColumns()
 
  def GetSpecie(self, name):
      for specie in self.species:
@@ -70,32 +69,36 @@ class Stream():
 
  def GetRow(self, timeStamp=None):
      if timeStamp is None:
-        return list(self.stream.loc[self.timeStamp,:])
-     else:
-        assert timeStamp in self.stream.index, 'timeStamp = %r'%(timeStamp)
-        return list(self.stream.loc[timeStamp,:])
+        timeStamp = self.timeStamp
+     return self.stream.GetRow( timeStamp )
 
  def GetValue(self, actor, timeStamp=None):
-     assert actor in self.stream.columns
      if timeStamp is None:
-        return self.stream.loc[self.timeStamp,actor]
-     else:
-        assert timeStamp in self.stream.index
-        return self.stream.loc[timeStamp,actor]
+        timeStamp = self.timeStamp
+     return self.stream.GetValue( actor, timeStamp )
 
  def SetValue(self, actor, value=None, timeStamp=None):
-     assert actor in self.stream.columns
      if timeStamp is None:
-        if value is None:
-           self.stream.loc[self.timeStamp,actor] = float(0.0)
-        else:
-           self.stream.loc[self.timeStamp,actor] = float(value)
-     else:
-        assert timeStamp in self.stream.index, 'timeStamp = %r'%(timeStamp)
-        if value is None:
-           self.stream.loc[timeStamp,actor] = float(0.0)
-        else:
-           self.stream.loc[timeStamp,actor] = float(value)
+        timeStamp = self.timeStamp
+     if value is None:
+        value = 0.0
+     self.stream.SetValue( actor, value, timeStamp )
+
+ # values (NumPy array) of actors (default all) at a time stamp
+ def GetValues(self, actors=None, timeStamp=None):
+     if timeStamp is None:
+        timeStamp = self.timeStamp
+     return self.stream.GetValues( actors, timeStamp )
+
+ # set values (sequence in actors order, or a scalar) of actors (default all)
+ def SetValues(self, actors=None, values=0.0, timeStamp=None):
+     if timeStamp is None:
+        timeStamp = self.timeStamp
+     self.stream.SetValues( actors, values, timeStamp )
+
+ # pandas data frame of the stream (a copy; built on each call)
+ def GetDataFrame(self):
+     return self.stream.GetDataFrame()
 
 #*******************************************************************************
 # Printing of data members
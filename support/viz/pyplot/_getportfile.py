@@ -7,6 +7,9 @@ Tue Jun 24 01:03:45 EDT 2014
 """
 #*********************************************************************************
 import os, sys, io, time, datetime
+from cortix.src.memoryport import MemoryPort
+from cortix.src.mpiport import MPIPort
+from cortix.src.utils.filewatcher import FileWatcher
 #*********************************************************************************
 
 #---------------------------------------------------------------------------------
@@ -30,15 +33,24 @@ def _GetPortFile( self, usePortName=None, usePortFile=None, providePortName=None
 
     if portFile is None: return None
 
-    maxNTrials = 50
-    nTrials    = 0
-    while os.path.isfile(portFile) is False and nTrials <= maxNTrials:
-      nTrials += 1
-      time.sleep(0.1)
-
-    if nTrials >= 10:
-      s = '_GetPortFile(): waited ' + str(nTrials) + ' trials for port: ' + portFile
-      self.log.warn(s)
+    # memory and mpi ports need no file; the data is waited for when it is read
+    if isinstance(portFile, (MemoryPort, MPIPort)): return portFile
+
+    # wait for the provider to create it (woken up by file notifications); under
+    # lockstep synchronization it is there after the first time step
+    if os.path.isfile(portFile) is False:
+      start   = time.time()
+      watcher = FileWatcher( [portFile], 0.1 )
+      while os.path.isfile(portFile) is False:
+        remaining = 5.0 - (time.time() - start)
+        if remaining <= 0.0: break
+        watcher.wait( remaining )
+      watcher.close()
+
+      waited = time.time() - start
+      if waited >= 1.0:
+        s = '_GetPortFile(): waited ' + str(round(waited,1)) + ' s for port: ' + portFile
+        self.log.warn(s)
 
     assert os.path.isfile(portFile) is True, 'portFile %r not available; stop.' % portFile
 
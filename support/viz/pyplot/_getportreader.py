@@ -0,0 +1,26 @@
+"""
+PyPlot module.
+
+Persistent port tail readers of the use port files, one per file.
+"""
+#*********************************************************************************
+from .porttailreader import PortTailReader
+#*********************************************************************************
+
+#---------------------------------------------------------------------------------
+# The persistent reader of a port file (created on first use); it keeps the time
+# stamps within the plot sliding window
+
+def _GetPortReader( self, portFile, kind ):
+
+  reader = self.portReaders.get( portFile )
+
+  if reader is None:
+    reader = PortTailReader( portFile, kind, self.plotSlideWindow, self.log )
+    self.portReaders[ portFile ] = reader
+    s = '_GetPortReader(): created reader of '+kind+' file: '+portFile
+    self.log.debug(s)
+
+  return reader
+
+#*********************************************************************************
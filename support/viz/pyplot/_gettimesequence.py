@@ -8,6 +8,9 @@ Tue Jun 24 01:03:45 EDT 2014
 #*********************************************************************************
 import os, sys, io, time, datetime
 from   .timesequence import TimeSequence
+from   ._getportreader import _GetPortReader
+from   cortix.src.memoryport import MemoryPort
+from   cortix.src.mpiport import MPIPort
 #*********************************************************************************
 
 #---------------------------------------------------------------------------------
@@ -15,7 +18,7 @@ from   .timesequence import TimeSequence
 
 def _GetTimeSequence( self, portFile, atTime ):
 
-  s = '_GetTimeSequence(): will get data in portfile: '+portFile
+  s = '_GetTimeSequence(): will get data in portfile: '+str(portFile)
   self.log.debug(s)
 
   if atTime >= self.finalTime: 
@@ -23,7 +26,23 @@ def _GetTimeSequence( self, portFile, atTime ):
   else:
     initialTime = max( self.startTime, atTime - self.plotSlideWindow )
 
-  timeSequence = TimeSequence( portFile, 'xml', initialTime, atTime, self.log )
+  if isinstance(portFile, (MemoryPort, MPIPort)):
+    # the provider publishes the root node of its time-sequence document
+    entry = portFile.get( atTime )
+    if entry is None:
+      s = '_GetTimeSequence(): provider of '+str(portFile)+' closed before time '+\
+          str(atTime)+'; skipping...'
+      self.log.warn(s)
+      return
+    (timeStamp, rootNode) = entry
+    timeSequence = TimeSequence( str(portFile), 'memory', initialTime, atTime, 
+                                 self.log, rootNode )
+  else:
+    # the port reader parses only what was appended since the last plot
+    reader = _GetPortReader( self, portFile, 'time-sequence' )
+    reader.WaitFor( atTime )
+    timeSequence = TimeSequence( portFile, 'reader', initialTime, atTime, self.log,
+                                 reader=reader )
 
   self.timeSequences_tmp.append( timeSequence )
 
@@ -7,8 +7,9 @@ Tue Jun 24 01:03:45 EDT 2014
 """
 #*********************************************************************************
 import os, sys, io, time, datetime
-import xml.etree.ElementTree as ElementTree
-from threading import Lock
+from cortix.src.memoryport import MemoryPort
+from cortix.src.mpiport import MPIPort
+from ._getportreader import _GetPortReader
 #*********************************************************************************
 
 #---------------------------------------------------------------------------------
@@ -16,67 +17,77 @@ from threading import Lock
 
 def _GetTimeTables( self, portFile, atTime ):
 
-  s = '_GetTimeTables(): will check file: ' + portFile
+  s = '_GetTimeTables(): will check file: ' + str(portFile)
   self.log.debug(s)
 
-  found = False
+  if isinstance(portFile, (MemoryPort, MPIPort)):
+    # the provider publishes the root node of its time-tables document
+    entry = portFile.get( atTime )
+    if entry is None:
+      s = '_GetTimeTables(): provider of '+str(portFile)+' closed before time '+\
+          str(atTime)+'; skipping...'
+      self.log.warn(s)
+      return
+    (timeStamp, rootNode) = entry
+    found = __AddTimeTables( self, rootNode, atTime )
+    assert found is True, 'time %r missing in port %r' % (atTime,str(portFile))
+    return
+
+  s = '_GetTimeTables(): checking for value at ' + str(atTime)
+  self.log.debug(s)
 
-  while found is False:
+  # the port reader parses only what was appended since the last plot and waits
+  # on file change notifications
+  reader = _GetPortReader( self, portFile, 'time-tables' )
+  reader.WaitFor( atTime )
 
-    s = '_GetTimeTables(): checking for value at ' + str(atTime)
-    self.log.debug(s)
+  entry = reader.GetTimeTable( atTime )
+  if entry is None:
+    s = '_GetTimeTables(): no time stamp '+str(atTime)+' in '+portFile+'; skipping...'
+    self.log.warn(s)
+    return
 
-#    tree = ElementTree.parse(portFile)
+  (timeUnit,columns) = entry
+  self.timeTablesData[ (atTime,timeUnit) ] = list(columns)
 
-    try:
-      mutex = Lock()
-      mutex.acquire()
-      tree = ElementTree.parse( portFile )
-    except ElementTree.ParseError as error:
-      mutex.release()
-      s = '_GetTimeTables(): '+portFile+' unavailable. Error code: '+str(error.code)+' File position: '+str(error.position)+'. Retrying...'
-      self.log.debug(s)
-      time.sleep(0.1)
-      continue
+  s = '_GetTimeTables(): added '+str(len(columns))+' columns of data'
+  self.log.debug(s)
 
-    mutex.release()
-    rootNode = tree.getroot()
-    assert rootNode.tag == 'time-tables', 'invalid format.'
-  
-    timeNodes = rootNode.findall('timeStamp')
+  return
 
-    for timeNode in timeNodes:
+#---------------------------------------------------------------------------------
+# Store the columns of the time stamp atTime; return true iff found
 
-      timeStamp = float(timeNode.get('value').strip())
+def __AddTimeTables( self, rootNode, atTime ):
 
-      if timeStamp == atTime:
+  assert rootNode.tag == 'time-tables', 'invalid format.'
 
-        found = True  
+  found = False
 
-        timeUnit = timeNode.get('unit').strip()
+  timeNodes = rootNode.findall('timeStamp')
 
-        self.timeTablesData[ (timeStamp,timeUnit) ] = list()
+  for timeNode in timeNodes:
 
-        columns = timeNode.findall('column')
+    timeStamp = float(timeNode.get('value').strip())
 
-        data = list()
+    if timeStamp == atTime:
 
-        for col in columns: 
-            data.append( col )
+      found = True
 
-        self.timeTablesData[ (timeStamp,timeUnit) ] = data
+      timeUnit = timeNode.get('unit').strip()
 
-        s = '_GetTimeTables(): added '+str(len(data))+' columns of data'
-        self.log.debug(s)
+      columns = timeNode.findall('column')
 
-      # end of if timeStamp == atTime:
+      data = list()
 
-    # end of for timeNode in timeNodes:
+      for col in columns:
+          data.append( col )
 
-    if found is False: time.sleep(0.1)
+      self.timeTablesData[ (timeStamp,timeUnit) ] = data
 
-  # while found is False:
+      s = '_GetTimeTables(): added '+str(len(data))+' columns of data'
+      self.log.debug(s)
 
-  return
+  return found
 
 #*********************************************************************************
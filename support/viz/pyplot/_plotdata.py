@@ -10,6 +10,7 @@ import os, sys, io, time, datetime
 
 from ._plottimeseqdashboard import _PlotTimeSeqDashboard
 from ._plottimetables       import _PlotTimeTables
+from ._renderpages          import _WaitRendering
 #*********************************************************************************
 
 #---------------------------------------------------------------------------------
@@ -29,9 +30,9 @@ def _PlotData( self, facilityTime=0.0 , timeStep=0.0):
     s = '_PlotData(): toTime [min] = ' + str(toTime)
     self.log.debug(s)
 
-    _PlotTimeSeqDashboard(self, fromTime, toTime) #  plot with slide window history
+    _PlotTimeSeqDashboard(self, fromTime, toTime, self.plotPreview) #  plot with slide window history
 
-    _PlotTimeTables(self, fromTime, toTime) # plot with slide window history
+    _PlotTimeTables(self, fromTime, toTime, self.plotPreview) # plot with slide window history
 
   elif facilityTime >= self.finalTime: 
 
@@ -42,4 +43,6 @@ def _PlotData( self, facilityTime=0.0 , timeStep=0.0):
 
     _PlotTimeTables(self, 0.0, self.finalTime) # plot all history
 
+    _WaitRendering(self, shutdown=True) # final pages in place before the run ends
+
 #*********************************************************************************
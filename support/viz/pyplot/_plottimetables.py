@@ -8,17 +8,18 @@ Tue Jun 24 01:03:45 EDT 2014
 #*********************************************************************************
 import os, sys, io, time, datetime
 import logging
-import xml.etree.ElementTree as ElementTree
-import numpy as np
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import matplotlib.gridspec as gridspec
-from matplotlib.ticker import MultipleLocator
+from cortix.src.utils.lazyimport import lazy_import
+np       = lazy_import('numpy')
+
+from ._renderpages import _RenderPages
+from .unitscale import GetUnitScale, ParseValues
 #*********************************************************************************
 
 #---------------------------------------------------------------------------------
-def _PlotTimeTables( self, initialTime=0.0, finalTime=0.0 ):
+# All time tables are plotted on one dashboard page, rendered by _RenderPages
+# (preview: at the preview resolution).
+
+def _PlotTimeTables( self, initialTime=0.0, finalTime=0.0, preview=False ):
 
   nTimeSteps = len(self.timeTablesData.keys())
   if nTimeSteps == 0: return
@@ -32,20 +33,22 @@ def _PlotTimeTables( self, initialTime=0.0, finalTime=0.0 ):
 
 #  assert nVariables <= 9, 'exceeded # of variables'
 
-  fig = plt.figure('time-tables')
-
-  gs = gridspec.GridSpec(2,2)
-  gs.update(left=0.1,right=0.98,wspace=0.4,hspace=0.4)
+  page = dict()
+  page['fileName'] = os.path.abspath( 'pyplot-timetables.png' )
+  page['title']    = 'cortix.viz.PyPlot: Time-Tables Dashboard'
+  page['titleFontSize'] = 16
+  page['nRows']    = 2
+  page['nCols']    = 2
+  page['gridSpec'] = dict( left=0.1, right=0.98, wspace=0.4, hspace=0.4 )
+  page['axes']     = list()
 
-  axlst = list()
-  axlst.append(fig.add_subplot(gs[0, 0]))
-  axlst.append(fig.add_subplot(gs[0, 1]))
-  axlst.append(fig.add_subplot(gs[1, 0]))
-  axlst.append(fig.add_subplot(gs[1, 1]))
-  axes = np.array(axlst)
+  for k in range(4):
+    axis = dict( lines=list(), xLabel='', yLabel='', xScale='linear', yScale='linear',
+                 yLim=None, xLocators=None, xTickFontSize=10, yTickFontSize=10,
+                 legend=False )
+    page['axes'].append( axis )
 
-  text = 'cortix.viz.PyPlot: Time-Tables Dashboard'
-  fig.text(.5,.95,text,horizontalalignment='center',fontsize=16)
+  units = dict() # axis -> unit of its variable
 
   for (key,val) in self.timeTablesData.items():
     (timeStamp,timeUnit) = key
@@ -56,74 +59,45 @@ def _PlotTimeTables( self, initialTime=0.0, finalTime=0.0 ):
     distance = columns[0]
     xLabel = distance.get('name').strip()
     xUnit  = distance.get('unit').strip()
-    x = distance.text.strip().split(',')
-    for i in range(len(x)): x[i] = float(x[i])
-    x = np.array(x)
+    x = ParseValues( distance.text )
  
     for k in range(len(columns)-1):
 
-      ax = axes.flat[k]
+      axis = page['axes'][k]
 
       y = columns[k+1]
       yLabel = y.get('name').strip()
       yUnit  = y.get('unit').strip()
       yLegend= y.get('legend').strip()
-      y = y.text.strip().split(',')
-      for i in range(len(y)): 
-          y[i] = float(y[i])
-      y = np.array(y)
+      y = ParseValues( y.text )
  
       if k == 0 or k == 1: 
         y *= 1000.0
         yUnit = 'm'
 
+      axis['xLabel'] = xLabel+' ['+xUnit+']'
+      axis['yLabel'] = yLabel
+      units[k] = yUnit
 
-#    x = data[:,0]
-#    if x.max() >= 120.0:
-#      x /= 60.0
-#      if timeUnit == 'm': timeUnit = 'h'
-
-#    y = data[:,1]
-#    if y.max() >= 1000.0: 
-#      y /= 1000.0
-#      if varUnit == 'gram' or varUnit == 'g': 
-#        varUnit = 'kg'
-#    if y.max() <= .1: 
-#      y *= 1000.0
-#      if varUnit == 'gram' or varUnit == 'g': 
-#        varUnit = 'mg'
-  
-      ax.set_xlabel(xLabel+' ['+xUnit+']',fontsize=9)
-      ax.set_ylabel(yLabel+' ['+yUnit+']',fontsize=9)
-
-#    ymax  = y.max()
-#    dy    = ymax * .1
-#    ymax += dy
-#    ymin  = y.min()
-#    ymin -= dy
-
-#    ax.set_ylim(ymin,ymax)
-
-      for l in ax.get_xticklabels(): l.set_fontsize(10)
-      for l in ax.get_yticklabels(): l.set_fontsize(10)
-#  color  = parameters['plot-color']
-#  marker = parameters['plot-marker']+'-'
-#  axis.set_xlim(2e-3, 2)
-#  axis.set_aspect(1)
-#  axis.set_title("adjustable = box")
-
-      ax.plot( x, y, 's-', color='black', linewidth=0.5, markersize=2,  \
-             markeredgecolor='black', label=yLegend )
-
-#      if k == 2 or k == 3: ax.set_yscale("log")
+      axis['lines'].append( (x, y, yLegend) )
 
+#      if k == 2 or k == 3: axis['yScale'] = 'log'
 
-#      ax.legend( loc='best', prop={'size':8} )
+  # end of for (key,val) in self.timeTablesData.items():
 
-  # end of for (varSpec,ax) in zip( self.timeSeriesData , axes.flat ):
+  # display units (see unitscale.py): one factor for all the lines of an axis
+  for (k,yUnit) in units.items():
+    axis = page['axes'][k]
+    if k == 0 or k == 1 or len(axis['lines']) == 0:
+      axis['yLabel'] += ' ['+yUnit+']'
+      continue
+    magnitude = max( [ np.abs(y).max() if y.size > 0 else 0.0 for (x,y,legend) in axis['lines'] ] )
+    (factor,yUnit) = GetUnitScale( yUnit ).GetFactor( magnitude )
+    if factor != 1.0:
+      axis['lines'] = [ (x, y*factor, legend) for (x,y,legend) in axis['lines'] ]
+    axis['yLabel'] += ' ['+yUnit+']'
 
-  fig.savefig('pyplot-timetables.png',dpi=200,fomat='png')
-  plt.close('time-tables')
+  _RenderPages( self, [page], preview )
 
   return
 
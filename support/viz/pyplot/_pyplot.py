@@ -9,13 +9,9 @@ Tue Jun 24 01:03:45 EDT 2014
 import os, sys, io, time, datetime
 import logging
 import xml.etree.ElementTree as ElementTree
-import numpy as np
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import matplotlib.gridspec as gridspec
-from matplotlib.ticker import MultipleLocator
 from   .timesequence import TimeSequence
+from   cortix.src.memoryport import MemoryPort
+from   cortix.src.utils.workspace import stage_file
 #*********************************************************************************
 
 #---------------------------------------------------------------------------------
@@ -53,6 +49,17 @@ def _PyPlot( self,
   self.plotSlideWindow = 5*60.0 # minutes  (width of the sliding window)
 #  self.plotSlideWindow = 6*60.0 # minutes  (width of the sliding window)
 
+  self.plotDpi        = 200     # resolution of the dashboards
+  self.plotPreview    = False   # intermediate dashboards at the preview resolution
+  self.plotPreviewDpi = 60
+  self.plotWorkers    = min( 4, os.cpu_count() or 1 ) # processes rendering pages
+
+  # dashboard rendering state (see _RenderPages)
+  self.renderSignatures = dict()  # [page file] = signature of its last rendering
+  self.renderFutures    = list()  # (page file, future) being rendered
+  self.renderWorkers    = dict()  # [page file] = index of its rendering process
+  self.renderPool       = None
+
   # This holds all time sequences, potentially, one per use port. One time sequence
   # has all the data for one port connection.
   self.timeSequences_tmp = list() # temporary storage
@@ -60,6 +67,9 @@ def _PyPlot( self,
   # tables in xml format
   self.timeTablesData = dict(list()) # [(time,timeUnit)] = [column,column,...]
 
+  # persistent readers of the port files (see _GetPortReader)
+  self.portReaders = dict() # [portFile] = PortTailReader
+
 #.................................................................................
 # Input ports (if any)
 
@@ -74,8 +84,14 @@ def _PyPlot( self,
   found = False
   for (portName,portType,portFile) in ports: 
     if portName == 'time-sequence-input': # this is the use port connected to the input port
-      s = 'cp -f ' + inputDataFullPathFileNames[0] + ' ' + portFile
-      os.system(s)
+      if isinstance(portFile, MemoryPort):
+        rootNode = ElementTree.parse( inputDataFullPathFileNames[0] ).getroot()
+        portFile.put( finalTime, rootNode )
+        s = 'put ' + inputDataFullPathFileNames[0] + ' in ' + str(portFile)
+      else:
+        # the input data is only read from here on
+        method = stage_file( inputDataFullPathFileNames[0], portFile, read_only=True )
+        s = method + ' ' + inputDataFullPathFileNames[0] + ' to ' + portFile
       self.log.debug(s)
       found = True
 
@@ -0,0 +1,236 @@
+"""
+PyPlot module.
+
+Rendering of dashboard pages. The plotting methods describe each page (a PNG
+file) as a dictionary of plain data (see _RenderPage()); pages whose data did not
+change since their last rendering are skipped, and the others are rendered by a
+set of rendering processes (plotWorkers). A page is always rendered by the same
+process, which keeps its figure and updates the lines, labels and limits in place
+on the next rendering instead of building the figure anew.
+
+Pages are rendered at plotDpi; intermediate pages at plotPreviewDpi if
+plotPreview is set. Rendering overlaps with the simulation until the next
+rendering (or the end of the run, see _WaitRendering()).
+"""
+#*********************************************************************************
+import os, sys, io, time, datetime
+import hashlib
+from cortix.src.utils.lazyimport import lazy_import
+from cortix.src.utils.executor import create_executor
+figure = lazy_import('matplotlib.figure', before=lambda: \
+                     lazy_import('matplotlib').use('Agg'))
+ticker = lazy_import('matplotlib.ticker')
+#*********************************************************************************
+
+# figures of this process: page file name -> (layout key, figure, axes, title)
+__Figures = dict()
+
+#---------------------------------------------------------------------------------
+# Render the pages that changed; preview renders at the preview resolution
+
+def _RenderPages( self, pages, preview=False ):
+
+  _WaitRendering( self )
+
+  dpi = self.plotDpi
+  if preview is True: dpi = self.plotPreviewDpi
+
+  toRender = list()
+  for page in pages:
+    page['dpi'] = dpi
+    signature = __GetSignature( page )
+    if self.renderSignatures.get( page['fileName'] ) == signature and \
+       os.path.isfile( page['fileName'] ):
+      s = '_RenderPages(): unchanged, skipped: '+page['fileName']
+      self.log.debug(s)
+      continue
+    self.renderSignatures[ page['fileName'] ] = signature
+    toRender.append( page )
+
+  if len(toRender) == 0: return
+
+  pool = None
+  if self.plotWorkers > 1:
+    pool = __GetPool( self )
+
+  if pool is None:
+    for page in toRender:
+      _RenderPage( page )
+      s = '_RenderPages(): created plot: '+page['fileName']
+      self.log.debug(s)
+    return
+
+  for page in toRender:
+    worker = self.renderWorkers.setdefault( page['fileName'], len(self.renderWorkers)%len(pool) )
+    future = pool[worker].submit( _RenderPage, page )
+    self.renderFutures.append( (page['fileName'],future) )
+
+  return
+
+#---------------------------------------------------------------------------------
+# Wait for the pages being rendered; shut down the process pool if asked
+
+def _WaitRendering( self, shutdown=False ):
+
+  for (fileName,future) in self.renderFutures:
+    try:
+      future.result()
+    except Exception as error:
+      del self.renderSignatures[ fileName ] # render it again next time
+      s = '_WaitRendering(): failed to render '+fileName+': '+repr(error)
+      self.log.error(s)
+    else:
+      s = '_WaitRendering(): created plot: '+fileName
+      self.log.debug(s)
+
+  self.renderFutures = list()
+
+  if shutdown is True and self.renderPool is not None:
+    for executor in self.renderPool: executor.shutdown()
+    self.renderPool = None
+
+  return
+
+#---------------------------------------------------------------------------------
+# Render one page; runs in the rendering processes.
+#
+# page: 'fileName' (full path), 'dpi', 'title', 'titleFontSize', 'nRows', 'nCols',
+#       'gridSpec' (GridSpec.update() arguments), 'axes' (list of axis specs)
+# axis: 'lines' (list of (x, y, legend)), 'xLabel', 'yLabel', 'xScale', 'yScale',
+#       'yLim' ((min,max) or None), 'xLocators' ((major,minor) or None),
+#       'xTickFontSize', 'yTickFontSize', 'legend' (show legend)
+
+def _RenderPage( page ):
+
+  (fig,axes,title) = __GetFigure( page )
+
+  title.set_text( page['title'] )
+
+  for (ax,spec) in zip( axes, page['axes'] ):
+    __UpdateAxis( ax, spec )
+
+  fig.savefig( page['fileName'], dpi=page['dpi'] )
+
+  return page['fileName']
+
+#---------------------------------------------------------------------------------
+# Load the plotting library ahead of the first page; runs in the rendering processes
+
+def _LoadRenderer():
+
+  figure.Figure
+
+  return
+
+#*********************************************************************************
+# Helper internal functions
+
+# one single-process executor per rendering process, so that pages can be pinned
+def __GetPool( self ):
+
+  if self.renderPool is None:
+    pool = list()
+    try:
+      for i in range(self.plotWorkers):
+        executor = create_executor( 'process', 1 )
+        executor.submit( _LoadRenderer )
+        pool.append( executor )
+    except (OSError, AssertionError) as error: # e.g. in a daemonic process
+      for executor in pool: executor.shutdown()
+      s = '_RenderPages(): no rendering processes ('+repr(error)+'); rendering serially'
+      self.log.warn(s)
+      self.plotWorkers = 1
+      return None
+    self.renderPool = pool
+
+  return self.renderPool
+
+# a page changes with its data and resolution (not its title time stamp)
+def __GetSignature( page ):
+
+  digest = hashlib.sha1()
+  digest.update( repr( (page['fileName'], page['dpi'], page['nRows'], page['nCols']) ).encode() )
+
+  for spec in page['axes']:
+    digest.update( repr( (spec['xLabel'], spec['yLabel'], spec['xScale'], spec['yScale'],
+                          spec['yLim'], spec['xLocators'], spec['legend']) ).encode() )
+    for (x,y,legend) in spec['lines']:
+      digest.update( legend.encode() )
+      digest.update( x.tobytes() )
+      digest.update( y.tobytes() )
+
+  return digest.hexdigest()
+
+def __GetFigure( page ):
+
+  key = ( page['nRows'], page['nCols'], len(page['axes']),
+          tuple(sorted(page['gridSpec'].items())), page['titleFontSize'] )
+
+  cached = __Figures.get( page['fileName'] )
+  if cached is not None and cached[0] == key:
+    return cached[1:]
+
+  fig = figure.Figure()
+
+  gs = fig.add_gridspec( page['nRows'], page['nCols'] )
+  gs.update( **page['gridSpec'] )
+
+  axes = list()
+  for i in range(page['nRows']):
+    for j in range(page['nCols']):
+      if len(axes) == len(page['axes']): break
+      axes.append( fig.add_subplot(gs[i, j]) )
+
+  title = fig.text( .5, .95, '', horizontalalignment='center',
+                    fontsize=page['titleFontSize'] )
+
+  __Figures[ page['fileName'] ] = (key, fig, axes, title)
+
+  return (fig, axes, title)
+
+def __UpdateAxis( ax, spec ):
+
+  lines = ax.get_lines()
+
+  if len(lines) != len(spec['lines']):
+    for line in list(lines): line.remove()
+    lines = list()
+    for i in range(len(spec['lines'])):
+      (line,) = ax.plot( [], [], 's-', color='black', linewidth=0.5, markersize=2, \
+                         markeredgecolor='black' )
+      lines.append( line )
+
+  for (line,(x,y,legend)) in zip( lines, spec['lines'] ):
+    line.set_data( x, y )
+    line.set_label( legend )
+
+  # setting the scales also resets the tick locators
+  ax.set_xscale( spec['xScale'] )
+  ax.set_yscale( spec['yScale'] )
+
+  ax.set_xlabel( spec['xLabel'], fontsize=9 )
+  ax.set_ylabel( spec['yLabel'], fontsize=9 )
+
+  ax.relim()
+  ax.autoscale( enable=True )
+  ax.autoscale_view()
+  if spec['yLim'] is not None:
+    ax.set_ylim( *spec['yLim'] )
+
+  if spec['xLocators'] is not None:
+    (major,minor) = spec['xLocators']
+    ax.xaxis.set_major_locator( ticker.MultipleLocator(major) )
+    ax.xaxis.set_minor_locator( ticker.MultipleLocator(minor) )
+
+  ax.tick_params( axis='x', labelsize=spec['xTickFontSize'] )
+  ax.tick_params( axis='y', labelsize=spec['yTickFontSize'] )
+
+  legend = ax.get_legend()
+  if spec['legend'] is True and len(spec['lines']) > 0:
+    ax.legend( loc='best', prop={'size':7} )
+  elif legend is not None:
+    legend.remove()
+
+  return
+
+#*********************************************************************************
@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+"""
+Pyplot module.
+
+Port tail reader: a persistent reader of one time-sequence or time-tables port
+file. Providers only append time stamps to these files, so the reader remembers
+the byte offset past the last complete <timeStamp> element it parsed, and each
+Update() parses only the elements appended since (checking that the bytes before
+the offset are unchanged, else the file is read anew). Binary time sequences
+(.tsq, see timeseqfile.py) are memory mapped instead.
+
+Only the time stamps within a rolling window (plotSlideWindow) of the last one
+are kept in memory; a request reaching further back (e.g. the final plot of the
+whole run) reads the file once more.
+
+WaitFor() blocks on file change notifications (see FileWatcher) until the time
+stamp shows up, instead of re-reading the file in a sleep and retry loop.
+"""
+#*********************************************************************************
+import os
+import logging
+import xml.etree.ElementTree as ElementTree
+from collections import deque
+import numpy as np
+
+from cortix.src.utils.filewatcher import FileWatcher
+from .timeseqfile import TimeSeqReader
+from .unitscale import ParseValues
+#*********************************************************************************
+
+_StartTag = b'<timeStamp'
+_EndTag   = b'</timeStamp>'
+_AnchorSize = 64  # bytes before the offset checked for changes
+
+#*********************************************************************************
+class PortTailReader():
+
+ def __init__( self,
+               fileName,                 # full path file name
+               kind   = 'time-sequence', # or 'time-tables'
+               window = None,            # time span kept (None: all)
+               logger = None,
+               pollInterval = 1.0        # s; safety net for missed notifications
+             ):
+
+     assert type(fileName) is str, 'fileName %r invalid.'%(fileName)
+     assert kind in ('time-sequence','time-tables'), 'kind %r invalid.'%(kind)
+
+     self._fileName = fileName
+     self._kind     = kind
+     self._window   = window
+     self._log      = logger if logger is not None else logging.getLogger(__name__)
+
+     self._watcher  = FileWatcher( [fileName], float(pollInterval) )
+
+     self._seqFile  = None  # .tsq files: TimeSeqReader
+     if fileName.endswith('.tsq'):
+        assert kind == 'time-sequence', 'binary time-tables are not supported.'
+
+     self.__Reset()
+
+     return
+
+#---------------------------------------------------------------------------------
+# Accessors
+
+ def GetFileName(self):
+     return self._fileName
+
+ # header as the root node of the XML document (no time stamps); None if not read
+ def GetRootNode(self):
+     if self._seqFile is not None:
+        return self._seqFile.GetRootNode()
+     return self._root
+
+ def GetLastTimeStamp(self):
+     if self._seqFile is not None:
+        return self._seqFile.GetLastTimeStamp()
+     return self._lastTime
+
+ # time-sequence records (NumPy array: time, value of each variable) with
+ # initialTime <= time <= finalTime
+ def GetRecordsInWindow(self, initialTime=None, finalTime=None):
+     assert self._kind == 'time-sequence', 'not a time sequence.'
+     if self._seqFile is not None:
+        return self._seqFile.GetRecordsInWindow( initialTime, finalTime )
+
+     entries = self._entries
+     if initialTime is not None and self._nDropped > 0 and \
+        (len(entries) == 0 or initialTime < entries[0][0]):
+        entries = self.__ReadAll()   # beyond the window: read the file once more
+
+     nColumns = 1 + len( self._root.findall('var') )
+     rows = [ row for (t,row) in entries if \
+              (initialTime is None or t >= initialTime) and \
+              (finalTime is None or t <= finalTime) ]
+     if len(rows) == 0:
+        return np.empty( (0,nColumns) )
+     return np.array( rows, dtype=np.float64 )
+
+ # (timeUnit, list of column nodes) of the time tables at a time stamp; None if
+ # there is none
+ def GetTimeTable(self, atTime):
+     assert self._kind == 'time-tables', 'not time tables.'
+     for (t,entry) in reversed(self._entries):
+         if t == atTime: return entry
+         if t < atTime: break
+     for (t,entry) in self.__ReadAll():
+         if t == atTime: return entry
+     return None
+
+#---------------------------------------------------------------------------------
+# Reading
+
+ # parse what was appended since the last call; returns the number of new time
+ # stamps
+ def Update(self):
+     if self._fileName.endswith('.tsq'):
+        return self.__UpdateTSQ()
+
+     try:
+        f = open( self._fileName, 'rb' )
+     except FileNotFoundError:
+        return 0
+
+     with f:
+          stat = os.fstat( f.fileno() )
+          fileId = (stat.st_dev,stat.st_ino)
+
+          if fileId != self._fileId:
+             self.__Reset()
+             self._fileId = fileId
+          if stat.st_size < self._offset:
+             # being rewritten (check again on the next change), unless it is
+             # another, shorter, document
+             head = f.read()
+             if head.startswith( self._header ) and \
+                not head.rstrip().endswith( b'</' + self._kind.encode() + b'>' ):
+                return 0
+             self.__Reset()
+             self._fileId = fileId
+
+          if self._offset > 0:
+             start = max( self._offset - _AnchorSize, 0 )
+             f.seek( start )
+             if f.read( self._offset - start ) != self._anchor:
+                self._log.debug( 'PortTailReader: %s changed; reading it anew', self._fileName )
+                self.__Reset()
+                self._fileId = fileId
+
+          f.seek( self._offset )
+          data = f.read()
+
+     pos = 0
+     if self._root is None:
+        pos = data.find( _StartTag )
+        if pos < 0: return 0  # no time stamp yet
+        self._header = data[:pos]
+        self._root = ElementTree.fromstring( self._header + b'</' + self._kind.encode() + b'>' )
+        assert self._root.tag == self._kind, 'invalid format.'
+        self._nVar = len( self._root.findall('var') )
+
+     (entries,consumed) = self.__ParseTimeStamps( data, pos )
+     if consumed == 0 and pos == 0:
+        return 0
+
+     self._offset += pos + consumed
+     self._anchor  = ( self._anchor + data[:pos+consumed] )[-_AnchorSize:]
+
+     for (t,entry) in entries:
+         self._entries.append( (t,entry) )
+         if self._lastTime is None or t > self._lastTime:
+            self._lastTime = t
+
+     if self._window is not None and self._lastTime is not None:
+        while len(self._entries) > 0 and self._entries[0][0] < self._lastTime - self._window:
+              self._entries.popleft()
+              self._nDropped += 1
+
+     return len(entries)
+
+ # block until the time stamp atTime (or a later one) is in the file; returns
+ # false on timeout (s)
+ def WaitFor(self, atTime, timeout=None):
+     while True:
+        self.Update()
+        lastTime = self.GetLastTimeStamp()
+        if lastTime is not None and lastTime >= atTime: return True
+        if self.__IsCutOff( atTime ): return True
+
+        s = 'PortTailReader: '+self._fileName+' has no timeStamp = '+str(atTime)+' yet. Waiting...'
+        self._log.debug(s)
+        changed = self._watcher.wait( timeout )
+        if len(changed) == 0 and timeout is not None: return False
+
+ def Close(self):
+     self._watcher.close()
+     return
+
+#---------------------------------------------------------------------------------
+# Helper internal methods
+
+ def __Reset(self):
+     self._root     = None
+     self._header   = b''     # bytes before the first time stamp
+     self._nVar     = 0
+     self._fileId   = None
+     self._offset   = 0       # file position past the last parsed time stamp
+     self._anchor   = b''     # bytes before the offset
+     self._entries  = deque() # (time, record row or (timeUnit, columns))
+     self._nDropped = 0       # time stamps dropped out of the window
+     self._lastTime = None
+     return
+
+ def __UpdateTSQ(self):
+     if self._seqFile is None:
+        if not os.path.isfile( self._fileName ): return 0
+        self._seqFile = TimeSeqReader( self._fileName )
+        return self._seqFile.GetNRecords()
+     return self._seqFile.Update()
+
+ # complete timeStamp elements in data from pos on; returns the entries and the
+ # number of bytes consumed
+ def __ParseTimeStamps(self, data, pos):
+     entries = list()
+     end = pos
+     while True:
+        start = data.find( _StartTag, end )
+        if start < 0: break
+        stop = data.find( _EndTag, start )
+        if stop < 0: break
+        stop += len(_EndTag)
+        entries.append( self.__GetEntry( ElementTree.fromstring( data[start:stop] ) ) )
+        end = stop
+     return (entries, end - pos)
+
+ def __GetEntry(self, node):
+     timeStamp = float( node.get('value').strip() )
+
+     if self._kind == 'time-tables':
+        return (timeStamp, (node.get('unit').strip(), node.findall('column')))
+
+     # accept missing data as zeros; neglect excess data (as TimeSequence)
+     values = ParseValues( node.text )
+     row = np.zeros( 1+self._nVar )
+     row[0] = timeStamp
+     if len(values) >= self._nVar:
+        row[1:] = values[:self._nVar]
+     return (timeStamp, row)
+
+ # all time stamps in the file (not kept)
+ def __ReadAll(self):
+     with open( self._fileName, 'rb' ) as f:
+          data = f.read()
+     pos = data.find( _StartTag )
+     if pos < 0: return list()
+     (entries,consumed) = self.__ParseTimeStamps( data, pos )
+     return entries
+
+ # legacy time sequences may stop at a cut-off time
+ def __IsCutOff(self, atTime):
+     root = self.GetRootNode()
+     if root is None: return False
+     node = root.find('time')
+     if node is None or node.get('cut-off') is None: return False
+     return atTime > float( node.get('cut-off').strip() )
+
+#*********************************************************************************
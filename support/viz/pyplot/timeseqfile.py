@@ -0,0 +1,247 @@
+#!/usr/bin/env python
+"""
+Binary time-sequence files (extension .tsq; port mode="file.tsq").
+
+A module publishes a time sequence with a TimeSeqWriter: the file has a header
+with the specs of the variables, followed by one fixed-width record per time
+stamp appended at every step. A TimeSeqReader maps the records with numpy.memmap;
+polling the file (Update()) only looks at the records appended since the last
+poll, and nothing is parsed or converted per value.
+
+Layout (little-endian):
+
+  magic    8 bytes   b'CTXTSEQ1'
+  size     uint64    header size in bytes (a multiple of 8)
+  header   XML       <time-sequence name=".."><time unit=".."/>
+                       <var name=".." unit=".." legend=".." scale=".."/> ...
+                     </time-sequence>  (padded with blanks)
+  records  float64   time, value of var 1, ..., value of var n  (one per step)
+
+The header is the XML time-sequence document without its timeStamp elements, so
+ExportXML() writes the same XML files modules used to publish (for tools that
+still read them).
+
+The writer creates the file atomically (header written to a temporary file and
+renamed); a record being appended while the file is read is ignored until it is
+complete.
+
+VFdALib support classes
+"""
+#*********************************************************************************
+import os
+import struct
+import xml.etree.ElementTree as ElementTree
+import numpy as np
+#*********************************************************************************
+
+_Magic      = b'CTXTSEQ1'
+_SizeFormat = '<Q'
+_DataType   = np.dtype('<f8')
+
+#*********************************************************************************
+class TimeSeqWriter():
+
+ def __init__( self,
+               fileName,              # full path file name (.tsq)
+               name,                  # name of the time sequence
+               variables,             # list of (name, unit, legend[, scale])
+               timeUnit = 'min'
+             ):
+
+     assert type(fileName) is str, 'fileName %r invalid.'%(fileName)
+     assert len(variables) > 0, 'no variables.'
+
+     root = ElementTree.Element( 'time-sequence', {'name':name} )
+     ElementTree.SubElement( root, 'time', {'unit':timeUnit} )
+     for var in variables:
+         assert 3 <= len(var) <= 4, 'variable spec %r invalid.'%(var,)
+         attributes = {'name':var[0], 'unit':var[1], 'legend':var[2]}
+         if len(var) == 4:
+            attributes['scale'] = var[3]
+         ElementTree.SubElement( root, 'var', attributes )
+
+     header = ElementTree.tostring( root, encoding='utf-8' )
+     header += b' ' * (-len(header) % 8)
+
+     self._fileName = fileName
+     self._nColumns = 1 + len(variables)
+     self._nRecords = 0
+
+     tmpFileName = fileName + '.tmp'
+     with open( tmpFileName, 'wb' ) as tmp:
+          tmp.write( _Magic )
+          tmp.write( struct.pack( _SizeFormat, len(header) ) )
+          tmp.write( header )
+     os.replace( tmpFileName, fileName )
+
+     self._file = open( fileName, 'ab' )
+
+     return
+
+ def GetFileName(self):
+     return self._fileName
+
+ def GetNRecords(self):
+     return self._nRecords
+
+ # append the record of a time stamp; values in the order of the variables
+ def Write(self, timeStamp, values, flush=True):
+     assert self._file is not None, 'writer closed.'
+     record = np.empty( self._nColumns, dtype=_DataType )
+     record[0]  = timeStamp
+     record[1:] = values
+     self._file.write( record.tobytes() )
+     if flush:
+        self._file.flush()
+     self._nRecords += 1
+     return
+
+ def Flush(self):
+     self._file.flush()
+     return
+
+ def Close(self):
+     if self._file is not None:
+        self._file.close()
+        self._file = None
+     return
+
+ # XML time-sequence file of the records written so far
+ def ExportXML(self, fileName, initialTime=None, finalTime=None):
+     self.Flush()
+     TimeSeqReader( self._fileName ).ExportXML( fileName, initialTime, finalTime )
+     return
+
+ def __enter__(self):
+     return self
+
+ def __exit__(self, excType, excValue, traceback):
+     self.Close()
+     return False
+
+#*********************************************************************************
+class TimeSeqReader():
+
+ def __init__( self,
+               fileName  # full path file name (.tsq)
+             ):
+
+     assert type(fileName) is str, 'fileName %r invalid.'%(fileName)
+
+     self._fileName = fileName
+     self._root     = None  # header (XML root node)
+     self._offset   = 0     # file position of the first record
+     self._nColumns = 0
+     self._fileId   = None  # (device, inode) of the file read
+
+     self.__ReadHeader()
+     self._records  = np.empty( (0,self._nColumns), dtype=_DataType )
+     self._nRecords = 0
+     self.Update()
+
+     return
+
+#---------------------------------------------------------------------------------
+# Accessors
+
+ def GetFileName(self):
+     return self._fileName
+
+ # header as the root node of an XML time-sequence document (no time stamps)
+ def GetRootNode(self):
+     return self._root
+
+ def get_name(self):
+     return self._root.get('name').strip()
+
+ def GetTimeUnit(self):
+     return self._root.find('time').get('unit').strip()
+
+ def GetNVariables(self):
+     return self._nColumns - 1
+
+ def GetVariableNames(self):
+     return [ v.get('name').strip() for v in self._root.findall('var') ]
+
+ def GetNRecords(self):
+     return self._nRecords
+
+ # records read so far (NumPy array, read-only view): column 0 is the time
+ def GetRecords(self):
+     return self._records[:self._nRecords]
+
+ def GetTimes(self):
+     return self._records[:self._nRecords,0]
+
+ def GetLastTimeStamp(self):
+     if self._nRecords == 0: return None
+     return float( self._records[self._nRecords-1,0] )
+
+ # records with initialTime <= time <= finalTime (time stamps are increasing)
+ def GetRecordsInWindow(self, initialTime=None, finalTime=None):
+     times = self.GetTimes()
+     first = 0
+     last  = self._nRecords
+     if initialTime is not None:
+        first = int( np.searchsorted( times, initialTime, side='left' ) )
+     if finalTime is not None:
+        last = int( np.searchsorted( times, finalTime, side='right' ) )
+     return self._records[first:max(first,last)]
+
+ # map the records appended since the last call; returns the number of new
+ # records (the file is read anew if it was replaced)
+ def Update(self):
+     try:
+        stat = os.stat( self._fileName )
+     except FileNotFoundError:
+        return 0
+
+     if (stat.st_dev,stat.st_ino) != self._fileId:
+        self.__ReadHeader()
+        self._records  = np.empty( (0,self._nColumns), dtype=_DataType )
+        self._nRecords = 0
+
+     recordSize = self._nColumns * _DataType.itemsize
+     nRecords = max( stat.st_size - self._offset, 0 ) // recordSize
+     if nRecords <= self._nRecords:
+        return 0
+
+     nNew = nRecords - self._nRecords
+     self._records = np.memmap( self._fileName, dtype=_DataType, mode='r',
+                                offset=self._offset, shape=(nRecords,self._nColumns) )
+     self._nRecords = nRecords
+     return nNew
+
+ # XML time-sequence file of the records (those in a time window)
+ def ExportXML(self, fileName, initialTime=None, finalTime=None):
+     root = ElementTree.fromstring( ElementTree.tostring( self._root ) )
+     for record in self.GetRecordsInWindow( initialTime, finalTime ):
+         node = ElementTree.SubElement( root, 'timeStamp', {'value':repr(float(record[0]))} )
+         node.text = ','.join( [ repr(float(v)) for v in record[1:] ] )
+     tmpFileName = fileName + '.tmp'
+     ElementTree.ElementTree( root ).write( tmpFileName, encoding='utf-8', xml_declaration=True )
+     os.replace( tmpFileName, fileName )
+     return
+
+#---------------------------------------------------------------------------------
+# Helper internal methods
+
+ def __ReadHeader(self):
+     with open( self._fileName, 'rb' ) as f:
+          stat  = os.fstat( f.fileno() )
+          magic = f.read( len(_Magic) )
+          assert magic == _Magic, 'file %r is not a binary time sequence.'%(self._fileName)
+          (size,) = struct.unpack( _SizeFormat, f.read( struct.calcsize(_SizeFormat) ) )
+          header  = f.read( size )
+     assert len(header) == size, 'file %r header truncated.'%(self._fileName)
+
+     root = ElementTree.fromstring( header.rstrip(b' ') )
+     assert root.tag == 'time-sequence', 'invalid format.'
+
+     self._root     = root
+     self._offset   = len(_Magic) + struct.calcsize(_SizeFormat) + size
+     self._nColumns = 1 + len( root.findall('var') )
+     self._fileId   = (stat.st_dev,stat.st_ino)
+     return
+
+#*********************************************************************************
@@ -6,7 +6,10 @@ Pyplot module.
 
 This class manages time-sequence data in XML or tabular formats.
 It is a helper for reading and manipulating stored file data in Cortix.
-The XML data is a ElementTree object. 
+The XML data is a ElementTree object. Binary time-sequence files ("tsq", see
+timeseqfile.py) are memory mapped; their header is the same XML document without
+the time stamps. A "reader" time sequence is a view of the records held by a port
+reader (see PortTailReader).
 
 Sat Jul 19 12:13:05 EDT 2014
 """
@@ -14,7 +17,10 @@ Sat Jul 19 12:13:05 EDT 2014
 import os, sys, io, time, datetime
 import logging
 import xml.etree.ElementTree as ElementTree
-from threading import Lock
+import numpy as np
+from .timeseqfile import TimeSeqReader
+from .unitscale import ParseValues
+from cortix.src.utils.filewatcher import FileWatcher
 #*********************************************************************************
 
 #*********************************************************************************
@@ -22,10 +28,12 @@ class TimeSequence():
 
  def __init__( self,
                fileName = None,   # full path file name
-               fileType = None,   # "xml"
+               fileType = None,   # "xml", "tsq", "memory" or "reader"
                initialTime = 0.0,
                finalTime   = 0.0,
-               logger = None
+               logger = None,
+               rootNode = None,   # "memory": root node of the time-sequence
+               reader   = None    # "reader": PortTailReader of the port file
              ):
 
   assert type(fileName) is str, 'wrong type; stop.'
@@ -51,9 +59,21 @@ class TimeSequence():
   self.__log = logger
      
   self.__tree = None
+  self.__seqFile = None # "tsq": TimeSeqReader
 
   if fileType == 'xml': 
      self.__ReadXML()
+  elif fileType == 'tsq':
+     self.__ReadTSQ()
+  elif fileType == 'reader':
+     assert reader is not None, 'must give a reader; stop.'
+     assert reader.GetRootNode() is not None, 'reader has no data; stop.'
+     self.__tree = ElementTree.ElementTree( reader.GetRootNode() )
+     self.__seqFile = reader
+  elif fileType == 'memory':
+     assert rootNode is not None, 'must give a rootNode; stop.'
+     assert rootNode.tag == 'time-sequence', 'invalid format.'
+     self.__tree = ElementTree.ElementTree( rootNode )
 
 #  s = 'TimeSequence::__init__(): built object'
 #  self.__log.debug(s)
@@ -86,67 +106,121 @@ class TimeSequence():
   return names
 
  def GetVariables(self):
-  variables = dict() # variables[(name,unit,timeUnit,legend)] = [(time,val),(time,val),..,]
+  variables = dict() # variables[(name,unit,timeUnit,legend,scale)] = array of (time,val) rows
+  if self.__seqFile is not None:
+     return self.__GetTSQVariables()
   root = self.__tree.getroot()
-  timeNode = root.find('time')
-  timeUnit = timeNode.get('unit').strip()
-  varNodes       = root.findall('var')
+  specs = self.__GetSpecs()
   timeStampNodes = root.findall('timeStamp')
-  for ivar in range(len(varNodes)):
-    name   = varNodes[ivar].get('name').strip()
-    unit   = varNodes[ivar].get('unit').strip()
-    legend = varNodes[ivar].get('legend').strip()
-    scale  = varNodes[ivar].get('scale')
-    if scale is None: 
-      spec   = (name,unit,timeUnit,legend,'linear')
-    else:
-      scale  = scale.strip()
-      assert scale == 'log' or scale == 'linear' or scale == 'log-log' or \
-             scale == 'linear-linear' or scale == 'log-linear' or \
-             scale == 'linear-log' 
-      spec   = (name,unit,timeUnit,legend,scale)
-    timeValues = list()
-    for ts in timeStampNodes:
-      time = float(ts.get('value').strip())
-      if time >= self.__initialTime and time <= self.__finalTime:
-        data = ts.text.strip().split(',')
-        assert len(data) >= 1, 'empty data field in the %r variable; stop.' % name
+  # parse each time stamp once: rows of (time, value of each variable)
+  rows = list()
+  for ts in timeStampNodes:
+    time = float(ts.get('value').strip())
+    if time >= self.__initialTime and time <= self.__finalTime:
+      data = ParseValues( ts.text )
+      assert len(data) >= 1, 'empty data field in a time stamp; stop.'
 # Accept missing data and fill in as zero; or neglect excess of data
-#        if ivar == 0: 
-#           assert len(data) == len(varNodes), '# variables %r != # values %r' % (len(data),len(varNodes))
-        if len(data) >= len(varNodes):
-           timeValues.append( (time, float(data[ivar])) )
-        else:
-           timeValues.append( (time, float(0.0)) )
-    variables[spec] = timeValues
-
+      row = np.zeros( 1+len(specs) )
+      row[0] = time
+      if len(data) >= len(specs):
+        row[1:] = data[:len(specs)]
+      rows.append( row )
+  records = np.array( rows )
+  for (ivar,spec) in enumerate(specs):
+    if len(rows) == 0:
+      variables[spec] = list()
+    else:
+      variables[spec] = records[:,[0,ivar+1]]
   return variables
 
 #*********************************************************************************
 # Helper internal methods
 
+#---------------------------------------------------------------------------------
+# (name,unit,timeUnit,legend,scale) of all variables
+ def __GetSpecs(self):
+  specs = list()
+  root = self.__tree.getroot()
+  timeUnit = root.find('time').get('unit').strip()
+  for varNode in root.findall('var'):
+    name   = varNode.get('name').strip()
+    unit   = varNode.get('unit').strip()
+    legend = varNode.get('legend').strip()
+    scale  = varNode.get('scale')
+    if scale is None:
+      scale = 'linear'
+    scale = scale.strip()
+    assert scale == 'log' or scale == 'linear' or scale == 'log-log' or \
+           scale == 'linear-linear' or scale == 'log-linear' or \
+           scale == 'linear-log' 
+    specs.append( (name,unit,timeUnit,legend,scale) )
+  return specs
+
+#---------------------------------------------------------------------------------
+# variables of a binary time sequence (or reader): one (n,2) array of (time,val) rows per
+# variable (a copy); an empty list if no time stamp is in the time window
+ def __GetTSQVariables(self):
+  variables = dict()
+  records = self.__seqFile.GetRecordsInWindow( self.__initialTime, self.__finalTime )
+  for (ivar,spec) in enumerate(self.__GetSpecs()):
+    if len(records) == 0:
+      variables[spec] = list()
+    else:
+      variables[spec] = np.array( records[:,[0,ivar+1]] )
+  return variables
+
+#---------------------------------------------------------------------------------
+ def __ReadTSQ(self):
+
+  s = 'TimeSequence::__ReadTSQ(): try reading: '+ self.__fileName
+  self.__log.debug(s)
+
+  seqFile = TimeSeqReader( self.__fileName )
+  self.__tree = ElementTree.ElementTree( seqFile.GetRootNode() )
+  self.__seqFile = seqFile
+
+  # wait for the final time stamp; only records appended meanwhile are mapped
+  watcher = FileWatcher( [self.__fileName], 1.0 )
+  while True:
+    lastTime = seqFile.GetLastTimeStamp()
+    if lastTime is not None and lastTime >= self.__finalTime: break
+    if seqFile.Update() == 0:
+      s = 'TimeSequence(): '+self.__fileName+' has no timeStamp = '+str(self.__finalTime)+' yet. Waiting...'
+      self.__log.debug(s)
+      watcher.wait()
+  watcher.close()
+
+  return
+
 #---------------------------------------------------------------------------------
  def __ReadXML(self):
 
   s = 'TimeSequence::__ReadXML(): try reading: '+ self.__fileName
   self.__log.debug(s)
 
-  found = False
+  # re-read the file when it changes (file notifications) until the final time
+  # stamp shows up
+  watcher = FileWatcher( [self.__fileName], 1.0 )
+  try:
+    self.__WaitXML( watcher )
+  finally:
+    watcher.close()
 
-  while found is False:
+  return 
+
+#---------------------------------------------------------------------------------
+ def __WaitXML(self, watcher):
+
+  while True:
 
     try:
-      mutex = Lock()
-      mutex.acquire()
       tree = ElementTree.parse( self.__fileName )
-    except ElementTree.ParseError as error:
-      mutex.release()
-      s = 'TimeSequence(): '+self.__fileName+' unavailable. Error code: '+str(error.code)+'; File position: '+str(error.position)+'. Retrying...'
+    except (ElementTree.ParseError, FileNotFoundError) as error:
+      s = 'TimeSequence(): '+self.__fileName+' unavailable: '+str(error)+'. Waiting...'
       self.__log.debug(s)
-      time.sleep(0.1)
+      watcher.wait()
       continue
 
-    mutex.release()
     self.__tree = tree
     rootNode = self.__tree.getroot()
     assert rootNode.tag == 'time-sequence', 'invalid format.'
@@ -168,9 +242,11 @@ class TimeSequence():
 
       if timeStamp == self.__finalTime: return
 
-  # end of while found is False
+    s = 'TimeSequence(): '+self.__fileName+' has no timeStamp = '+str(self.__finalTime)+' yet. Waiting...'
+    self.__log.debug(s)
+    watcher.wait()
 
-  return 
+  # end of while True
 
 #*********************************************************************************
 # Unit testing. Usage: -> python configtree.py
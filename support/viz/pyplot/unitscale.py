@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+"""
+Pyplot module.
+
+Units of the time-sequence and time-tables variables for display. A UnitScale is
+built once per unit (see GetUnitScale()) with the canonical unit name ('gram/min'
+is 'g/min'), and a table of the display factors and unit names of each order of
+magnitude; normalizing the data of a variable is then one reduction (the largest
+magnitude) and a table lookup:
+
+  magnitude   < 1e-6    1e-6..1e-3   1e-3..1e-1   1e-1..1e3   >= 1e3
+  factor        1e9        1e6          1e3          1          1e-3
+  g             ng         ug           mg           g          kg
+  cc            n-cc       u-cc         m-cc         cc         L
+  g/min         ng/min     ug/min       mg/min       g/min      kg/min
+  (no unit)     x1e-9      x1e-6        x1e-3                   x1e3
+
+A unit with no table (e.g. 'mol/L') is not rescaled. Time units ('s', 'min') are
+rescaled to the next unit ('min', 'h') beyond 120 of them.
+
+Modules that publish time sequences may use NormalUnit() to write canonical unit
+names, and ParseValues() parses the comma separated values of the XML files.
+"""
+#*********************************************************************************
+import numpy as np
+#*********************************************************************************
+
+# alternative names of units (also of the terms of compound units, e.g. gram/min)
+_Aliases = { 'gram':'g', 'grams':'g', 'sec':'s', 'second':'s', 'seconds':'s',
+             'minute':'min', 'minutes':'min', 'hour':'h', 'hours':'h',
+             'liter':'L', 'litre':'L', 'l':'L' }
+
+# units prefixed by order of magnitude: nano, micro, milli, (none), kilo
+_Prefixed = { 'g'  : ('ng',    'ug',    'mg',    'g',  'kg'),
+              'cc' : ('n-cc',  'u-cc',  'm-cc',  'cc', 'L'),
+              'L'  : ('nL',    'uL',    'mL',    'L',  'kL'),
+              'W'  : ('nW',    'uW',    'mW',    'W',  'kW'),
+              'Ci' : ('nCi',   'uCi',   'mCi',   'Ci', 'kCi'),
+              'Pa' : ('nPa',   'uPa',   'mPa',   'Pa', 'kPa'),
+              's'  : ('ns',    'us',    'ms',    's',  'ks'),
+              ''   : ('x1e-9', 'x1e-6', 'x1e-3', '',   'x1e3') }
+
+_Factors = np.array( [1e9, 1e6, 1e3, 1.0, 1e-3] )
+_Bounds  = np.array( [1e-6, 1e-3, 1e-1, 1e3] )  # lower bounds of the magnitudes
+
+# time units: (next unit, its size, magnitude from which to use it)
+_TimeUnits = { 's':('min',60.0,120.0), 'min':('h',60.0,120.0) }
+
+_Scales = dict()  # (unit, time) -> UnitScale
+
+#*********************************************************************************
+# Canonical name of a unit, e.g. 'gram/min' -> 'g/min'
+def NormalUnit( unit ):
+  terms = [ t.strip() for t in unit.strip().split('/') ]
+  return '/'.join( [ _Aliases.get(t,t) for t in terms ] )
+
+# NumPy array of comma separated values, e.g. the text of a timeStamp element
+def ParseValues( text ):
+  if text is None: return np.empty(0)
+  text = text.strip()
+  if len(text) == 0: return np.empty(0)
+  return np.array( text.split(','), dtype=np.float64 )
+
+# UnitScale of a unit (time: of a time unit); built once per unit
+def GetUnitScale( unit, time=False ):
+  key = (unit, time)
+  scale = _Scales.get( key )
+  if scale is None:
+     scale = UnitScale( unit, time )
+     _Scales[ key ] = scale
+  return scale
+
+#*********************************************************************************
+class UnitScale():
+
+ def __init__( self,
+               unit,          # unit name as published, e.g. 'gram/min'
+               time = False   # a time unit
+             ):
+
+     assert type(unit) is str, 'unit %r invalid.'%(unit)
+
+     self._unit = NormalUnit( unit )
+
+     if time is True:
+        (nextUnit,size,bound) = _TimeUnits.get( self._unit, (self._unit,1.0,np.inf) )
+        self._factors = np.array( [1.0, 1.0/size] )
+        self._bounds  = np.array( [bound] )
+        self._units   = (self._unit, nextUnit)
+        self._lowest  = 0
+        return
+
+     # the prefix applies to the first term: g/min -> kg/min
+     terms = self._unit.split('/',1)
+     prefixed = _Prefixed.get( terms[0] )
+
+     if prefixed is None:
+        self._factors = np.array( [1.0] )
+        self._bounds  = np.array( [] )
+        self._units   = (self._unit,)
+        self._lowest  = 0
+        return
+
+     per = '/'+terms[1] if len(terms) == 2 else ''
+     self._factors = _Factors
+     self._bounds  = _Bounds
+     self._units   = tuple( [ u+per for u in prefixed ] )
+     self._lowest  = 3   # zero data are not rescaled
+
+     return
+
+#---------------------------------------------------------------------------------
+# Accessors
+
+ # canonical unit name
+ def GetUnit(self):
+     return self._unit
+
+ # (factor, display unit) for data of the largest magnitude given
+ def GetFactor(self, magnitude):
+     if magnitude == 0.0 or not np.isfinite(magnitude):
+        i = self._lowest
+     else:
+        i = int( np.searchsorted( self._bounds, magnitude, side='right' ) )
+     return (float(self._factors[i]), self._units[i])
+
+ # (data in the display unit, display unit); data is not changed
+ def Normalize(self, data):
+     data = np.asarray( data, dtype=np.float64 )
+     if data.size == 0 or len(self._factors) == 1:
+        return (data, self._units[self._lowest])
+     (factor,unit) = self.GetFactor( float( np.abs(data).max() ) )
+     if factor == 1.0:
+        return (data, unit)
+     return (data * factor, unit)
+
+ def __repr__(self):
+     return 'UnitScale(%r: %r)'%(self._unit, self._units)
+
+#*********************************************************************************
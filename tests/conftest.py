@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+Test setup: the repository is imported as the cortix package (as when copied to
+its own cortix/ directory, see README.md), and helpers to build module slots run
+by real launchers.
+"""
+#*********************************************************************************
+import os
+import sys
+import uuid
+import importlib.util
+import pytest
+#*********************************************************************************
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if 'cortix' not in sys.modules:
+    spec = importlib.util.spec_from_file_location('cortix', \
+           os.path.join(ROOT, '__init__.py'), submodule_search_locations=[ROOT])
+    cortix = importlib.util.module_from_spec(spec)
+    sys.modules['cortix'] = cortix
+    spec.loader.exec_module(cortix)
+
+PARAM = """<?xml version="1.0" encoding="UTF-8"?>
+<cortix_param>
+<start_time unit="minute">0.0</start_time>
+<evolve_time unit="minute">%(evolve_time)s</evolve_time>
+<time_step unit="minute">1.0</time_step>
+%(extra)s
+</cortix_param>"""
+
+class SlotFactory:
+    """
+    Writes module drivers into a fresh module library and the files of their
+    slots; returns the run_launcher() arguments of a slot.
+    """
+
+    def __init__(self, work_dir):
+
+        self.work_dir = str(work_dir) + '/'
+        self.lib_name = 'lib_' + uuid.uuid4().hex[:8]
+        os.makedirs(self.work_dir + self.lib_name)
+        open(self.work_dir + self.lib_name + '/__init__.py', 'w').close()
+
+    def write_param(self, evolve_time=10.0, extra=''):
+
+        file_name = self.work_dir + 'cortix-param.xml'
+        with open(file_name, 'w') as fout:
+            fout.write(PARAM % {'evolve_time': evolve_time, 'extra': extra})
+
+        return file_name
+
+    def get_launcher_args(self, module_name, driver_source, ports_xml, \
+                          param_file, memory_ports=None, conductor=None, \
+                          restart_step=None):
+
+        module_dir = self.work_dir + self.lib_name + '/' + module_name + '/'
+        if not os.path.isdir(module_dir):
+            os.makedirs(module_dir)
+            open(module_dir + '__init__.py', 'w').close()
+        with open(module_dir + 'cortix-driver.py', 'w') as fout:
+            fout.write(driver_source)
+
+        slot_dir = self.work_dir + module_name + '_0/'
+        os.makedirs(slot_dir + 'wrk/', exist_ok=True)
+        comm_file = slot_dir + 'cortix-comm.xml'
+        with open(comm_file, 'w') as fout:
+            fout.write('<cortix_comm>\n' + ports_xml + '</cortix_comm>')
+        input_file = slot_dir + 'input'
+        open(input_file, 'w').close()
+
+        return (self.work_dir, self.lib_name, module_name, 0, input_file, \
+                'none', slot_dir + 'wrk/', param_file, comm_file, \
+                slot_dir + 'runtime-status.xml', memory_ports, False, \
+                conductor, restart_step)
+
+@pytest.fixture
+def slot_factory(tmp_path):
+    return SlotFactory(tmp_path)
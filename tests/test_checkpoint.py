@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+Tests of slot checkpoint/restart: the checkpoint files, the driver state they
+hold, the consistent restart step of a task, and a launcher resuming after a
+crash.
+"""
+#*********************************************************************************
+import os
+import threading
+import pytest
+from cortix.src.checkpoint import get_checkpoint_file, get_checkpoint_steps
+from cortix.src.checkpoint import write_checkpoint, read_checkpoint
+from cortix.src.checkpoint import get_restart_step
+from cortix.src.launcher import run_launcher
+#*********************************************************************************
+
+class Driver:
+
+    def __init__(self, ports=None):
+        self.ports = ports
+        self.total = 0
+        self.lock = threading.Lock() # not picklable: left out
+
+class StatefulDriver(Driver):
+
+    def GetState(self):
+        return {'total': self.total}
+
+    def SetState(self, state):
+        self.total = state['total'] * 10
+
+def test_attributes_restored_except_excluded(tmp_path):
+    ports = ['port']
+    driver = Driver(ports)
+    driver.total = 7
+    write_checkpoint(str(tmp_path), 4, 4.0, driver, exclude=[ports])
+
+    restored = Driver(['new port'])
+    lock = restored.lock
+    assert read_checkpoint(str(tmp_path), 4, restored) == 4.0
+    assert restored.total == 7
+    assert restored.ports == ['new port']
+    assert restored.lock is lock
+
+def test_get_state_takes_precedence(tmp_path):
+    driver = StatefulDriver()
+    driver.total = 3
+    write_checkpoint(str(tmp_path), 2, 2.0, driver)
+    restored = StatefulDriver()
+    read_checkpoint(str(tmp_path), 2, restored)
+    assert restored.total == 30
+
+def test_older_checkpoints_are_pruned(tmp_path):
+    driver = Driver()
+    for step in (2, 4, 6, 8):
+        write_checkpoint(str(tmp_path), step, float(step), driver, keep=2)
+    assert get_checkpoint_steps(str(tmp_path)) == [6, 8]
+    assert not os.path.exists(get_checkpoint_file(str(tmp_path), 8) + '.tmp')
+    (tmp_path / 'checkpoint-notastep.pkl').write_bytes(b'')
+    assert get_checkpoint_steps(str(tmp_path)) == [6, 8]
+
+def test_restart_step_is_common_to_all_slots(tmp_path):
+    for (slot, steps) in (('a_0', (4, 6)), ('b_0', (2, 4)), ('c_0', ())):
+        work_dir = tmp_path / slot / 'wrk'
+        work_dir.mkdir(parents=True)
+        for step in steps:
+            write_checkpoint(str(work_dir), step, float(step), Driver(), keep=5)
+    assert get_restart_step(str(tmp_path), ['a_0', 'b_0']) == 4
+    assert get_restart_step(str(tmp_path), ['a_0', 'b_0', 'c_0']) is None
+
+# counts the executed time steps; crashes once at time 5 if told to
+COUNTER = """
+import os
+class CortixDriver:
+    def __init__(self, slot_id, input_file, exec_file, work_dir, ports,
+                 start_time, final_time):
+        self.work_dir = work_dir
+        self.final_time = final_time
+        self.total = 0
+    def CallPorts(self, facility_time):
+        pass
+    def Execute(self, facility_time, time_step):
+        crash_file = os.path.join(self.work_dir, 'crash')
+        if facility_time == 5.0 and os.path.isfile(crash_file):
+            os.remove(crash_file)
+            raise RuntimeError('crash at 5')
+        self.total += 1
+        if facility_time + time_step > self.final_time:
+            with open(os.path.join(self.work_dir, 'total'), 'w') as fout:
+                fout.write(str(self.total))
+"""
+
+def test_launcher_resumes_from_its_checkpoint(slot_factory):
+    param_file = slot_factory.write_param(evolve_time=10.0, \
+                 extra='<checkpoint interval="2" keep="2"/>')
+    args = slot_factory.get_launcher_args('counter', COUNTER, '', param_file)
+    work_dir = args[6]
+    open(os.path.join(work_dir, 'crash'), 'w').close()
+
+    with pytest.raises(RuntimeError, match='crash at 5'):
+        run_launcher(*args)
+    assert get_checkpoint_steps(work_dir) == [2, 4]
+
+    restart_step = get_restart_step(slot_factory.work_dir, ['counter_0'])
+    assert restart_step == 4
+    run_launcher(*(args[:-1] + (restart_step,)))
+
+    # steps 0 to 10: 4 before the checkpoint and 7 after the restart
+    with open(os.path.join(work_dir, 'total'), 'r') as fin:
+        assert int(fin.read()) == 11
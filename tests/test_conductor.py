@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+Tests of the time conductor: the dependencies of the coupling schemes, waiting on
+and failing of the slots, and lockstep launchers exchanging the data of the right
+time step.
+"""
+#*********************************************************************************
+import time
+import threading
+import pytest
+import networkx as nx
+from cortix.src.conductor import TimeConductor, FINISHED
+from cortix.src.conductor import get_slot_dependencies, get_completed_step
+from cortix.src.memoryport import MemoryPortHub
+from cortix.src.launcher import run_launcher
+#*********************************************************************************
+
+@pytest.fixture
+def conductor():
+    conductor = TimeConductor()
+    yield conductor
+    conductor.shutdown()
+
+def get_graph(edges):
+    graph = nx.DiGraph()
+    graph.add_edges_from(edges)
+    return graph
+
+def test_dependencies_of_a_chain():
+    graph = get_graph([('a', 'b')])
+    assert get_slot_dependencies(graph, 'jacobi') == {'a': {'b': 1}, 'b': {'a': 1}}
+    assert get_slot_dependencies(graph, 'gauss-seidel') == \
+           {'a': {'b': 1}, 'b': {'a': 0}}
+    assert get_slot_dependencies(graph, 'pipelined') == \
+           {'a': {'b': 1.5}, 'b': {'a': 0}}
+
+def test_feedback_loop_is_lagged():
+    graph = get_graph([('a', 'b'), ('b', 'a'), ('b', 'c')])
+    dependencies = get_slot_dependencies(graph, 'gauss-seidel')
+    assert dependencies['a'] == {'b': 1}
+    assert dependencies['b'] == {'a': 1, 'c': 1}
+    assert dependencies['c'] == {'b': 0}
+
+def test_invalid_scheme():
+    with pytest.raises(AssertionError):
+        get_slot_dependencies(get_graph([('a', 'b')]), 'red-black')
+
+def wait_in_thread(slot, step):
+    outcome = dict()
+
+    def target():
+        try:
+            slot.wait_dependencies(step)
+            outcome['done'] = True
+        except Exception as error:
+            outcome['error'] = error
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+
+    return (thread, outcome)
+
+def test_wait_until_published(conductor):
+    a = conductor.get_slot_conductor('a', {'b': 1})
+    b = conductor.get_slot_conductor('b', {'a': 0})
+    a.wait_dependencies(0) # nothing to wait for on step 0
+    (thread, outcome) = wait_in_thread(b, 0)
+    time.sleep(0.2)
+    assert thread.is_alive()
+    a.publish(0)
+    thread.join(10.0)
+    assert outcome == {'done': True}
+    assert conductor.get_steps() == {'a': 0}
+
+def test_publish_ports_is_a_half_step(conductor):
+    a = conductor.get_slot_conductor('a', {'b': 1.5})
+    b = conductor.get_slot_conductor('b', {'a': 0})
+    a.publish(0)
+    (thread, outcome) = wait_in_thread(a, 1)
+    time.sleep(0.2)
+    assert thread.is_alive()
+    b.publish_ports(0)
+    thread.join(10.0)
+    assert outcome == {'done': True}
+    assert b.get_step() == -1
+    assert get_completed_step(2.5) == 2
+    assert get_completed_step(FINISHED) == FINISHED
+
+def test_failed_dependency_raises(conductor):
+    a = conductor.get_slot_conductor('a', {'b': 1})
+    b = conductor.get_slot_conductor('b', {'a': 0})
+    (thread, outcome) = wait_in_thread(b, 3)
+    a.finish(failed=True)
+    thread.join(10.0)
+    assert isinstance(outcome.get('error'), RuntimeError)
+    b.finish()
+    a.wait_dependencies(100) # a finished slot holds nobody back
+
+PROVIDER = """
+class CortixDriver:
+    def __init__(self, slot_id, input_file, exec_file, work_dir, ports,
+                 start_time, final_time):
+        self.port = [port for (name, kind, port) in ports if name == 'x'][0]
+    def CallPorts(self, facility_time):
+        self.port.put(facility_time, facility_time)
+    def Execute(self, facility_time, time_step):
+        pass
+"""
+
+# a slow user: its provider would run steps ahead without the conductor
+USER = """
+import time
+class CortixDriver:
+    def __init__(self, slot_id, input_file, exec_file, work_dir, ports,
+                 start_time, final_time):
+        self.port = [port for (name, kind, port) in ports if name == 'x'][0]
+    def CallPorts(self, facility_time):
+        (time_stamp, data) = self.port.get(facility_time)
+        assert data == facility_time, 'got %%r at %%r' %% (data, facility_time)
+    def Execute(self, facility_time, time_step):
+        time.sleep(%(sleep)s)
+"""
+
+@pytest.mark.parametrize('scheme', ['jacobi', 'gauss-seidel', 'pipelined'])
+def test_lockstep_users_get_the_data_of_their_step(scheme, conductor, \
+                                                   slot_factory):
+    hub = MemoryPortHub()
+    try:
+        param_file = slot_factory.write_param(evolve_time=6.0)
+        key = 'prod_0/x'
+        memory_ports = {key: hub.get_port(key)}
+        dependencies = get_slot_dependencies(get_graph([('prod_0', 'cons_0')]), \
+                                             scheme)
+        args = [slot_factory.get_launcher_args('prod', PROVIDER, \
+                '<port name="x" type="provide" memory="%s"/>\n' % key, \
+                param_file, memory_ports, \
+                conductor.get_slot_conductor('prod_0', dependencies['prod_0'])),
+                slot_factory.get_launcher_args('cons', USER % {'sleep': 0.05}, \
+                '<port name="x" type="use" memory="%s"/>\n' % key, \
+                param_file, memory_ports, \
+                conductor.get_slot_conductor('cons_0', dependencies['cons_0']))]
+
+        errors = list()
+
+        def launch(launcher_args):
+            try:
+                run_launcher(*launcher_args)
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=launch, args=(launcher_args,), \
+                                    daemon=True) for launcher_args in args]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(60.0)
+
+        assert not any(thread.is_alive() for thread in threads)
+        assert errors == list()
+        assert conductor.get_steps() == {'prod_0': FINISHED, 'cons_0': FINISHED}
+    finally:
+        hub.shutdown()
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+Tests of PortExchange: exchange intervals and change thresholds of a connection.
+"""
+#*********************************************************************************
+import numpy as np
+import pytest
+from cortix.src.exchange import PortExchange
+from cortix.src.exchange import is_exchange_step, has_changed, get_numeric_copy
+from cortix.src.memoryport import MemoryPortHub
+#*********************************************************************************
+
+@pytest.fixture
+def hub():
+    hub = MemoryPortHub()
+    yield hub
+    hub.shutdown()
+
+class CountingPort:
+    """
+    Wraps a MemoryPort and counts the data sent and touched.
+    """
+
+    def __init__(self, port):
+        self.port = port
+        self.n_puts = 0
+        self.n_touches = 0
+        self.n_gets = 0
+
+    def get_key(self):
+        return self.port.get_key()
+
+    def put(self, time_stamp, data):
+        self.n_puts += 1
+        self.port.put(time_stamp, data)
+
+    def touch(self, time_stamp):
+        self.n_touches += 1
+        self.port.touch(time_stamp)
+
+    def get(self, time_stamp=None, timeout=None):
+        self.n_gets += 1
+        return self.port.get(time_stamp, timeout)
+
+    def has_data(self, time_stamp=None):
+        return self.port.has_data(time_stamp)
+
+def test_exchange_steps():
+    assert all(is_exchange_step(step, None) for step in range(5))
+    assert [step for step in range(10) if is_exchange_step(step, (3,))] == \
+           [0, 3, 6, 9]
+    assert [step for step in range(10) if is_exchange_step(step, (3, 4))] == \
+           [0, 3, 4, 6, 8, 9]
+    # a macro step of 2 time steps exchanges if a multiple of 3 falls in it
+    assert [step for step in range(0, 10, 2) if is_exchange_step(step, (3,), 2)] \
+           == [0, 2, 6, 8]
+
+def test_interval_drops_puts_and_keeps_gets(hub):
+    port = hub.get_port('prod_0/x')
+    provider = CountingPort(port)
+    user = CountingPort(port)
+    provide = PortExchange(provider, 'provide', intervals=(2,), start_time=0.0, \
+                           time_step=1.0)
+    use = PortExchange(user, 'use', intervals=(2,), start_time=0.0, \
+                       time_step=1.0)
+
+    for step in range(5):
+        provide.put(float(step), step)
+        assert use.get(float(step)) == (2.0 * (step // 2), 2 * (step // 2))
+
+    assert provider.n_puts == 3
+    assert user.n_gets == 3
+
+def test_threshold_touches_unchanged_data(hub):
+    port = hub.get_port('prod_0/x')
+    provider = CountingPort(port)
+    provide = PortExchange(provider, 'provide', threshold=0.1)
+
+    provide.put(0.0, [10.0, 20.0])
+    provide.put(1.0, [10.5, 20.0]) # within 10% of 20
+    provide.put(2.0, [10.0, 25.0])
+    provide.put(3.0, 'not numeric')
+
+    assert provider.n_puts == 3
+    assert provider.n_touches == 1
+    assert port.get(1.0) == (3.0, 'not numeric')
+
+def test_has_changed():
+    previous = get_numeric_copy([1.0, 2.0])
+    assert not has_changed(previous, [1.0, 2.1], 0.1)
+    assert has_changed(previous, [1.0, 2.3], 0.1)
+    assert has_changed(previous, [1.0, 2.0, 3.0], 0.1)
+    assert has_changed(None, [1.0], 0.1)
+    assert has_changed(get_numeric_copy([0.0]), [0.2], 0.1)
+    assert not has_changed(get_numeric_copy(np.zeros(0)), np.zeros(0), 0.1)
+    assert get_numeric_copy({'a': 1}) is None
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+Tests of the formula registry of Specie against the per-object parsing it replaces.
+"""
+#*********************************************************************************
+import pytest
+from cortix.support.specie.interface import Specie
+from cortix.support.specie._formularegistry import _GetFormulaData
+from cortix.support.specie._formularegistry import _GetReorderedFormula
+from cortix.support.specie._formularegistry import _GetRegistryInfo
+from cortix.support.periodictable import ELEMENTS
+#*********************************************************************************
+
+FORMULAS = [['U-235'], ['U'], ['O'], ['U-235', '2*O'], ['2*H', 'O-16'], \
+            ['0.5*Pu-239', '0.5*Pu-240', '2*O'], ['3.2*O-18', '1e-3*Cs', 'O-18'], \
+            ['Am-242m'], [], ['1.5*Sr-90', '2.5*Sr-90']]
+
+def get_expected(atoms):
+    """
+    (molar mass, number of atoms, number of nuclide types) as computed by
+    _UpdateMolarMass() one Specie at a time.
+    """
+
+    nuclides = dict()
+    n_atoms = 0
+    molar_mass = 0.0
+    for entry in atoms:
+        tmp = entry.split('*')
+        multiple = 1.0 if len(tmp) == 1 else float(tmp[0])
+        nuclide = tmp[-1]
+        nuclides[nuclide] = multiple
+        n_atoms += multiple
+        tmp = nuclide.split('-')
+        try:
+            if len(tmp) == 1:
+                mass = ELEMENTS[tmp[0]].exactmass
+                if mass == 0.0:
+                    mass = ELEMENTS[tmp[0]].mass
+            else:
+                mass = ELEMENTS[tmp[0]].isotopes[int(tmp[1].strip('m'))].mass
+        except KeyError:
+            mass = 0.0
+        molar_mass += multiple * mass
+    return (molar_mass, n_atoms, len(nuclides))
+
+@pytest.mark.parametrize('atoms', FORMULAS)
+def test_matches_per_specie_parsing(atoms):
+    (molar_mass, n_atoms, n_nuclide_types) = get_expected(atoms)
+    specie = Specie(name='x', atoms=list(atoms))
+    if len(atoms) > 0:
+        assert specie.molarMass == pytest.approx(molar_mass)
+        assert specie.nAtoms == pytest.approx(n_atoms)
+        assert specie.nNuclideTypes == n_nuclide_types
+    data = _GetFormulaData(atoms)
+    assert data.molarMass == pytest.approx(molar_mass)
+    assert data.nAtoms == pytest.approx(n_atoms)
+    assert data.nNuclideTypes == n_nuclide_types
+
+def test_registry_hits():
+    atoms = ['0.25*U-238', '0.75*Np-237', '2*O']
+    _GetFormulaData(atoms)
+    before = _GetRegistryInfo()
+    specie = Specie(name='y', atoms=list(atoms))
+    after = _GetRegistryInfo()
+    assert after.hits > before.hits
+    assert after.misses == before.misses
+    assert specie._formulaData is _GetFormulaData(atoms)
+
+def test_reordered_formula_is_a_new_list():
+    atoms = ['2*O', '1*U-235', '3*C']
+    first = _GetReorderedFormula(atoms)
+    assert first == ['3.000e+00*C', '2.000e+00*O', '1.000e+00*U-235']
+    first.append('H')
+    second = _GetReorderedFormula(atoms)
+    assert second == ['3.000e+00*C', '2.000e+00*O', '1.000e+00*U-235']
+    assert second is not _GetReorderedFormula(atoms)
+    assert _GetReorderedFormula(['0.5*O', '3*U']) == ['3.000e+00*U', '5.000e-01*O']
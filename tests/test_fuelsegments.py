@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+Tests of the FuelSegmentsGroups attributes against the per-segment sums they
+replace, including segments changed in place and removed from a group.
+"""
+#*********************************************************************************
+import pandas
+import pytest
+from cortix.support.specie.interface import Specie
+from cortix.support.fuelsegments.fuelsegment import FuelSegment
+from cortix.support.fuelsegments.fuelsegmentsgroups import FuelSegmentsGroups
+#*********************************************************************************
+
+ATTRIBUTES = ['fuelVolume', 'fuelLength', 'fuelDiameter', 'mass', 'massDens', \
+              'massCC', 'gamma', 'gammaDens', 'heat', 'heatDens']
+
+def get_segment(segment_id, length):
+    geometry = pandas.Series({'segment id': segment_id, 'fuel length [cm]': length, \
+                              'fuel diameter [cm]': 0.5, \
+                              'cladding length [cm]': length, 'OD [cm]': 0.6})
+    species = [Specie(name='UO2', atoms=['U-235', '2*O'], \
+                      molarCC=0.1 * segment_id, massCC=27.0 * segment_id), \
+               Specie(name='PuO2', atoms=['0.5*Pu-239', '0.5*Pu-240', '2*O'], \
+                      molarCC=0.05, massCC=13.5)]
+    species[0].molarHeatPwr = 2.0
+    species[1].molarGammaPwr = 3.0
+    return FuelSegment(geometry, species)
+
+def get_expected(segments, attribute_name, symbol=None, series=None):
+    """
+    The group attribute from the segments, one at a time: densities averaged.
+    """
+
+    total = sum(seg.GetAttribute(attribute_name, symbol, series) for seg in segments)
+    if attribute_name.endswith('Dens') or attribute_name.endswith('CC'):
+        total /= len(segments)
+    return total
+
+def check_group(groups, key, segments):
+    assert groups.GetAttribute(key, 'nSegments') == len(segments)
+    assert isinstance(groups.GetAttribute(key, 'nSegments'), int)
+    for name in ATTRIBUTES:
+        assert groups.GetAttribute(key, name) == \
+               pytest.approx(get_expected(segments, name)), name
+    for (symbol, series) in (('U-235', None), ('Pu', None), (None, 'actinides')):
+        for name in ('mass', 'massDens'):
+            assert groups.GetAttribute(key, name, symbol, series) == \
+                   pytest.approx(get_expected(segments, name, symbol, series))
+
+def test_group_attributes_match_segment_sums():
+    segments = [get_segment(i, 10.0 * i) for i in range(1, 4)]
+    groups = FuelSegmentsGroups('a', segments[:2])
+    groups.AddGroup('b', segments[2:])
+    check_group(groups, 'a', segments[:2])
+    check_group(groups, 'b', segments[2:])
+
+    # all groups: extensive attributes summed, densities averaged over the groups
+    assert groups.GetAttribute(None, 'nSegments') == 3
+    assert groups.GetAttribute(None, 'mass') == \
+           pytest.approx(get_expected(segments, 'mass'))
+    assert groups.GetAttribute(None, 'massDens') == \
+           pytest.approx((get_expected(segments[:2], 'massDens') + \
+                          get_expected(segments[2:], 'massDens')) / 2.0)
+    assert groups.GetAttribute(None, 'mass', 'U-235') == \
+           pytest.approx(get_expected(segments, 'mass', 'U-235'))
+
+def test_segments_changed_in_place():
+    segments = [get_segment(i, 10.0 * i) for i in range(1, 3)]
+    groups = FuelSegmentsGroups('a', segments)
+    check_group(groups, 'a', segments)
+
+    segments[0].geometry['fuel length [cm]'] = 100.0
+    assert groups.GetAttribute('a', 'fuelVolume') == \
+           pytest.approx(get_expected(segments, 'fuelVolume'))
+    check_group(groups, 'a', segments)
+
+    segments[1].species.pop()
+    assert groups.GetAttribute('a', 'mass') == \
+           pytest.approx(get_expected(segments, 'mass'))
+    check_group(groups, 'a', segments)
+
+    segments[0].species[0].atoms = ['U-238', '2*O']
+    check_group(groups, 'a', segments)
+
+def test_remove_fuel_segments():
+    segments = [get_segment(i, 10.0 * i) for i in range(1, 7)]
+    groups = FuelSegmentsGroups('a', list(segments))
+    check_group(groups, 'a', segments)
+
+    groups.RemoveFuelSegment('a', segments[1])
+    del segments[1]
+    check_group(groups, 'a', segments)
+
+    # more than half the rows dead: the block is compacted
+    for seg in segments[:3]:
+        groups.RemoveFuelSegment('a', seg)
+    del segments[:3]
+    assert groups.GetFuelSegments('a') == segments
+    check_group(groups, 'a', segments)
+
+    segments[0].geometry['fuel length [cm]'] = 1.0
+    check_group(groups, 'a', segments)
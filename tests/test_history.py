@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+Tests of the History table and of the Phase container: copy-on-write snapshots
+(Copy()).
+"""
+#*********************************************************************************
+import copy
+import numpy as np
+from cortix.support.history import History
+from cortix.support.phase.interface import Phase
+from cortix.support.specie.interface import Specie
+from cortix.support.quantity import Quantity
+#*********************************************************************************
+
+def get_history(n_rows=3):
+    history = History(0.0, ['a', 'b'], 1.0)
+    for i in range(1, n_rows):
+        history.AddRow(float(i), [float(i), 10.0 * i])
+    return history
+
+def test_snapshot_shares_until_written():
+    history = get_history()
+    snapshot = history.Copy()
+    assert snapshot._data is history._data
+
+    history.SetValue('a', -1.0, 1.0)
+    assert history.GetValue('a', 1.0) == -1.0
+    assert snapshot.GetValue('a', 1.0) == 1.0
+
+    snapshot.SetValues(['b'], [-2.0], 2.0)
+    assert snapshot.GetValue('b', 2.0) == -2.0
+    assert history.GetValue('b', 2.0) == 20.0
+
+def test_appends_after_the_snapshot():
+    history = get_history()
+    snapshot = history.Copy()
+
+    history.AddRow(3.0, [3.0, 30.0])
+    assert snapshot._data is history._data # the appender writes in place
+    assert not snapshot.HasTimeStamp(3.0)
+    assert snapshot.GetLastTimeStamp() == 2.0
+
+    snapshot.AddRow(3.0, [-3.0, -30.0]) # a second appender copies
+    assert snapshot._data is not history._data
+    assert history.GetRow(3.0) == [3.0, 30.0]
+    assert snapshot.GetRow(3.0) == [-3.0, -30.0]
+
+def test_growth_and_columns_stay_private():
+    history = get_history(16) # at capacity
+    snapshot = copy.deepcopy(history)
+    for i in range(16, 40):
+        history.AddRow(float(i), [float(i), 0.0])
+    history.AddColumn('c', 5.0)
+    snapshot.Reset(value=0.0)
+
+    assert len(history) == 40
+    assert history.GetColumns() == ['a', 'b', 'c']
+    assert snapshot.GetColumns() == ['a', 'b']
+    assert snapshot.GetTimeStamps() == [15.0]
+    assert snapshot.GetRow() == [0.0, 0.0]
+    assert history.GetRow(15.0) == [15.0, 150.0, 5.0]
+
+def test_rows_out_of_order():
+    history = get_history()
+    snapshot = history.Copy()
+    history.AddRow(0.5, [0.5, 5.0])
+    assert history.GetTimeStamps() == [0.0, 0.5, 1.0, 2.0]
+    assert history.GetValue('b', 2.0) == 20.0
+    assert snapshot.GetTimeStamps() == [0.0, 1.0, 2.0]
+    assert not snapshot.HasTimeStamp(0.5)
+
+def test_phase_copy_owns_its_quantity_values():
+    quantity = Quantity(name='temp', formalName='T', value=300.0, unit='K')
+    phase = Phase(0.0, species=[Specie(name='UO2', atoms=['U-235', '2*O'])], \
+                  quantities=[quantity])
+    phase.GetQuantity('temp').value = np.array([300.0, 310.0])
+    snapshot = copy.deepcopy(phase)
+
+    snapshot.GetQuantity('temp').value[0] = -1.0
+    snapshot.GetSpecie('UO2').molarCC = 2.0
+    assert phase.GetQuantity('temp').value.tolist() == [300.0, 310.0]
+    assert phase.GetSpecie('UO2').molarCC == 0.0
+    assert snapshot.GetQuantity('temp').value.tolist() == [-1.0, 310.0]
+    assert 'Phase()' in str(snapshot)
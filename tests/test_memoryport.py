@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+Tests of MemoryPort: hold and touch semantics, and users of a closed or failed
+provider (see MemoryPort.close()).
+"""
+#*********************************************************************************
+import logging
+import threading
+import types
+import pytest
+from cortix.src.memoryport import MemoryPortHub
+from cortix.src.launcher import run_launcher
+from cortix.support.viz.pyplot._gettimesequence import _GetTimeSequence
+from cortix.support.viz.pyplot._gettimetables import _GetTimeTables
+#*********************************************************************************
+
+@pytest.fixture
+def hub():
+    hub = MemoryPortHub()
+    yield hub
+    hub.shutdown()
+
+def get_in_thread(port, time_stamp):
+    """
+    Runs port.get(time_stamp) in a thread; returns the thread and its outcome.
+    """
+
+    outcome = dict()
+
+    def target():
+        try:
+            outcome['entry'] = port.get(time_stamp)
+        except Exception as error:
+            outcome['error'] = error
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+
+    return (thread, outcome)
+
+def test_get_latest_and_timeout(hub):
+    port = hub.get_port('prod_0/x')
+    assert port.get(0.0, timeout=0.1) is None
+    port.put(1.0, 'a')
+    port.put(2.0, 'b')
+    assert port.get() == (2.0, 'b')
+    assert port.get(2.0) == (2.0, 'b')
+    assert port.get(3.0, timeout=0.1) is None
+
+def test_hold_serves_later_time_stamps(hub):
+    port = hub.get_port('prod_0/x')
+    port.set_hold(2.5)
+    port.put(0.0, 'a')
+    assert port.has_data(2.0)
+    assert port.get(2.0) == (0.0, 'a')
+    assert not port.has_data(3.0)
+
+def test_touch_restamps_without_sending(hub):
+    provider = hub.get_port('prod_0/x')
+    user = hub.get_port('prod_0/x')
+    with pytest.raises(AssertionError):
+        provider.touch(0.0)
+    provider.put(0.0, [1.0, 2.0])
+    assert user.get(0.0) == (0.0, [1.0, 2.0])
+    provider.touch(1.0)
+    assert user.get(1.0) == (1.0, [1.0, 2.0])
+
+def test_closed_provider_releases_waiting_user(hub):
+    port = hub.get_port('prod_0/x')
+    port.put(0.0, 'a')
+    (thread, outcome) = get_in_thread(port, 5.0)
+    port.close()
+    thread.join(10.0)
+    assert not thread.is_alive()
+    assert outcome == {'entry': None}
+    # data already published are still served
+    assert port.get(0.0) == (0.0, 'a')
+
+def test_failed_provider_raises_in_waiting_user(hub):
+    port = hub.get_port('prod_0/x')
+    (thread, outcome) = get_in_thread(port, 1.0)
+    hub.close_provider('prod_0', failed=True)
+    thread.join(10.0)
+    assert not thread.is_alive()
+    assert isinstance(outcome.get('error'), RuntimeError)
+    with pytest.raises(RuntimeError):
+        port.get(1.0)
+
+def test_close_provider_leaves_other_slots(hub):
+    mine = hub.get_port('prod_0/x')
+    other = hub.get_port('prod_1/x')
+    hub.close_provider('prod_0', failed=True)
+    with pytest.raises(RuntimeError):
+        mine.get(0.0)
+    assert other.get(0.0, timeout=0.1) is None
+
+def test_plot_user_reading_past_closed_provider(hub, caplog):
+    port = hub.get_port('prod_0/x')
+    port.set_hold(1.0)
+    port.put(0.0, None) # served up to time 1 only
+    port.close()
+    pyplot = types.SimpleNamespace(log=logging.getLogger('test_pyplot'), \
+                                   startTime=0.0, finalTime=10.0, \
+                                   plotSlideWindow=5.0, timeSequences_tmp=list(), \
+                                   timeTablesData=dict())
+    with caplog.at_level(logging.WARNING, logger='test_pyplot'):
+        _GetTimeSequence(pyplot, port, 5.0)
+        _GetTimeTables(pyplot, port, 5.0)
+    assert pyplot.timeSequences_tmp == []
+    assert pyplot.timeTablesData == {}
+    assert [record.getMessage().split(':')[0] for record in caplog.records] == \
+           ['_GetTimeSequence()', '_GetTimeTables()']
+
+PRODUCER = """
+class CortixDriver:
+    def __init__(self, slot_id, input_file, exec_file, work_dir, ports,
+                 start_time, final_time):
+        self.port = [port for (name, kind, port) in ports if name == 'x'][0]
+    def CallPorts(self, facility_time):
+        self.port.put(facility_time, facility_time)
+    def Execute(self, facility_time, time_step):
+        if facility_time >= 3.0:
+            raise ValueError('crash at 3')
+"""
+
+CONSUMER = """
+class CortixDriver:
+    def __init__(self, slot_id, input_file, exec_file, work_dir, ports,
+                 start_time, final_time):
+        self.port = [port for (name, kind, port) in ports if name == 'x'][0]
+    def CallPorts(self, facility_time):
+        self.port.get(facility_time)
+    def Execute(self, facility_time, time_step):
+        pass
+"""
+
+def test_crash_of_provider_fails_its_user(hub, slot_factory):
+    param_file = slot_factory.write_param(evolve_time=10.0)
+    key = 'prod_0/x'
+    memory_ports = {key: hub.get_port(key)}
+    producer_args = slot_factory.get_launcher_args('prod', PRODUCER, \
+        '<port name="x" type="provide" memory="%s"/>\n' % key, param_file, \
+        memory_ports)
+    consumer_args = slot_factory.get_launcher_args('cons', CONSUMER, \
+        '<port name="x" type="use" memory="%s"/>\n' % key, param_file, \
+        memory_ports)
+
+    errors = dict()
+
+    def launch(name, args):
+        try:
+            run_launcher(*args)
+        except Exception as error:
+            errors[name] = error
+
+    threads = [threading.Thread(target=launch, args=('cons', consumer_args), \
+                                daemon=True),
+               threading.Thread(target=launch, args=('prod', producer_args), \
+                                daemon=True)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30.0)
+
+    assert not any(thread.is_alive() for thread in threads)
+    assert isinstance(errors.get('prod'), ValueError)
+    assert isinstance(errors.get('cons'), RuntimeError)
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+Tests of MPIPort on two ranks (run with mpiexec; skipped without MPI): payloads of
+changing sizes, a setup error reaches every launcher, and the users of a failed
+provider raise.
+"""
+#*********************************************************************************
+import os
+import sys
+import shutil
+import subprocess
+import pytest
+#*********************************************************************************
+
+pytest.importorskip('mpi4py')
+MPIEXEC = shutil.which('mpiexec')
+
+HEADER = """
+import sys
+import importlib.util
+spec = importlib.util.spec_from_file_location('cortix', %(init)r,
+       submodule_search_locations=[%(root)r])
+cortix = importlib.util.module_from_spec(spec)
+sys.modules['cortix'] = cortix
+spec.loader.exec_module(cortix)
+from mpi4py import MPI
+from cortix.src.mpiport import create_mpi_ports
+
+rank = MPI.COMM_WORLD.Get_rank()
+"""
+
+FAILURE = """
+try:
+    if rank == 0:
+        create_mpi_ports('prod_0', list(), error='crash')
+    else:
+        create_mpi_ports('cons_0', [('x', 'use', 'prod_0/x')])
+    print('setup: no error', flush=True)
+except RuntimeError as error:
+    print('setup: raised', flush=True)
+
+if rank == 0:
+    ports = create_mpi_ports('prod_0', [('x', 'provide', 'prod_0/x')])
+    ports['x'].put(0.0, 'data')
+    ports['x'].close(failed=True)
+else:
+    ports = create_mpi_ports('cons_0', [('x', 'use', 'prod_0/x')])
+    print('get:', ports['x'].get(0.0))
+    try:
+        ports['x'].get(1.0)
+        print('get: no error')
+    except RuntimeError:
+        print('get: raised')
+    ports['x'].close()
+"""
+
+# payloads shrink and grow past the initial capacity; a touch sends no payload
+SIZES = """
+sizes = [10, 10, 5000, 3, 20000, 20000, 100]
+if rank == 0:
+    port = create_mpi_ports('prod_0', [('x', 'provide', 'prod_0/x')])['x']
+    for (step, size) in enumerate(sizes):
+        port.put(float(step), 'x' * size)
+        assert port.payload_count == port.header[1] # not the capacity
+        MPI.COMM_WORLD.Barrier() # one message at a time
+    port.touch(float(len(sizes)))
+    port.close()
+else:
+    port = create_mpi_ports('cons_0', [('x', 'use', 'prod_0/x')])['x']
+    for (step, size) in enumerate(sizes):
+        (time_stamp, data) = port.get(float(step))
+        if time_stamp == step and data == 'x' * size:
+            print('get: %d bytes' % size, flush=True)
+        MPI.COMM_WORLD.Barrier()
+    if port.get(float(len(sizes)))[0] == len(sizes):
+        print('get: touched', flush=True)
+    port.close()
+"""
+
+def run_script(tmp_path, source):
+    """
+    Runs the source on two ranks; returns the completed process.
+    """
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = tmp_path / 'mpi_script.py'
+    script.write_text(HEADER % {'init': os.path.join(root, '__init__.py'), \
+                                'root': root} + source)
+
+    command = [MPIEXEC, '-n', '2']
+    if hasattr(os, 'geteuid') and os.geteuid() == 0:
+        command += ['--allow-run-as-root', '--oversubscribe']
+    result = subprocess.run(command + [sys.executable, str(script)], \
+                            stdin=subprocess.DEVNULL, capture_output=True, \
+                            text=True, timeout=120)
+    return result
+
+@pytest.mark.skipif(MPIEXEC is None, reason='mpiexec not available')
+def test_payloads_of_changing_sizes(tmp_path):
+    result = run_script(tmp_path, SIZES)
+    assert result.returncode == 0, result.stderr
+    for size in (10, 5000, 3, 20000, 100):
+        assert 'get: %d bytes' % size in result.stdout
+    assert result.stdout.count('get: 10 bytes') == 2
+    assert result.stdout.count('get: 20000 bytes') == 2
+    assert 'get: touched' in result.stdout
+
+@pytest.mark.skipif(MPIEXEC is None, reason='mpiexec not available')
+def test_setup_error_and_failed_provider(tmp_path):
+    result = run_script(tmp_path, FAILURE)
+    assert result.returncode == 0, result.stderr
+    # the output lines of the ranks may interleave
+    assert result.stdout.count('setup: raised') == 2
+    assert "get: (0.0, 'data')" in result.stdout
+    assert 'get: raised' in result.stdout
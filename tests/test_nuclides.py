@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+Tests of the Nuclides attributes against the per-nuclide sums they replace, and of
+the rebuild of the nuclides index when the table changes.
+"""
+#*********************************************************************************
+import pandas
+import pytest
+from cortix.support.nuclides.interface import Nuclides
+from cortix.support.periodictable import ELEMENTS, SERIES
+#*********************************************************************************
+
+COLUMNS = {'massCC': 'Mass CC [g/cc]', 'massDens': 'Mass CC [g/cc]', \
+           'radioactivityDens': 'Radioactivity Dens. [Ci/cc]', \
+           'thermalDens': 'Thermal Dens. [W/cc]', 'heatDens': 'Thermal Dens. [W/cc]', \
+           'gammaDens': 'Gamma Dens. [W/cc]'}
+
+NAMES = ['U-235', 'U-238', 'Pu-239', 'Am-241', 'Cs-137', 'Sr-90', 'Ce-144', \
+         'Zr-95', 'Sb-125', 'Sn-126', 'Xe-135', 'Kr-85', 'I-129', 'O-16', 'C-14', \
+         'H-3', 'N-15', 'Te-132']
+
+def get_table(names):
+    rows = [[1.0 + i, 0.1 * i, 0.01 * i * i, 2.0 - 0.1 * i] \
+            for i in range(len(names))]
+    return pandas.DataFrame(rows, index=names, columns=['Mass CC [g/cc]', \
+                            'Radioactivity Dens. [Ci/cc]', 'Thermal Dens. [W/cc]', \
+                            'Gamma Dens. [W/cc]'])
+
+def get_symbol(name):
+    return name.split('-')[0].strip()
+
+def get_series(name):
+    return SERIES[ELEMENTS[get_symbol(name)].series]
+
+def in_series(name, series):
+    """
+    Series membership as listed nuclide by nuclide before the index.
+    """
+
+    actinide = get_series(name) == 'Actinides'
+    if series == 'fission products':
+        return not actinide
+    if series == 'oxide fission products':
+        return get_series(name) not in ('Actinides', 'Halogens', 'Noble gases') \
+               and get_symbol(name) not in ('C', 'N', 'O', 'H')
+    if series == 'volatile fission products':
+        return get_series(name) not in ('Actinides', 'Alkali metals', \
+               'Alkaline earth metals', 'Lanthanides', 'Metalloids', \
+               'Transition metals', 'Poor metals') and \
+               get_symbol(name) not in ('C', 'O')
+    if series == 'minor actinides':
+        return actinide and get_symbol(name) not in ('U', 'Pu')
+    names = {'alkali metals': 'Alkali metals', \
+             'alkali earth metals': 'Alkaline earth metals'}
+    return get_series(name) == names.get(series, series.capitalize())
+
+def get_expected(table, attribute_name, symbol=None, series=None):
+    column = COLUMNS[attribute_name]
+    if series is not None:
+        names = [x for x in table.index if in_series(x, series)]
+    elif symbol is None:
+        names = list(table.index)
+    elif len(symbol.split('-')) == 2:
+        names = [symbol]
+    else:
+        names = [x for x in table.index if get_symbol(x) == symbol]
+    return sum(table.loc[name, column] for name in names)
+
+def check_nuclides(nuclides):
+    table = nuclides.propertyDensities
+    for name in COLUMNS:
+        assert nuclides.GetAttribute(name) == \
+               pytest.approx(get_expected(table, name))
+        for symbol in ('U-235', 'U', 'Pu', 'Cs-137', 'Xe'):
+            assert nuclides.GetAttribute(name, symbol) == \
+                   pytest.approx(get_expected(table, name, symbol))
+        for series in nuclides.chemicalElementSeries:
+            assert nuclides.GetAttribute(name, series=series) == \
+                   pytest.approx(get_expected(table, name, series=series)), series
+
+    for series in nuclides.chemicalElementSeries:
+        assert nuclides.GetAttribute('nuclides', series=series) == \
+               [x for x in table.index if in_series(x, series)], series
+    assert nuclides.GetAttribute('nuclides') == list(table.index)
+    assert nuclides.GetAttribute('isotopes', 'U') == \
+           [x for x in table.index if get_symbol(x) == 'U']
+    assert nuclides.GetAttribute('isotopes', 'Np') == []
+
+def test_attributes_match_nuclide_sums():
+    nuclides = Nuclides(get_table(NAMES))
+    check_nuclides(nuclides)
+
+    attributes = nuclides.GetAttributes(series='actinides')
+    assert sorted(attributes) == sorted(COLUMNS)
+    for (name, value) in attributes.items():
+        assert isinstance(value, float)
+        assert value == pytest.approx(get_expected(nuclides.propertyDensities, \
+                                                   name, series='actinides'))
+
+def test_index_rebuilt_when_rows_added():
+    nuclides = Nuclides(get_table(NAMES[:6]))
+    check_nuclides(nuclides)
+    index = nuclides._nuclidesIndex
+    nuclides.GetAttribute('massCC', 'U')
+    assert nuclides._nuclidesIndex is index
+
+    table = nuclides.propertyDensities
+    table.loc['U-234'] = [5.0, 0.5, 0.25, 1.5]
+    nuclides.propertyDensities = pandas.concat([table, get_table(NAMES[6:])])
+    check_nuclides(nuclides)
+    assert nuclides._nuclidesIndex is not index
+    assert 'U-234' in nuclides.GetAttribute('isotopes', 'U')
+
+    # values changed in place are read on each call
+    nuclides.propertyDensities.loc['U-235', 'Mass CC [g/cc]'] = 100.0
+    check_nuclides(nuclides)
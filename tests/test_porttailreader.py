@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+Tests of PortTailReader: incremental reading of time-sequence and time-tables port
+files as their providers append time stamps.
+"""
+#*********************************************************************************
+import threading
+import numpy as np
+import pytest
+from cortix.support.viz.pyplot.porttailreader import PortTailReader
+from cortix.support.viz.pyplot.timeseqfile import TimeSeqWriter
+#*********************************************************************************
+
+HEADER = """<?xml version="1.0" encoding="utf-8"?>
+<time-sequence name="state">
+<time unit="minute"/>
+<var name="temp" unit="K" legend="Temperature"/>
+<var name="press" unit="Pa" legend="Pressure"/>
+"""
+
+def write_sequence(file_name, times, first_value=0.0):
+    """
+    Writes the whole time-sequence document, as the providers do every step.
+    """
+
+    with open(file_name, 'w') as fout:
+        fout.write(HEADER)
+        for (i, t) in enumerate(times):
+            fout.write('<timeStamp value="%r">%r,%r</timeStamp>\n' \
+                       % (t, first_value + i, 10.0 * i))
+        fout.write('</time-sequence>\n')
+
+@pytest.fixture
+def reader_factory():
+    readers = list()
+
+    def factory(*args, **kwargs):
+        reader = PortTailReader(*args, **kwargs)
+        readers.append(reader)
+        return reader
+
+    yield factory
+    for reader in readers:
+        reader.Close()
+
+def test_appended_time_stamps_only_are_parsed(tmp_path, reader_factory):
+    file_name = str(tmp_path / 'state.xml')
+    reader = reader_factory(file_name, pollInterval=0.1)
+    assert reader.Update() == 0 # no file yet
+
+    write_sequence(file_name, [0.0, 1.0])
+    assert reader.Update() == 2
+    assert reader.GetRootNode().get('name') == 'state'
+    write_sequence(file_name, [0.0, 1.0, 2.0])
+    assert reader.Update() == 1
+    assert reader.Update() == 0
+    assert reader.GetLastTimeStamp() == 2.0
+    records = reader.GetRecordsInWindow(1.0, 2.0)
+    assert np.array_equal(records, [[1.0, 1.0, 10.0], [2.0, 2.0, 20.0]])
+
+def test_changed_file_is_read_anew(tmp_path, reader_factory):
+    file_name = str(tmp_path / 'state.xml')
+    reader = reader_factory(file_name, pollInterval=0.1)
+    write_sequence(file_name, [0.0, 1.0])
+    reader.Update()
+    write_sequence(file_name, [0.0, 1.0, 2.0], first_value=5.0)
+    assert reader.Update() == 3
+    assert reader.GetRecordsInWindow()[0, 1] == 5.0
+
+def test_window_drops_old_time_stamps(tmp_path, reader_factory):
+    file_name = str(tmp_path / 'state.xml')
+    reader = reader_factory(file_name, window=1.0, pollInterval=0.1)
+    write_sequence(file_name, [float(t) for t in range(5)])
+    reader.Update()
+    assert reader.GetRecordsInWindow(3.0)[:, 0].tolist() == [3.0, 4.0]
+    # further back: the file is read once more
+    assert reader.GetRecordsInWindow(0.0)[:, 0].tolist() == [0.0, 1.0, 2.0, 3.0, \
+                                                             4.0]
+
+def test_wait_for_a_time_stamp(tmp_path, reader_factory):
+    file_name = str(tmp_path / 'state.xml')
+    write_sequence(file_name, [0.0])
+    reader = reader_factory(file_name, pollInterval=0.05)
+    assert not reader.WaitFor(1.0, timeout=0.2)
+
+    timer = threading.Timer(0.2, write_sequence, (file_name, [0.0, 1.0]))
+    timer.start()
+    assert reader.WaitFor(1.0, timeout=10.0)
+    timer.join()
+
+def test_time_tables(tmp_path, reader_factory):
+    file_name = str(tmp_path / 'tables.xml')
+    with open(file_name, 'w') as fout:
+        fout.write('<?xml version="1.0" encoding="utf-8"?>\n<time-tables name="t">\n')
+        for t in (0.0, 1.0):
+            fout.write('<timeStamp value="%r" unit="minute">' \
+                       '<column name="c">1,2</column></timeStamp>\n' % t)
+        fout.write('</time-tables>\n')
+    reader = reader_factory(file_name, kind='time-tables', pollInterval=0.1)
+    assert reader.Update() == 2
+    (unit, columns) = reader.GetTimeTable(1.0)
+    assert unit == 'minute'
+    assert columns[0].get('name') == 'c'
+    assert reader.GetTimeTable(3.0) is None
+
+def test_binary_time_sequence(tmp_path, reader_factory):
+    file_name = str(tmp_path / 'state.tsq')
+    reader = reader_factory(file_name, pollInterval=0.1)
+    assert reader.Update() == 0
+    writer = TimeSeqWriter(file_name, 'state', [('temp', 'K', 'Temperature')])
+    writer.Write(0.0, [300.0])
+    assert reader.Update() == 1
+    writer.Write(1.0, [301.0])
+    assert reader.Update() == 1
+    assert reader.GetLastTimeStamp() == 1.0
+    assert reader.GetRecordsInWindow(1.0)[0, 1] == 301.0
+    writer.Close()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+Tests of the rendering of dashboard pages: pages whose data did not change since
+their last rendering are skipped.
+"""
+#*********************************************************************************
+import os
+import logging
+import types
+import numpy as np
+import pytest
+pytest.importorskip('matplotlib')
+from cortix.support.viz.pyplot._renderpages import _RenderPages, _WaitRendering
+#*********************************************************************************
+
+def get_plotter(plot_workers=1):
+    return types.SimpleNamespace(log=logging.getLogger('test_renderpages'), \
+                                 plotDpi=50, plotPreviewDpi=20, \
+                                 plotWorkers=plot_workers, renderSignatures=dict(), \
+                                 renderFutures=list(), renderWorkers=dict(), \
+                                 renderPool=None)
+
+def get_page(file_name, title='t = 0', y=(1.0, 2.0, 3.0), y_label='T [K]'):
+    axis = {'lines': [(np.array([0.0, 1.0, 2.0]), np.array(y), 'temp')], \
+            'xLabel': 'time [min]', 'yLabel': y_label, 'xScale': 'linear', \
+            'yScale': 'linear', 'yLim': None, 'xLocators': None, \
+            'xTickFontSize': 6, 'yTickFontSize': 6, 'legend': True}
+    return {'fileName': file_name, 'title': title, 'titleFontSize': 8, \
+            'nRows': 1, 'nCols': 1, 'gridSpec': {'hspace': 0.5}, 'axes': [axis]}
+
+def render(plotter, page, preview=False):
+    """
+    Renders the page; returns true iff it was rendered (not skipped).
+    """
+
+    if os.path.isfile(page['fileName']):
+        os.utime(page['fileName'], ns=(0, 0))
+    _RenderPages(plotter, [page], preview)
+    _WaitRendering(plotter)
+    return os.stat(page['fileName']).st_mtime_ns != 0
+
+def test_unchanged_pages_are_skipped(tmp_path):
+    plotter = get_plotter()
+    file_name = str(tmp_path / 'page.png')
+
+    assert render(plotter, get_page(file_name))
+    assert not render(plotter, get_page(file_name))
+    # the title time stamp alone does not make a new page
+    assert not render(plotter, get_page(file_name, title='t = 1'))
+
+    assert render(plotter, get_page(file_name, y=(1.0, 2.0, 4.0)))
+    assert render(plotter, get_page(file_name, y=(1.0, 2.0, 4.0), y_label='T [C]'))
+    assert not render(plotter, get_page(file_name, y=(1.0, 2.0, 4.0), \
+                                        y_label='T [C]'))
+    # another resolution
+    assert render(plotter, get_page(file_name, y=(1.0, 2.0, 4.0), y_label='T [C]'), \
+                  preview=True)
+
+def test_missing_file_is_rendered_again(tmp_path):
+    plotter = get_plotter()
+    file_name = str(tmp_path / 'page.png')
+    render(plotter, get_page(file_name))
+    os.remove(file_name)
+    _RenderPages(plotter, [get_page(file_name)])
+    _WaitRendering(plotter)
+    assert os.path.isfile(file_name)
+
+def test_rendering_processes(tmp_path):
+    plotter = get_plotter(plot_workers=2)
+    pages = [get_page(str(tmp_path / ('page%i.png' % i))) for i in range(3)]
+    _RenderPages(plotter, pages)
+    _WaitRendering(plotter, shutdown=True)
+    assert all(os.path.isfile(page['fileName']) for page in pages)
+    assert sorted(plotter.renderWorkers.values()) == [0, 0, 1]
+    assert plotter.renderPool is None
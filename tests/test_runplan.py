@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+Tests of the run plan cache: plans of another format are not reused.
+"""
+#*********************************************************************************
+import xml.etree.ElementTree as ElementTree
+from cortix.src import runplan
+from cortix.src.runplan import RunPlan, PLAN_VERSION
+from cortix.src.runplan import get_run_plan_key, load_run_plan
+from cortix.src.utils.configtree import ConfigTree
+#*********************************************************************************
+
+def get_plan(version):
+    state = {'task_name': 'solo', 'task_work_dir': '/tmp/task_solo/',
+             'param_file': '/tmp/task_solo/cortix-param.xml',
+             'param_contents': '<cortix_param/>',
+             'comm_files': {'a_0': ('/tmp/task_solo/a_0/cortix-comm.xml', '')},
+             'memory_ports': ['a_0/x'], 'mpi_ports': list()}
+    if version is not None:
+        state['version'] = version
+    plan = RunPlan.__new__(RunPlan)
+    plan.__setstate__(state)
+    return plan
+
+def test_plan_round_trip(tmp_path):
+    file_name = str(tmp_path / 'cache' / 'runplan.pkl')
+    get_plan(PLAN_VERSION).save(file_name)
+    plan = load_run_plan(file_name)
+    assert plan is not None
+    assert plan.get_task_name() == 'solo'
+    assert plan.get_memory_ports() == ('a_0/x',)
+
+def test_stale_plans_are_rejected(tmp_path):
+    for (i, version) in enumerate([None, PLAN_VERSION + 1]):
+        file_name = str(tmp_path / ('runplan-%i.pkl' % i))
+        get_plan(version).save(file_name)
+        assert load_run_plan(file_name) is None
+    assert load_run_plan(str(tmp_path / 'missing.pkl')) is None
+
+def test_key_depends_on_the_plan_version(monkeypatch):
+    config = ConfigTree(ElementTree.fromstring('<cortix_config/>'))
+    key = get_run_plan_key(config, 'solo', '/tmp/task_solo/')
+    assert key == get_run_plan_key(config, 'solo', '/tmp/task_solo/')
+    assert key != get_run_plan_key(config, 'solo', '/tmp/task_other/')
+    monkeypatch.setattr(runplan, 'PLAN_VERSION', PLAN_VERSION + 1)
+    assert key != get_run_plan_key(config, 'solo', '/tmp/task_solo/')
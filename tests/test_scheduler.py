@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+Tests of the measured slot costs of the scheduler.
+"""
+#*********************************************************************************
+import os
+import pytest
+from cortix.src.slotprofiler import SlotProfiler
+from cortix.src.scheduler import read_slot_costs
+#*********************************************************************************
+
+def write_profile(task_work_dir, slot, n_steps, n_time_steps=1):
+    profiler = SlotProfiler(slot)
+    for i in range(n_steps):
+        profiler.start_step()
+        profiler.end_call_ports()
+        profiler.end_step(float(i), n_time_steps)
+    summary = profiler.get_summary()
+    work_dir = os.path.join(task_work_dir, slot, 'wrk')
+    os.makedirs(work_dir)
+    profiler.write_summary(os.path.join(work_dir, 'profile.json'))
+    return summary
+
+def test_costs_of_short_steps_are_not_rounded_away(tmp_path):
+    summary = write_profile(str(tmp_path), 'fast_0', 5)
+    costs = read_slot_costs(str(tmp_path), ['fast_0'])
+    assert summary['n_time_steps'] == 5
+    assert costs['fast_0'] == pytest.approx(summary['total']['step'] / 5)
+    assert costs['fast_0'] > 0.0
+
+def test_cost_of_a_subcycled_slot_is_per_time_step(tmp_path):
+    summary = write_profile(str(tmp_path), 'slow_0', 2, n_time_steps=4)
+    costs = read_slot_costs(str(tmp_path), ['slow_0'])
+    assert summary['n_steps'] == 2
+    assert costs['slow_0'] == pytest.approx(summary['total']['step'] / 8)
+
+def test_log_is_the_fallback(tmp_path):
+    os.makedirs(str(tmp_path / 'old_0'))
+    with open(str(tmp_path / 'old_0' / 'launcher.log'), 'w') as fout:
+        fout.write('... - DEBUG - elapsed time (s): 0.25\n')
+        fout.write('... - DEBUG - elapsed time (s): 0.75\n')
+    costs = read_slot_costs(str(tmp_path), ['old_0', 'none_0'])
+    assert costs == {'old_0': 0.5}
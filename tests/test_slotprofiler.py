@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+Tests of the slot profiles: step timings and percentiles of a slot, the summary
+written by a failed launcher, and the task report.
+"""
+#*********************************************************************************
+import os
+import json
+import types
+import pytest
+from cortix.src import slotprofiler
+from cortix.src.slotprofiler import SlotProfiler, get_percentile
+from cortix.src.slotprofiler import read_slot_profiles, write_task_profile
+from cortix.src.launcher import run_launcher
+#*********************************************************************************
+
+def test_get_percentile():
+    assert get_percentile([], 50) == 0.0
+    assert get_percentile([3.0], 99) == 3.0
+    values = [float(i) for i in range(1, 101)]
+    assert get_percentile(values, 0) == 1.0
+    assert get_percentile(values, 50) == 51.0 # nearest rank of 49.5
+    assert get_percentile(values, 90) == 90.0
+    assert get_percentile(values, 100) == 100.0
+    assert get_percentile([1.0, 2.0, 10.0], 99) == 10.0
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    A clock of the profiler that advances by the given times only.
+    """
+
+    clock = types.SimpleNamespace(now=0.0)
+    monkeypatch.setattr(slotprofiler, 'time', \
+                        types.SimpleNamespace(perf_counter=lambda: clock.now))
+    return clock
+
+def test_summary_of_the_buffered_steps(clock):
+    profiler = SlotProfiler('a_0', buffer_size=4)
+    for (step, (call_ports, execute)) in enumerate([(1.0, 10.0), (2.0, 20.0), \
+                                                    (0.0, 1.0), (0.0, 2.0), \
+                                                    (0.0, 3.0), (0.0, 4.0)]):
+        profiler.start_step()
+        clock.now += call_ports
+        profiler.end_call_ports()
+        clock.now += execute
+        assert profiler.end_step(float(step), n_time_steps=2) == call_ports + execute
+
+    summary = profiler.get_summary()
+    assert (summary['n_steps'], summary['n_time_steps']) == (6, 12)
+    assert summary['n_buffered_steps'] == 4
+    assert summary['total'] == {'call_ports': 3.0, 'execute': 40.0, 'step': 43.0}
+    assert summary['mean']['execute'] == pytest.approx(40.0 / 6)
+    # the steps of 10 and 20 s left the ring buffer
+    assert summary['percentiles']['execute'] == {'p50': 3.0, 'p90': 4.0, \
+                                                 'p99': 4.0, 'max': 4.0}
+    assert summary['percentiles']['call_ports']['max'] == 0.0
+    assert summary['hot_functions'] == []
+    assert summary['memory_peak'] is None
+
+def test_empty_summary():
+    summary = SlotProfiler('a_0').get_summary()
+    assert summary['n_steps'] == 0
+    assert summary['mean']['step'] == 0.0
+    assert summary['percentiles']['step'] == {'p50': 0.0, 'p90': 0.0, 'p99': 0.0, \
+                                              'max': 0.0}
+
+CRASHER = """
+class CortixDriver:
+    def __init__(self, slot_id, input_file, exec_file, work_dir, ports,
+                 start_time, final_time):
+        pass
+    def CallPorts(self, facility_time):
+        pass
+    def Execute(self, facility_time, time_step):
+        if facility_time == 3.0:
+            raise RuntimeError('crash at 3')
+"""
+
+def test_failed_launcher_writes_its_summary(slot_factory):
+    param_file = slot_factory.write_param(evolve_time=10.0, \
+                 extra='<profiling buffer="2" sample_interval="2" top="3"/>')
+    args = slot_factory.get_launcher_args('crasher', CRASHER, '', param_file)
+    with pytest.raises(RuntimeError, match='crash at 3'):
+        run_launcher(*args)
+
+    profiles = read_slot_profiles(slot_factory.work_dir, ['crasher_0', 'none_0'])
+    assert list(profiles.keys()) == ['crasher_0']
+    summary = profiles['crasher_0']
+    assert summary['n_steps'] == 3 # time 3 did not complete
+    assert summary['n_buffered_steps'] == 2
+    assert summary['n_samples'] == 2
+    assert 0 < len(summary['hot_functions']) <= 3
+
+def get_profile(execute, call_ports, hot_functions=list()):
+    return {'n_steps': 10, \
+            'total': {'call_ports': call_ports, 'execute': execute, \
+                      'step': call_ports + execute}, \
+            'percentiles': {'execute': {'p99': execute / 5.0}}, \
+            'hot_functions': hot_functions}
+
+def test_task_report(tmp_path):
+    profiles = {'a_0': get_profile(2.0, 8.0), \
+                'b_0': get_profile(6.0, 1.0, [{'function': 'solve'}]), \
+                'c_0': get_profile(0.0, 0.0)}
+    file_name = str(tmp_path / 'profile.json')
+    report = write_task_profile(file_name, profiles)
+
+    assert [entry['slot'] for entry in report['slots']] == ['b_0', 'a_0', 'c_0']
+    assert report['bottleneck'] == 'b_0'
+    assert report['slots'][0]['hot_function'] == 'solve'
+    assert report['slots'][1]['hot_function'] is None
+    assert report['slots'][1]['execute_fraction'] == pytest.approx(0.2)
+    assert report['slots'][2]['execute_fraction'] == 0.0
+    assert (report['total_execute'], report['total_call_ports']) == (8.0, 9.0)
+    with open(file_name, 'r') as fin:
+        assert json.load(fin) == report
+    assert not os.path.exists(file_name + '.tmp')
+
+    assert write_task_profile(file_name, dict())['bottleneck'] is None
+
+def test_unreadable_profiles_are_left_out(tmp_path):
+    for (slot, text) in (('a_0', '{"n_steps": 1}'), ('b_0', '{"n_ste')):
+        os.makedirs(str(tmp_path / slot / 'wrk'))
+        (tmp_path / slot / 'wrk' / 'profile.json').write_text(text)
+    assert read_slot_profiles(str(tmp_path), ['a_0', 'b_0', 'c_0']) == \
+           {'a_0': {'n_steps': 1}}
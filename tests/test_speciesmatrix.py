@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+Tests of SpeciesMatrix against the per-species sums it replaces.
+"""
+#*********************************************************************************
+import pytest
+from cortix.support.specie.interface import Specie
+from cortix.support.speciesmatrix import SpeciesMatrix
+from cortix.support.periodictable import ELEMENTS
+#*********************************************************************************
+
+def get_species():
+    return [Specie(name='UO2', atoms=['U-235', '2*O'], molarCC=2.0),
+            Specie(name='PuO2', atoms=['0.5*Pu-239', '0.5*Pu-240', '2*O'], \
+                   molarCC=1.0),
+            Specie(name='CsI', atoms=['Cs-137', 'I-127'], molarCC=0.5)]
+
+def test_stoichiometry():
+    matrix = SpeciesMatrix(get_species())
+    nuclides = matrix.GetNuclides()
+    stoichiometry = matrix.GetStoichiometry()
+    assert stoichiometry.shape == (3, len(nuclides))
+    assert stoichiometry[0, nuclides.index('O')] == 2.0
+    assert stoichiometry[1, nuclides.index('Pu-240')] == 0.5
+    assert stoichiometry[2, nuclides.index('U-235')] == 0.0
+
+def test_mass_concentrations():
+    species = get_species()
+    matrix = SpeciesMatrix(species)
+    u235 = ELEMENTS['U'].isotopes[235].mass
+    pu = 0.5 * (ELEMENTS['Pu'].isotopes[239].mass + \
+                ELEMENTS['Pu'].isotopes[240].mass)
+
+    assert matrix.GetMassCC(nuclide='U-235') == pytest.approx(2.0 * u235)
+    assert matrix.GetMassCC(nuclide='Pu') == pytest.approx(pu)
+    assert matrix.GetMassCC(series='actinides') == pytest.approx(2.0 * u235 + pu)
+    assert matrix.GetMassCC(nuclide='Sr-90') == 0.0
+    assert matrix.GetNuclideMassCCs().sum() == \
+           pytest.approx(sum(spc.molarMass * spc.molarCC for spc in species))
+    with pytest.raises(AssertionError):
+        matrix.GetMassCC(nuclide='U', series='actinides')
+
+def test_properties_are_read_on_each_call():
+    species = get_species()
+    matrix = SpeciesMatrix(species)
+    assert matrix.GetTotal('molarCC') == 3.5
+    species[2].molarCC = 1.5
+    assert matrix.GetTotal('molarCC') == 4.5
+    assert matrix.GetTotal('molarCC', 'molarCC') == pytest.approx(4.0 + 1.0 + 2.25)
+
+def test_matches_the_same_species_only():
+    species = get_species()
+    matrix = SpeciesMatrix(species)
+    assert matrix.Matches(list(species))
+    assert not matrix.Matches(species[:2])
+    species[0].atoms = ['U-238', '2*O']
+    assert not matrix.Matches(species)
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+Tests of the task configuration: coupling scheme and time synchronization.
+"""
+#*********************************************************************************
+import xml.etree.ElementTree as ElementTree
+import pytest
+from cortix.src.task import Task
+from cortix.src.utils.configtree import ConfigTree
+#*********************************************************************************
+
+TASK = """<task name="%(name)s">
+<start_time unit="minute">0.0</start_time>
+<evolve_time unit="minute">3.0</evolve_time>
+<time_step unit="minute">1.0</time_step>
+%(extra)s
+<logger level="INFO">
+ <file_handler level="INFO"/>
+ <console_handler level="CRITICAL"/>
+</logger>
+</task>"""
+
+def get_task(tmp_path, name, extra):
+    node = ElementTree.fromstring(TASK % {'name': name, 'extra': extra})
+    return Task(str(tmp_path) + '/', ConfigTree(node))
+
+def test_free_by_default(tmp_path):
+    task = get_task(tmp_path, 'free', '')
+    assert task.get_synchronization() == 'free'
+    assert task.get_coupling_scheme() == 'jacobi'
+
+@pytest.mark.parametrize('synchronization', ['', \
+                         '<synchronization mode="lockstep"/>'])
+def test_coupling_scheme_steps_in_lockstep(tmp_path, synchronization):
+    task = get_task(tmp_path, 'scheme', \
+                    '<coupling_scheme>gauss-seidel</coupling_scheme>' + \
+                    synchronization)
+    assert task.get_synchronization() == 'lockstep'
+    assert task.get_coupling_scheme() == 'gauss-seidel'
+
+def test_coupling_scheme_contradicts_free(tmp_path):
+    with pytest.raises(AssertionError, match='requires lockstep'):
+        get_task(tmp_path, 'contradiction', \
+                 '<coupling_scheme>pipelined</coupling_scheme>' \
+                 '<synchronization mode="free"/>')
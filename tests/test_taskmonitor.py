@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+Tests of the concurrent execution of the module slots of a task: the executor, the
+status file watcher (with and without inotify) and the runtime status monitor, run
+by Task.execute().
+"""
+#*********************************************************************************
+import threading
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+from conftest import SlotFactory
+from cortix.src.task import Task
+from cortix.src.taskmonitor import TaskMonitor
+from cortix.src.utils.configtree import ConfigTree
+from cortix.src.utils.executor import create_executor
+from cortix.src.utils.filewatcher import FileWatcher
+#*********************************************************************************
+
+@pytest.fixture(params=['inotify', 'stat'])
+def watch_mode(request, monkeypatch):
+    """
+    Runs a test with inotify and with the os.stat() polling fallback.
+    """
+
+    if request.param == 'stat':
+        monkeypatch.setattr('ctypes.util.find_library', lambda name: None)
+    return request.param
+
+def write_status(file_name, status):
+    with open(file_name, 'w') as fout:
+        fout.write('<runtime><status>%s</status></runtime>' % status)
+
+def test_watcher_reports_changed_files(tmp_path, watch_mode):
+    (first, second) = (str(tmp_path / 'a.xml'), str(tmp_path / 'b.xml'))
+    write_status(first, 'running')
+    watcher = FileWatcher([first, second], poll_interval=0.05)
+    assert watcher.is_event_driven() == (watch_mode == 'inotify')
+    assert watcher.changed() == []
+    assert watcher.wait(0.1) == []
+
+    timer = threading.Timer(0.1, write_status, (second, 'running'))
+    timer.start()
+    assert watcher.wait(10.0) == [second]
+    timer.join()
+    watcher.close()
+
+def test_monitor_records_transitions(tmp_path, watch_mode):
+    files = {'a_0': str(tmp_path / 'a.xml'), 'b_0': str(tmp_path / 'b.xml')}
+    write_status(files['a_0'], 'running')
+    monitor = TaskMonitor(files, poll_interval=0.05)
+    assert monitor.get_slot_status('a_0') == 'running'
+    assert monitor.get_slot_names('pending') == ['b_0']
+
+    with open(files['b_0'], 'w') as fout:
+        fout.write('<runtime><sta') # half written: no transition
+    assert monitor.update() == []
+    write_status(files['b_0'], 'finished')
+    write_status(files['a_0'], 'failed')
+    monitor.wait(10.0)
+    monitor.update()
+    assert not monitor.is_running()
+    assert [trans[:3] for trans in monitor.get_transitions()] == \
+           [('a_0', 'pending', 'running'), ('a_0', 'running', 'failed'), \
+            ('b_0', 'pending', 'finished')]
+    monitor.close()
+
+def test_create_executor():
+    executor = create_executor('process', 2)
+    assert isinstance(executor, ProcessPoolExecutor)
+    assert executor.submit(pow, 2, 10).result() == 1024
+    executor.shutdown()
+    with pytest.raises(AssertionError):
+        create_executor('thread')
+    with pytest.raises(AssertionError):
+        create_executor('process', 0)
+
+TASK = """<task name="run">
+<start_time unit="minute">0.0</start_time>
+<evolve_time unit="minute">3.0</evolve_time>
+<time_step unit="minute">1.0</time_step>
+<monitor_interval unit="second">0.1</monitor_interval>
+<logger level="INFO">
+ <file_handler level="INFO"/>
+ <console_handler level="CRITICAL"/>
+</logger>
+</task>"""
+
+DRIVER = """
+class CortixDriver:
+    def __init__(self, slot_id, input_file, exec_file, work_dir, ports,
+                 start_time, final_time):
+        pass
+    def CallPorts(self, facility_time):
+        pass
+    def Execute(self, facility_time, time_step):
+        if %r and facility_time == 2.0:
+            raise ValueError('crash at 2')
+"""
+
+class Module:
+
+    def __init__(self, launcher_args):
+        self.launcher_args = launcher_args
+
+    def get_launcher_args(self, slot_id, param_file, comm_file, memory_ports, \
+                          mpi_transport, conductor, restart_step):
+        return (self.launcher_args[9], self.launcher_args)
+
+class Application:
+    """
+    A task network of one slot per module; the modules run the given drivers.
+    """
+
+    def __init__(self, task, drivers):
+        factory = SlotFactory(task.get_work_dir())
+        param_file = factory.write_param(evolve_time=3.0)
+        task.set_runtime_cortix_param_file(param_file)
+        self.modules = dict()
+        for (module_name, source) in drivers.items():
+            self.modules[module_name] = \
+            Module(factory.get_launcher_args(module_name, source, '', param_file))
+
+    def get_network(self, task_name):
+        return self
+
+    def get_slot_names(self):
+        return [module_name + '_0' for module_name in self.modules]
+
+    def get_runtime_cortix_comm_file(self, slot_name):
+        return self.modules[slot_name.split('_')[0]].launcher_args[8]
+
+    def get_module(self, module_name):
+        return self.modules[module_name]
+
+def get_task(tmp_path, crash):
+    task = Task(str(tmp_path) + '/', ConfigTree(ElementTree.fromstring(TASK)))
+    application = Application(task, {'good': DRIVER % False, 'bad': DRIVER % crash})
+    return (task, application)
+
+def check_transitions(transitions, slot_name, final_status):
+    statuses = [trans[1:3] for trans in transitions if trans[0] == slot_name]
+    assert statuses[0][0] == 'pending'
+    assert statuses[-1][1] == final_status
+    for (previous, current) in zip(statuses[:-1], statuses[1:]):
+        assert previous[1] == current[0]
+
+def test_two_slot_task(tmp_path, watch_mode):
+    (task, application) = get_task(tmp_path, crash=False)
+    task.execute(application)
+    transitions = task.get_runtime_transitions()
+    check_transitions(transitions, 'good_0', 'finished')
+    check_transitions(transitions, 'bad_0', 'finished')
+
+def test_crashed_slot_fails_the_task(tmp_path, watch_mode):
+    (task, application) = get_task(tmp_path, crash=True)
+    with pytest.raises(ValueError, match='crash at 2'):
+        task.execute(application)
+    transitions = task.get_runtime_transitions()
+    check_transitions(transitions, 'good_0', 'finished')
+    check_transitions(transitions, 'bad_0', 'failed')
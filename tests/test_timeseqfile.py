@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+Tests of the binary time-sequence files (.tsq): writing, incremental reading and
+the XML export.
+"""
+#*********************************************************************************
+import xml.etree.ElementTree as ElementTree
+import numpy as np
+from cortix.support.viz.pyplot.timeseqfile import TimeSeqWriter, TimeSeqReader
+#*********************************************************************************
+
+VARIABLES = [('temp', 'K', 'Temperature'), ('press', 'Pa', 'Pressure', '1e-3')]
+
+def test_round_trip(tmp_path):
+    file_name = str(tmp_path / 'out.tsq')
+    with TimeSeqWriter(file_name, 'state', VARIABLES, timeUnit='min') as writer:
+        for i in range(3):
+            writer.Write(float(i), [300.0 + i, 1.0e5 * i])
+        assert writer.GetNRecords() == 3
+
+    reader = TimeSeqReader(file_name)
+    assert reader.get_name() == 'state'
+    assert reader.GetTimeUnit() == 'min'
+    assert reader.GetVariableNames() == ['temp', 'press']
+    assert reader.GetRootNode().findall('var')[1].get('scale') == '1e-3'
+    assert reader.GetNRecords() == 3
+    assert np.array_equal(reader.GetRecords()[2], [2.0, 302.0, 2.0e5])
+    assert reader.GetLastTimeStamp() == 2.0
+    assert np.array_equal(reader.GetRecordsInWindow(0.5, 1.5)[:, 0], [1.0])
+
+def test_reader_maps_appended_records_only(tmp_path):
+    file_name = str(tmp_path / 'out.tsq')
+    writer = TimeSeqWriter(file_name, 'state', VARIABLES)
+    reader = TimeSeqReader(file_name)
+    assert reader.GetNRecords() == 0
+    assert reader.GetLastTimeStamp() is None
+
+    writer.Write(0.0, [1.0, 2.0])
+    writer.Write(1.0, [3.0, 4.0])
+    assert reader.Update() == 2
+    assert reader.Update() == 0
+
+    # a record being written is not read until it is complete
+    with open(file_name, 'ab') as fout:
+        fout.write(np.zeros(1).tobytes())
+    assert reader.Update() == 0
+    writer.Close()
+
+def test_rewritten_file_is_read_anew(tmp_path):
+    file_name = str(tmp_path / 'out.tsq')
+    with TimeSeqWriter(file_name, 'state', VARIABLES) as writer:
+        writer.Write(0.0, [1.0, 2.0])
+        writer.Write(1.0, [3.0, 4.0])
+    reader = TimeSeqReader(file_name)
+    with TimeSeqWriter(file_name, 'other', VARIABLES[:1]) as writer:
+        writer.Write(5.0, [6.0])
+    assert reader.Update() == 1
+    assert reader.get_name() == 'other'
+    assert np.array_equal(reader.GetRecords(), [[5.0, 6.0]])
+
+def test_export_xml(tmp_path):
+    file_name = str(tmp_path / 'out.tsq')
+    xml_file_name = str(tmp_path / 'out.xml')
+    with TimeSeqWriter(file_name, 'state', VARIABLES) as writer:
+        for i in range(4):
+            writer.Write(float(i), [0.5 * i, 2.0 * i])
+        writer.ExportXML(xml_file_name, initialTime=1.0, finalTime=2.0)
+
+    root = ElementTree.parse(xml_file_name).getroot()
+    assert root.tag == 'time-sequence'
+    stamps = root.findall('timeStamp')
+    assert [float(node.get('value')) for node in stamps] == [1.0, 2.0]
+    assert [float(v) for v in stamps[1].text.split(',')] == [1.0, 4.0]
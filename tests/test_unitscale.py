@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# This file is part of the Cortix toolkit evironment
+# https://github.com/dpploy/...
+#
+# All rights reserved, see COPYRIGHT for full restrictions.
+# https://github.com/dpploy/COPYRIGHT
+#
+# Licensed under the GNU General Public License v. 3, please see LICENSE file.
+# https://www.gnu.org/licenses/gpl-3.0.txt
+"""
+Tests of the display units of the plots: unit names, the factor of each order of
+magnitude and the time units, and the parsing of comma separated values.
+"""
+#*********************************************************************************
+import numpy as np
+import pytest
+from cortix.support.viz.pyplot.unitscale import GetUnitScale, NormalUnit
+from cortix.support.viz.pyplot.unitscale import ParseValues
+#*********************************************************************************
+
+def test_normal_unit():
+    assert NormalUnit('gram/min') == 'g/min'
+    assert NormalUnit(' grams / minute ') == 'g/min'
+    assert NormalUnit('litre') == 'L'
+    assert NormalUnit('mol/L') == 'mol/L'
+    assert NormalUnit('') == ''
+
+@pytest.mark.parametrize('magnitude, factor, unit', [
+    (5e-7, 1e9, 'ng/min'), (1e-6, 1e6, 'ug/min'), (5e-4, 1e6, 'ug/min'),
+    (1e-3, 1e3, 'mg/min'), (1e-1, 1.0, 'g/min'), (999.0, 1.0, 'g/min'),
+    (1e3, 1e-3, 'kg/min'), (0.0, 1.0, 'g/min'), (np.inf, 1.0, 'g/min')])
+def test_get_factor(magnitude, factor, unit):
+    assert GetUnitScale('gram/min').GetFactor(magnitude) == (factor, unit)
+
+def test_negative_and_zero_data():
+    scale = GetUnitScale('cc')
+    (data, unit) = scale.Normalize([-2e-5, 1e-6])
+    assert unit == 'u-cc'
+    assert data == pytest.approx([-20.0, 1.0])
+    assert scale.Normalize([-5e3, 1.0])[1] == 'L'
+
+    (data, unit) = scale.Normalize(np.zeros(3))
+    assert unit == 'cc'
+    assert np.array_equal(data, np.zeros(3))
+    assert scale.Normalize([])[1] == 'cc'
+
+    (data, unit) = GetUnitScale('').Normalize([0.0, -2e4])
+    assert unit == 'x1e3'
+    assert data == pytest.approx([0.0, -20.0])
+
+def test_unknown_units_are_not_rescaled():
+    scale = GetUnitScale('mol/L')
+    assert scale.GetFactor(1e-9) == (1.0, 'mol/L')
+    (data, unit) = scale.Normalize([1e-9, -1e9])
+    assert unit == 'mol/L'
+    assert np.array_equal(data, [1e-9, -1e9])
+    assert GetUnitScale('furlong', time=True).Normalize([1e6])[1] == 'furlong'
+
+def test_time_boundary():
+    minutes = GetUnitScale('minute', time=True)
+    assert minutes.GetUnit() == 'min'
+    assert minutes.Normalize([0.0, 119.0]) == (pytest.approx([0.0, 119.0]), 'min')
+    (data, unit) = minutes.Normalize([0.0, 120.0])
+    assert unit == 'h'
+    assert data == pytest.approx([0.0, 2.0])
+    assert GetUnitScale('s', time=True).GetFactor(120.0) == (1.0 / 60.0, 'min')
+    assert GetUnitScale('s', time=True).GetFactor(-119.0) == (1.0, 's')
+    assert GetUnitScale('h', time=True).GetFactor(1e6) == (1.0, 'h')
+
+def test_parse_values():
+    assert np.array_equal(ParseValues(' 1.5, -2,0,3e-3 \n'), [1.5, -2.0, 0.0, 3e-3])
+    assert ParseValues(None).size == 0
+    assert ParseValues('  ').size == 0
+    with pytest.raises(ValueError):
+        ParseValues('1.0,nope')